@@ -0,0 +1,30 @@
+from fastapi import APIRouter  # type: ignore
+
+from heron_app.db.database import pool_status
+from heron_app.utils import metrics
+
+router = APIRouter()
+
+
+@router.get("/",
+            summary="Process metrics",
+            description="Connection pool state and internal counters of the API process. Each worker process keeps its own pool and counters.",
+            responses={
+                200: {
+                    "description": "Metrics retrieved successfully",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "db_pool": {
+                                    "sync": {"class": "QueuePool", "size": 5, "checked_in": 1, "checked_out": 0, "overflow": -4, "connects": 1, "checkouts": 12},
+                                    "async": {"class": "AsyncAdaptedQueuePool", "size": 5, "checked_in": 2, "checked_out": 1, "overflow": -2, "connects": 3, "checkouts": 480}
+                                },
+                                "counters": {"chain_context.protocol_param.hit": 10}
+                            }
+                        }
+                    }
+                }
+            }
+            )
+def get_metrics():
+    return {"db_pool": pool_status(), "counters": metrics.snapshot()}
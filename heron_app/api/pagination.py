@@ -0,0 +1,46 @@
+import base64
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, Response  # type: ignore
+from sqlalchemy import tuple_  # type: ignore
+
+# Response header carrying the cursor of the next page; absent on the last page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(row) -> str:
+    raw = f"{row.created_at.isoformat()}|{row.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+
+
+def paginate(stmt, model, cursor: Optional[str], limit: int):
+    """
+    Keyset pagination of `stmt` over (created_at, id), oldest first: each
+    page starts right after the last row of the previous one, so any page
+    is an index range scan no matter how deep it is. One extra row is
+    fetched to tell whether there is a next page (see `page`).
+    """
+    if cursor:
+        stmt = stmt.where(tuple_(model.created_at, model.id) > tuple_(*decode_cursor(cursor)))
+    return stmt.order_by(model.created_at, model.id).limit(limit + 1)
+
+
+def page(rows: List, limit: int, response: Response) -> List:
+    """
+    The rows of a `paginate` query without the lookahead row; sets the
+    next-page cursor header when there are more.
+    """
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1])
+    return rows
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from typing import Optional
+from heron_app.api.pagination import page, paginate
+from heron_app.core.config import settings
 from heron_app.schemas.policy import CreatePolicyRequest, PolicyResponse
 from heron_app.db.models.minting_policies import MintingPolicy
-from heron_app.db.database import SessionLocal
+from heron_app.db.database import AsyncSessionLocal
 from cryptography.fernet import Fernet
 import os
 from heron_app.utils.cardano import generate_policy
@@ -60,9 +64,10 @@ router = APIRouter()
             },
             response_model=PolicyResponse
         )
-def create_policy(request: CreatePolicyRequest):
-    session = SessionLocal()
-    if session.query(MintingPolicy).filter_by(name=request.name).first():
+async def create_policy(request: CreatePolicyRequest):
+    session = AsyncSessionLocal()
+    if await session.scalar(select(MintingPolicy).filter_by(name=request.name)):
+        await session.close()
         raise HTTPException(status_code=400, detail="Policy name already exists")
 
     policy_id, skey, locking_slot = generate_policy(request.lock_date)
@@ -79,8 +84,9 @@ def create_policy(request: CreatePolicyRequest):
         locking_slot=locking_slot
     )
     session.add(new_policy)
-    session.commit()
-    session.refresh(new_policy)
+    await session.commit()
+    await session.refresh(new_policy)
+    await session.close()
 
     return PolicyResponse(
         name=new_policy.name,
@@ -91,7 +97,7 @@ def create_policy(request: CreatePolicyRequest):
 
 @router.get("/", 
             summary="List all minting policies",
-            description="Retrieves a list of all minting policies stored in the database, including their names, IDs, locking slots, and creation dates.",
+            description="Retrieves the minting policies stored in the database, including their names, IDs, locking slots, and creation dates, oldest first. Results are paginated: when there are more, the X-Next-Cursor response header holds the cursor of the next page.",
             status_code=200,
             responses={
                 200: {
@@ -132,14 +138,22 @@ def create_policy(request: CreatePolicyRequest):
             },
             response_model=list[PolicyResponse]
             )
-def list_policies():
-    session = SessionLocal()
-    return [
-        PolicyResponse(
-            name=p.name,
-            policy_id=p.policy_id,
-            locking_slot=p.locking_slot,
-            created_at=p.created_at
-        )
-        for p in session.query(MintingPolicy).all()
-    ]
\ No newline at end of file
+async def list_policies(
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Cursor of the page to fetch, from the X-Next-Cursor header"),
+    limit: int = Query(settings.API_PAGE_SIZE, ge=1, le=settings.API_MAX_PAGE_SIZE, description="Page size"),
+):
+    session = AsyncSessionLocal()
+    try:
+        rows = (await session.scalars(paginate(select(MintingPolicy), MintingPolicy, cursor, limit))).all()
+        return [
+            PolicyResponse(
+                name=p.name,
+                policy_id=p.policy_id,
+                locking_slot=p.locking_slot,
+                created_at=p.created_at
+            )
+            for p in page(rows, limit, response)
+        ]
+    finally:
+        await session.close()
\ No newline at end of file
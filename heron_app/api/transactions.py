@@ -1,19 +1,24 @@
-from fastapi import APIRouter, HTTPException, Path  # type: ignore
-from sqlalchemy.orm import joinedload # type: ignore
-from heron_app.schemas.transaction import TransactionCreate, TransactionOut
+from fastapi import APIRouter, HTTPException, Path, Query, Response  # type: ignore
+from sqlalchemy import insert, select # type: ignore
+from sqlalchemy.orm import selectinload # type: ignore
+from starlette.concurrency import run_in_threadpool # type: ignore
+from heron_app.api.pagination import page, paginate
+from heron_app.core.config import settings
+from heron_app.schemas.transaction import TransactionBulkOut, TransactionCreate, TransactionOut
 from heron_app.db.models.transaction import Transaction
 from heron_app.db.models.wallet import Wallet
 from heron_app.db.models.transaction_output import TransactionOutput
 from heron_app.db.models.transaction_output_asset import TransactionOutputAsset
 from heron_app.db.models.transaction_mint import TransactionMint
 from heron_app.db.models.minting_policies import MintingPolicy  # noqa: F401
-from heron_app.db.database import SessionLocal
-from heron_app.workers.tasks import process_transaction, enqueue_transaction
+from heron_app.db.database import AsyncSessionLocal
+from heron_app.workers.chain_follower import confirmations, get_tip
+from heron_app.workers.tasks import dispatch_transaction, dispatch_transactions
 from heron_app.utils.registry_loader import get_registry_labels
 
-from uuid import uuid4
-from datetime import datetime
-from typing import Any
+from uuid import UUID, uuid4
+from datetime import datetime, timezone
+from typing import Any, List, Optional
 
 
 router = APIRouter()
@@ -52,6 +57,38 @@ def _normalise_metadata_values_to_str(value: Any, path: str = "metadata") -> Any
 
 
 
+def _validate_metadata(metadata: Any, valid_labels, path: str = "metadata") -> dict:
+    """
+    Check that every metadata key is an integer label registered in CIP-0010
+    and return the metadata with int keys and string leaf values.
+    """
+    if not isinstance(metadata, dict):
+        raise HTTPException(status_code=400, detail="Metadata must be a dictionary")
+
+    invalid_labels = []
+    for key in metadata.keys():
+        try:
+            int_key = int(key)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Metadata key '{key}' is not a valid integer")
+
+        if int_key not in valid_labels:
+            invalid_labels.append(int_key)
+
+    if invalid_labels:
+        raise HTTPException(
+            status_code=400,
+            detail=f"The following metadata labels are not registered in CIP-0010: {invalid_labels}"
+        )
+
+    # Normalise all metadata values to strings so downstream (worker /
+    # pycardano / Blockfrost) never see floats or other unexpected types.
+    return {
+        int(k): _normalise_metadata_values_to_str(v, f"{path}[{k}]")
+        for k, v in metadata.items()
+    }
+
+
 @router.post("/",
                 summary="Submit a new transaction",
                 description="Submits a new transaction to the Heron API. The transaction includes metadata, outputs, and optional minting information. The transaction is queued for processing.",
@@ -124,10 +161,10 @@ def _normalise_metadata_values_to_str(value: Any, path: str = "metadata") -> Any
                 },
                 response_model=TransactionOut
               )
-def submit_transaction(tx: TransactionCreate):
-    session = SessionLocal()
+async def submit_transaction(tx: TransactionCreate):
+    session = AsyncSessionLocal()
     try:
-        wallet = session.query(Wallet).filter(Wallet.id == tx.wallet_id).first()
+        wallet = await session.scalar(select(Wallet).where(Wallet.id == tx.wallet_id))
         if not wallet:
             raise HTTPException(status_code=404, detail="Wallet not found")
         
@@ -136,34 +173,7 @@ def submit_transaction(tx: TransactionCreate):
         metadata_with_int_keys = None
 
         if tx.metadata is not None:
-            if not isinstance(tx.metadata, dict):
-                raise HTTPException(status_code=400, detail="Metadata must be a dictionary")
-            
-
-            valid_labels = get_registry_labels()
-
-            invalid_labels = []
-            for key in tx.metadata.keys():
-                try:
-                    int_key = int(key)
-                except ValueError:
-                    raise HTTPException(status_code=400, detail=f"Metadata key '{key}' is not a valid integer")
-                
-                if int_key not in valid_labels:
-                    invalid_labels.append(int_key)
-
-            if invalid_labels:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"The following metadata labels are not registered in CIP-0010: {invalid_labels}"
-                )
-            
-            # Normalise all metadata values to strings so downstream (worker /
-            # pycardano / Blockfrost) never see floats or other unexpected types.
-            metadata_with_int_keys = {
-                int(k): _normalise_metadata_values_to_str(v, f"metadata[{k}]")
-                for k, v in tx.metadata.items()
-            }
+            metadata_with_int_keys = _validate_metadata(tx.metadata, get_registry_labels())
 
 
         # Create base transaction record
@@ -176,7 +186,7 @@ def submit_transaction(tx: TransactionCreate):
             updated_at=datetime.utcnow(),
         )
         session.add(tx_record)
-        session.flush()  # Get numeric_id
+        await session.flush()  # Get numeric_id
 
         for output_data in tx.outputs:
 
@@ -195,7 +205,7 @@ def submit_transaction(tx: TransactionCreate):
                 updated_at=datetime.utcnow(),
             )
             session.add(output)
-            session.flush()  # Get output.id
+            await session.flush()  # Get output.id
 
             for asset in output_data.assets:
                 asset_row = TransactionOutputAsset(
@@ -212,7 +222,7 @@ def submit_transaction(tx: TransactionCreate):
         if tx.mint:
             for mint in tx.mint:
 
-                mint_policy = session.query(MintingPolicy).filter(MintingPolicy.policy_id == mint.policy_id).first()
+                mint_policy = await session.scalar(select(MintingPolicy).where(MintingPolicy.policy_id == mint.policy_id))
 
                 if not mint_policy:
                     raise HTTPException(status_code=400, detail="Minting Policy not found on your instance.")
@@ -227,32 +237,264 @@ def submit_transaction(tx: TransactionCreate):
                 )
                 session.add(mint_record)
 
-        session.commit()
+        await session.commit()
 
         # Re-fetch transaction with related outputs/assets before session closes
-        db_tx = (
-            session.query(Transaction)
-            .options(joinedload(Transaction.outputs).joinedload(TransactionOutput.assets))
-            .filter(Transaction.id == tx_record.id)
-            .first()
+        db_tx = await session.scalar(
+            select(Transaction)
+            .options(selectinload(Transaction.outputs).selectinload(TransactionOutput.assets))
+            .where(Transaction.id == tx_record.id)
+            .execution_options(populate_existing=True)
         )
 
-        # Trigger async task
-        queue_name = f"wallet_{tx_record.wallet_id}"
-        process_transaction.apply_async(args=[tx_record.id], queue=queue_name)
+        # Trigger async task (publishing to the broker is blocking I/O)
+        await run_in_threadpool(dispatch_transaction, tx_record.id, tx_record.wallet_id)
 
         return db_tx
 
     except Exception as e:
-        session.rollback()
+        await session.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        await session.close()
+
+
+@router.post("/bulk",
+                summary="Submit transactions in bulk",
+                description="Submits an array of transactions in one request. All requests are validated before anything is stored; on success every transaction is queued and their ids are returned in request order.",
+                responses={
+                    200: {
+                        "description": "Transactions submitted successfully",
+                        "content": {
+                            "application/json": {
+                                "example": {
+                                    "ids": ["uuid", "uuid"]
+                                }
+                            }
+                        }
+                    },
+                    400: {
+                        "description": "Bad request",
+                        "content": {
+                            "application/json": {
+                                "example": {
+                                    "detail": "transactions[3]: Minting Policy not found on your instance."
+                                }
+                            }
+                        }
+                    },
+                    404: {
+                        "description": "Wallet not found",
+                        "content": {
+                            "application/json": {
+                                "example": {
+                                    "detail": "transactions[0]: Wallet not found"
+                                }
+                            }
+                        }
+                    },
+                    500: {
+                        "description": "Internal server error",
+                        "content": {
+                            "application/json": {
+                                "example": {
+                                    "detail": "Error message"
+                                }
+                            }
+                        }
+                    }
+                },
+                response_model=TransactionBulkOut
+              )
+async def submit_transactions_bulk(txs: List[TransactionCreate]):
+    if not txs:
+        raise HTTPException(status_code=400, detail="At least one transaction is required")
+    if len(txs) > settings.TX_BULK_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.TX_BULK_MAX_SIZE} transactions can be submitted at once"
+        )
+
+    session = AsyncSessionLocal()
+    try:
+        # Validate the whole array up front, with one query per lookup table.
+        wallet_ids = {tx.wallet_id for tx in txs}
+        known_wallets = set(
+            (await session.scalars(select(Wallet.id).where(Wallet.id.in_(wallet_ids)))).all()
+        )
+        policy_ids = {mint.policy_id for tx in txs for mint in (tx.mint or [])}
+        known_policies = set(
+            (await session.scalars(
+                select(MintingPolicy.policy_id).where(MintingPolicy.policy_id.in_(policy_ids))
+            )).all()
+        ) if policy_ids else set()
+        valid_labels = get_registry_labels() if any(tx.metadata is not None for tx in txs) else set()
+
+        metadata = []
+        for i, tx in enumerate(txs):
+            if tx.wallet_id not in known_wallets:
+                raise HTTPException(status_code=404, detail=f"transactions[{i}]: Wallet not found")
+            for mint in tx.mint or []:
+                if mint.policy_id not in known_policies:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"transactions[{i}]: Minting Policy not found on your instance."
+                    )
+            for output_data in tx.outputs or []:
+                if output_data.datum is not None and not isinstance(output_data.datum, dict):
+                    raise HTTPException(status_code=400, detail=f"transactions[{i}]: Datum must be a dictionary")
+            try:
+                metadata.append(
+                    _validate_metadata(tx.metadata, valid_labels) if tx.metadata is not None else None
+                )
+            except HTTPException as e:
+                raise HTTPException(status_code=e.status_code, detail=f"transactions[{i}]: {e.detail}")
+
+        # Multi-row INSERT ... RETURNING, in parameter order, so generated
+        # keys can be matched back to the request without a flush per row.
+        now = datetime.utcnow()
+        tx_ids = [uuid4() for _ in txs]
+        numeric_ids = (await session.scalars(
+            insert(Transaction).returning(Transaction.numeric_id, sort_by_parameter_order=True),
+            [
+                {
+                    "id": tx_ids[i],
+                    "wallet_id": tx.wallet_id,
+                    "metadata_json": metadata[i],
+                    "status": "queued",
+                    "retries": 0,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i, tx in enumerate(txs)
+            ],
+        )).all()
+
+        output_rows = []
+        output_assets = []
+        for numeric_id, tx in zip(numeric_ids, txs):
+            for output_data in tx.outputs or []:
+                output_rows.append({
+                    "transaction_id": numeric_id,
+                    "address": output_data.address,
+                    "datum": output_data.datum,
+                    "created_at": now,
+                    "updated_at": now,
+                })
+                output_assets.append(output_data.assets)
+
+        if output_rows:
+            output_ids = (await session.scalars(
+                insert(TransactionOutput).returning(TransactionOutput.id, sort_by_parameter_order=True),
+                output_rows,
+            )).all()
+
+            asset_rows = [
+                {
+                    "output_id": output_id,
+                    "unit": asset.unit,
+                    "quantity": asset.quantity,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for output_id, assets in zip(output_ids, output_assets)
+                for asset in assets
+            ]
+            if asset_rows:
+                await session.execute(insert(TransactionOutputAsset), asset_rows)
+
+        mint_rows = [
+            {
+                "transaction_id": numeric_id,
+                "policy_id": mint.policy_id,
+                "asset_name": mint.asset_name,
+                "quantity": mint.quantity,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for numeric_id, tx in zip(numeric_ids, txs)
+            for mint in tx.mint or []
+        ]
+        if mint_rows:
+            await session.execute(insert(TransactionMint), mint_rows)
+
+        await session.commit()
+
+        await run_in_threadpool(
+            dispatch_transactions, [(tx_id, tx.wallet_id) for tx_id, tx in zip(tx_ids, txs)]
+        )
+
+        return {"ids": tx_ids}
+
+    except HTTPException:
+        await session.rollback()
+        raise
+    except Exception as e:
+        await session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        session.close()
+        await session.close()
+
+
+@router.get("/",
+            summary="List transactions",
+            description="Lists transactions oldest first, optionally only those of one wallet, in one status, or created at or after `since`. Results are paginated: when there are more, the X-Next-Cursor response header holds the cursor of the next page. Each page is an index range scan, however deep into the backlog it is.",
+            responses={
+                200: {
+                    "description": "Transactions retrieved successfully",
+                    "headers": {
+                        "X-Next-Cursor": {"description": "Cursor of the next page, absent on the last page"}
+                    }
+                },
+                422: {
+                    "description": "Validation error, e.g., an invalid cursor",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "detail": "Invalid cursor"
+                            }
+                        }
+                    }
+                }
+            },
+            response_model=List[TransactionOut]
+            )
+async def list_transactions(
+    response: Response,
+    wallet_id: Optional[UUID] = Query(None, description="Only transactions of this wallet"),
+    status: Optional[str] = Query(None, description="Only transactions in this status, e.g. queued, submitted, on_chain, confirmed, failed"),
+    since: Optional[datetime] = Query(None, description="Only transactions created at or after this time"),
+    cursor: Optional[str] = Query(None, description="Cursor of the page to fetch, from the X-Next-Cursor header"),
+    limit: int = Query(settings.API_PAGE_SIZE, ge=1, le=settings.API_MAX_PAGE_SIZE, description="Page size"),
+):
+    stmt = select(Transaction).options(selectinload(Transaction.outputs).selectinload(TransactionOutput.assets))
+    if wallet_id:
+        stmt = stmt.where(Transaction.wallet_id == wallet_id)
+    if status:
+        stmt = stmt.where(Transaction.status == status)
+    if since:
+        if since.tzinfo:
+            # created_at is naive UTC
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        stmt = stmt.where(Transaction.created_at >= since)
+
+    session = AsyncSessionLocal()
+    try:
+        rows = (await session.scalars(paginate(stmt, Transaction, cursor, limit))).all()
+        tip = await run_in_threadpool(get_tip)
+        out = []
+        for transaction in page(rows, limit, response):
+            item = TransactionOut.model_validate(transaction)
+            item.confirmations = confirmations(transaction, tip)
+            out.append(item)
+        return out
+    finally:
+        await session.close()
 
 
 @router.get("/{transaction_id}", 
             summary="Get transaction details",
-            description="Retrieves detailed information about a specific transaction by its ID, including its outputs and associated assets.",
+            description="Retrieves detailed information about a specific transaction by its ID, including its outputs and associated assets. Once the transaction is seen on chain its status moves from `submitted` to `on_chain`, and to `confirmed` when its block is deep enough; `confirmations` counts the blocks on top of (and including) that block. A rollback moves it back to `submitted`.",
             responses={
                 200: {
                     "description": "Transaction details retrieved successfully",
@@ -312,17 +554,24 @@ def submit_transaction(tx: TransactionCreate):
             },
             response_model=TransactionOut
             )
-def get_transaction(transaction_id: str = Path(..., description="UUID of the transaction")):
-    session = SessionLocal()
+async def get_transaction(transaction_id: str = Path(..., description="UUID of the transaction")):
+    try:
+        tx_uuid = UUID(transaction_id)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid transaction ID format")
+
+    session = AsyncSessionLocal()
     try:
-        transaction = (
-            session.query(Transaction)
-            .options(joinedload(Transaction.outputs).joinedload(TransactionOutput.assets))
-            .filter(Transaction.id == transaction_id)
-            .first()
+        transaction = await session.scalar(
+            select(Transaction)
+            .options(selectinload(Transaction.outputs).selectinload(TransactionOutput.assets))
+            .where(Transaction.id == tx_uuid)
         )
         if not transaction:
             raise HTTPException(status_code=404, detail="Transaction not found")
-        return transaction
+        # Depth comes from the chain follower's tip, not a Blockfrost lookup
+        out = TransactionOut.model_validate(transaction)
+        out.confirmations = confirmations(transaction, await run_in_threadpool(get_tip))
+        return out
     finally:
-        session.close()
\ No newline at end of file
+        await session.close()
\ No newline at end of file
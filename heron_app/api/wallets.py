@@ -1,17 +1,23 @@
-from fastapi import APIRouter, HTTPException, Path  # type: ignore
+from fastapi import APIRouter, HTTPException, Path, Query, Response  # type: ignore
 from uuid import uuid4, UUID
+from typing import List, Optional
 from datetime import datetime
 import os
 from cryptography.fernet import Fernet
 from pycardano import crypto, ExtendedSigningKey, Address, Network
 from blockfrost import ApiUrls
+from sqlalchemy import select # type: ignore
 from sqlalchemy.exc import IntegrityError # type: ignore
-import psycopg2 # type: ignore
+from starlette.concurrency import run_in_threadpool # type: ignore
 
+from heron_app.api.pagination import page, paginate
+from heron_app.core.config import settings
 from heron_app.schemas.wallet import WalletCreate
-from heron_app.db.database import SessionLocal
+from heron_app.db.database import AsyncSessionLocal
 from heron_app.db.models.wallet import Wallet
-from heron_app.utils.cardano import get_balance
+from heron_app.utils.cardano import get_cached_balance_async, get_cached_balances_async
+from heron_app.utils import balance_cache
+from heron_app.utils.utxo_cache import get_utxo_cache
 from heron_app.workers.start_wallet_worker import start_worker
 
 router = APIRouter()
@@ -20,6 +26,26 @@ BLOCKFROST_API_KEY = os.getenv("BLOCKFROST_PROJECT_ID")
 network =  BLOCKFROST_API_KEY[:7].lower()
 
 
+def _derive_wallet_address(mnemonic: str) -> Address:
+    cardano_network = Network.MAINNET if network == "mainnet" else Network.TESTNET
+
+    root_key = crypto.bip32.HDWallet.from_mnemonic(mnemonic)
+    payment_key = root_key.derive_from_path("m/1852'/1815'/0'/0/0")
+    staking_key = root_key.derive_from_path("m/1852'/1815'/0'/2/0")
+    payment_skey = ExtendedSigningKey.from_hdwallet(payment_key)
+    staking_skey = ExtendedSigningKey.from_hdwallet(staking_key)
+
+    return Address(
+        payment_part=payment_skey.to_verification_key().hash(),
+        staking_part=staking_skey.to_verification_key().hash(),
+        network=cardano_network
+    )
+
+
+def _is_unique_violation(e: IntegrityError) -> bool:
+    return getattr(e.orig, "pgcode", None) == "23505"
+
+
 @router.post("/",
     summary="Load a new wallet",
     description="Loads and stores a new Cardano wallet from a 24-word mnemonic. The mnemonic is encrypted and the wallet address is derived from the root key.",
@@ -57,24 +83,12 @@ network =  BLOCKFROST_API_KEY[:7].lower()
         }
     }
     )
-def create_wallet(data: WalletCreate):
-    session = SessionLocal()
+async def create_wallet(data: WalletCreate):
+    session = AsyncSessionLocal()
     try:
 
-        cardano_network = Network.MAINNET if network == "mainnet" else Network.TESTNET
-        
-
-        root_key = crypto.bip32.HDWallet.from_mnemonic(data.mnemonic)
-        payment_key = root_key.derive_from_path("m/1852'/1815'/0'/0/0")
-        staking_key = root_key.derive_from_path("m/1852'/1815'/0'/2/0")
-        payment_skey = ExtendedSigningKey.from_hdwallet(payment_key)
-        staking_skey = ExtendedSigningKey.from_hdwallet(staking_key)
-
-        address = Address(
-            payment_part=payment_skey.to_verification_key().hash(),
-            staking_part=staking_skey.to_verification_key().hash(),
-            network=cardano_network
-        )
+        # Key derivation is CPU-bound (PBKDF2); keep it off the event loop.
+        address = await run_in_threadpool(_derive_wallet_address, data.mnemonic)
 
         fernet = Fernet(os.environ["WALLET_ENCRYPTION_KEY"])
         encrypted_key = fernet.encrypt(data.mnemonic.encode())
@@ -87,26 +101,26 @@ def create_wallet(data: WalletCreate):
             created_at=datetime.utcnow()
         )
         session.add(wallet_record)
-        session.commit()
+        await session.commit()
 
-        start_worker(wallet_record.id)
+        await run_in_threadpool(start_worker, wallet_record.id)
 
         return {"id": wallet_record.id, "address": wallet_record.address}
 
     except IntegrityError as e:
-        session.rollback()
-        if isinstance(e.orig, psycopg2.errors.UniqueViolation):
+        await session.rollback()
+        if _is_unique_violation(e):
             raise HTTPException(status_code=400, detail="A wallet with this address already exists.")
         raise HTTPException(status_code=500, detail="Database integrity error.")
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        session.close()
+        await session.close()
 
 @router.get("/",
     summary="List all available wallets",
-    description="Shows a list of all wallets stored in the database, including their IDs, names, addresses, and creation dates.",
+    description="Shows the wallets stored in the database, including their IDs, names, addresses, and creation dates, oldest first. Results are paginated: when there are more, the X-Next-Cursor response header holds the cursor of the next page.",
     responses={
         200: {
             "description": "List of wallets retrieved successfully",
@@ -135,19 +149,109 @@ def create_wallet(data: WalletCreate):
         }
     }
     )
-def list_wallets():
-    session = SessionLocal()
+async def list_wallets(
+    response: Response,
+    include_balance: bool = Query(False, description="Include each wallet's balance, as GET /wallets/balances"),
+    cursor: Optional[str] = Query(None, description="Cursor of the page to fetch, from the X-Next-Cursor header"),
+    limit: int = Query(settings.API_PAGE_SIZE, ge=1, le=settings.API_MAX_PAGE_SIZE, description="Page size"),
+):
+    if include_balance and limit > settings.BALANCE_BULK_MAX_WALLETS:
+        raise HTTPException(
+            status_code=422, detail=f"limit must not exceed {settings.BALANCE_BULK_MAX_WALLETS} with include_balance"
+        )
+
+    session = AsyncSessionLocal()
     try:
-        return [
+        rows = (await session.scalars(paginate(select(Wallet), Wallet, cursor, limit))).all()
+        wallets = [
             {"id": w.id, "name": w.name, "address": w.address, "created_at": w.created_at}
-            for w in session.query(Wallet).all()
+            for w in page(rows, limit, response)
         ]
     finally:
-        session.close()
+        await session.close()
+
+    if include_balance:
+        await _add_balances(wallets, fresh=False)
+    return wallets
+
+
+async def _add_balances(wallets: List[dict], fresh: bool) -> None:
+    balances = await get_cached_balances_async([w["address"] for w in wallets], fresh=fresh)
+    for wallet in wallets:
+        balance = balances[wallet["address"]]
+        if isinstance(balance, HTTPException):
+            wallet["balance"], wallet["error"] = None, balance.detail
+        elif isinstance(balance, Exception):
+            wallet["balance"], wallet["error"] = None, str(balance)
+        else:
+            wallet["balance"] = balance
+
+
+@router.get("/balances",
+    summary="Get wallet balances",
+    description="Retrieves the balances of many wallets in one response: those given with ids, or a page of all wallets (oldest first, the X-Next-Cursor response header holds the cursor of the next page). At most BALANCE_BULK_MAX_WALLETS (default 100) wallets per request. Balances are served from the cache where possible and the rest are fetched concurrently; pass fresh=true to read them all from Blockfrost. A wallet whose balance could not be fetched has a null balance and an error.",
+    responses={
+        200: {
+            "description": "Wallet balances retrieved successfully",
+            "content": {
+                "application/json": {
+                    "example": [
+                        {
+                            "id": "123e4567-e89b-12d3-a456-426614174000",
+                            "address": "addr1q...",
+                            "balance": {"lovelace": "1000000", "assets": {}}
+                        }
+                    ]
+                }
+            }
+        },
+        422: {
+            "description": "Invalid wallet ID format, or too many wallets",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Invalid wallet ID format"
+                    }
+                }
+            }
+        }
+    }
+    )
+async def get_wallet_balances(
+    response: Response,
+    ids: Optional[List[str]] = Query(None, description="Wallet IDs (repeat the parameter); a page of all wallets when omitted"),
+    fresh: bool = Query(False, description="Bypass the balance cache and read the balances from Blockfrost"),
+    cursor: Optional[str] = Query(None, description="Cursor of the page to fetch, from the X-Next-Cursor header"),
+    limit: int = Query(
+        min(settings.API_PAGE_SIZE, settings.BALANCE_BULK_MAX_WALLETS),
+        ge=1, le=settings.BALANCE_BULK_MAX_WALLETS, description="Page size",
+    ),
+):
+    stmt = select(Wallet.id, Wallet.address, Wallet.created_at)
+    if ids:
+        if len(ids) > settings.BALANCE_BULK_MAX_WALLETS:
+            raise HTTPException(
+                status_code=422, detail=f"At most {settings.BALANCE_BULK_MAX_WALLETS} wallet IDs per request"
+            )
+        try:
+            stmt = stmt.where(Wallet.id.in_([UUID(wallet_id) for wallet_id in ids]))
+        except ValueError:
+            raise HTTPException(status_code=422, detail="Invalid wallet ID format")
+
+    session = AsyncSessionLocal()
+    try:
+        rows = (await session.execute(paginate(stmt, Wallet, cursor, limit))).all()
+        wallets = [{"id": row.id, "address": row.address} for row in page(rows, limit, response)]
+    finally:
+        await session.close()
+
+    await _add_balances(wallets, fresh=fresh)
+    return wallets
+
 
 @router.get("/{wallet_id}",
     summary="Get wallet details",
-    description="Retrieves detailed information about a specific wallet by its ID, including its name, address, balance, and creation date.",
+    description="Retrieves detailed information about a specific wallet by its ID, including its name, address, balance, and creation date. The balance is served from a cache and may lag the chain by a few seconds; pass fresh=true to read it from Blockfrost.",
     responses={
         200: {
             "description": "Wallet details retrieved successfully",
@@ -195,8 +299,11 @@ def list_wallets():
         }
     }
     )
-def get_wallet(wallet_id: str):
-    session = SessionLocal()
+async def get_wallet(
+    wallet_id: str,
+    fresh: bool = Query(False, description="Bypass the balance cache and read the balance from Blockfrost"),
+):
+    session = AsyncSessionLocal()
     try:
 
         if not wallet_id or len(wallet_id) != 36:
@@ -208,11 +315,11 @@ def get_wallet(wallet_id: str):
             raise HTTPException(status_code=422, detail="Invalid wallet ID format")
         
 
-        wallet = session.query(Wallet).filter(Wallet.id == wallet_id).first()
+        wallet = await session.scalar(select(Wallet).where(Wallet.id == UUID(wallet_id)))
         if not wallet:
             raise HTTPException(status_code=404, detail="Wallet not found")
 
-        balance = get_balance(wallet.address)
+        balance = await get_cached_balance_async(wallet.address, fresh=fresh)
         return {
             "id": wallet.id,
             "name": wallet.name,
@@ -223,10 +330,10 @@ def get_wallet(wallet_id: str):
     except HTTPException:
         raise  # re-raise cleanly
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        session.close()
+        await session.close()
 
 @router.delete("/wallets/{wallet_id}", 
                 status_code=204,
@@ -239,8 +346,8 @@ def get_wallet(wallet_id: str):
                     500: {"description": "Internal server error"}
                 }
                 )
-def delete_wallet(wallet_id: str = Path(..., description="UUID of the wallet to delete")):
-    session = SessionLocal()
+async def delete_wallet(wallet_id: str = Path(..., description="UUID of the wallet to delete")):
+    session = AsyncSessionLocal()
     try:
 
         if not wallet_id or len(wallet_id) != 36:
@@ -251,19 +358,22 @@ def delete_wallet(wallet_id: str = Path(..., description="UUID of the wallet to
         except ValueError:
             raise HTTPException(status_code=422, detail="Invalid wallet ID format")
         
-        wallet = session.query(Wallet).filter(Wallet.id == wallet_id).first()
+        wallet = await session.scalar(select(Wallet).where(Wallet.id == UUID(wallet_id)))
         if not wallet:
             raise HTTPException(status_code=404, detail="Wallet not found")
 
-        session.delete(wallet)
-        session.commit()
+        address = wallet.address
+        await session.delete(wallet)
+        await session.commit()
+        await run_in_threadpool(get_utxo_cache().invalidate, address)
+        await run_in_threadpool(balance_cache.invalidate, address)
     except HTTPException:
         raise  # re-raise cleanly
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        session.close()
+        await session.close()
 
 @router.post(
     "/generate",
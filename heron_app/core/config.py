@@ -9,6 +9,110 @@ class Settings:
     POSTGRES_USER = os.getenv("POSTGRES_USER", "postgres")
     POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
 
-    DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@db:5432/heron_db"
+    # Point DB_HOST/DB_PORT at PgBouncer to pool connections across processes
+    DB_HOST = os.getenv("DB_HOST", "db")
+    DB_PORT = int(os.getenv("DB_PORT", "5432"))
 
-settings = Settings()
\ No newline at end of file
+    DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{DB_HOST}:{DB_PORT}/heron_db"
+    ASYNC_DATABASE_URL = f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{DB_HOST}:{DB_PORT}/heron_db"
+
+    # "queue" (pool per process) or "null" (pooling left to PgBouncer)
+    DB_POOL_MODE = os.getenv("DB_POOL_MODE", "queue")
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # Pool of the per-wallet workers, which run one task at a time
+    DB_WORKER_POOL_SIZE = int(os.getenv("DB_WORKER_POOL_SIZE", "1"))
+    DB_WORKER_MAX_OVERFLOW = int(os.getenv("DB_WORKER_MAX_OVERFLOW", "1"))
+
+    REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+
+    # UTxO cache: "redis" (shared) or "memory" (per process)
+    UTXO_CACHE_BACKEND = os.getenv("UTXO_CACHE_BACKEND", "redis")
+    UTXO_CACHE_TTL_SECONDS = int(os.getenv("UTXO_CACHE_TTL_SECONDS", "3600"))
+
+    # One of heron_app.utils.coin_selection.STRATEGIES
+    COIN_SELECTION_STRATEGY = os.getenv("COIN_SELECTION_STRATEGY", "largest-first")
+
+    # Submit a wallet's queued transactions back to back (tasks.process_wallet_chain)
+    TX_CHAINING_ENABLED = os.getenv("TX_CHAINING_ENABLED", "false").lower() == "true"
+    TX_CHAIN_MAX_LENGTH = int(os.getenv("TX_CHAIN_MAX_LENGTH", "25"))
+
+    # Coalesce plain payouts of a wallet into one on-chain transaction
+    TX_BATCHING_ENABLED = os.getenv("TX_BATCHING_ENABLED", "false").lower() == "true"
+    TX_BATCH_MAX_SIZE = int(os.getenv("TX_BATCH_MAX_SIZE", "50"))
+
+    # "partitioned" (shared workers) or "per-wallet" (one worker per wallet)
+    WALLET_SCHEDULER = os.getenv("WALLET_SCHEDULER", "partitioned")
+    WALLET_PARTITIONS = int(os.getenv("WALLET_PARTITIONS", "8"))
+    # Lock held while a task builds and submits for a wallet
+    WALLET_LOCK_TIMEOUT_SECONDS = int(os.getenv("WALLET_LOCK_TIMEOUT_SECONDS", "300"))
+    WALLET_LOCK_RETRY_SECONDS = int(os.getenv("WALLET_LOCK_RETRY_SECONDS", "2"))
+
+    # Exponential backoff with jitter for failed builds and submits
+    TX_MAX_RETRIES = int(os.getenv("TX_MAX_RETRIES", "6"))
+    TX_RETRY_BASE_SECONDS = int(os.getenv("TX_RETRY_BASE_SECONDS", "5"))
+    TX_RETRY_BAD_INPUTS_BASE_SECONDS = int(os.getenv("TX_RETRY_BAD_INPUTS_BASE_SECONDS", "60"))
+    TX_RETRY_MAX_SECONDS = int(os.getenv("TX_RETRY_MAX_SECONDS", "900"))
+
+    # Worker heartbeats in Redis
+    WORKER_HEARTBEAT_INTERVAL_SECONDS = int(os.getenv("WORKER_HEARTBEAT_INTERVAL_SECONDS", "10"))
+    WORKER_HEARTBEAT_TTL_SECONDS = int(os.getenv("WORKER_HEARTBEAT_TTL_SECONDS", "30"))
+    WORKER_STARTUP_GRACE_SECONDS = int(os.getenv("WORKER_STARTUP_GRACE_SECONDS", "60"))
+
+    # Most transactions accepted by one POST /transactions/bulk
+    TX_BULK_MAX_SIZE = int(os.getenv("TX_BULK_MAX_SIZE", "5000"))
+
+    # Default and maximum page size of the list endpoints
+    API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "100"))
+    API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "1000"))
+
+    # Queued transactions requeued per batch at startup
+    REQUEUE_BATCH_SIZE = int(os.getenv("REQUEUE_BATCH_SIZE", "1000"))
+
+    # Blockfrost rate limit shared by all processes through Redis
+    BLOCKFROST_RATE_LIMIT_ENABLED = os.getenv("BLOCKFROST_RATE_LIMIT_ENABLED", "true").lower() == "true"
+    BLOCKFROST_RATE_PER_SECOND = float(os.getenv("BLOCKFROST_RATE_PER_SECOND", "10"))
+    BLOCKFROST_BURST = int(os.getenv("BLOCKFROST_BURST", "500"))
+    BLOCKFROST_429_COOLDOWN_MS = int(os.getenv("BLOCKFROST_429_COOLDOWN_MS", "1000"))
+    BLOCKFROST_429_MAX_COOLDOWN_MS = int(os.getenv("BLOCKFROST_429_MAX_COOLDOWN_MS", "60000"))
+    BLOCKFROST_429_RETRIES = int(os.getenv("BLOCKFROST_429_RETRIES", "3"))
+
+    # Chain context caching of protocol/genesis parameters and the tip slot
+    CHAIN_PARAMS_TTL_SECONDS = int(os.getenv("CHAIN_PARAMS_TTL_SECONDS", "3600"))
+    CHAIN_PARAMS_SHARED = os.getenv("CHAIN_PARAMS_SHARED", "true").lower() == "true"
+    TIP_SLOT_TTL_SECONDS = int(os.getenv("TIP_SLOT_TTL_SECONDS", "20"))
+
+    # In-memory cache of derived signing keys (TTL 0 disables it)
+    KEY_CACHE_TTL_SECONDS = int(os.getenv("KEY_CACHE_TTL_SECONDS", "900"))
+    KEY_CACHE_MAX_SIZE = int(os.getenv("KEY_CACHE_MAX_SIZE", "256"))
+
+    # Oura stream reads
+    OURA_READ_BATCH_SIZE = int(os.getenv("OURA_READ_BATCH_SIZE", "500"))
+    OURA_PENDING_REFRESH_SECONDS = int(os.getenv("OURA_PENDING_REFRESH_SECONDS", "30"))
+    # Oura listener consumer group and lease (consumer name defaults to the hostname)
+    OURA_CONSUMER_GROUP = os.getenv("OURA_CONSUMER_GROUP", "heron")
+    OURA_CONSUMER_NAME = os.getenv("OURA_CONSUMER_NAME", "")
+    OURA_LEASE_SECONDS = int(os.getenv("OURA_LEASE_SECONDS", "30"))
+    OURA_STREAM_MAXLEN = int(os.getenv("OURA_STREAM_MAXLEN", "0"))
+
+    # Blocks until a transaction counts as confirmed, and blocks kept for rollbacks
+    TX_CONFIRMATION_DEPTH = int(os.getenv("TX_CONFIRMATION_DEPTH", "10"))
+    CHAIN_FOLLOWER_MAX_ROLLBACK = int(os.getenv("CHAIN_FOLLOWER_MAX_ROLLBACK", "2160"))
+
+    # Local UTxO ledger of our wallets, kept by the chain follower
+    UTXO_LEDGER_ENABLED = os.getenv("UTXO_LEDGER_ENABLED", "true").lower() == "true"
+    UTXO_LEDGER_SYNC_INTERVAL_SECONDS = int(os.getenv("UTXO_LEDGER_SYNC_INTERVAL_SECONDS", "30"))
+    UTXO_LEDGER_SYNC_BATCH = int(os.getenv("UTXO_LEDGER_SYNC_BATCH", "10"))
+
+    # Balance cache (stale-while-revalidate)
+    BALANCE_CACHE_FRESH_SECONDS = int(os.getenv("BALANCE_CACHE_FRESH_SECONDS", "30"))
+    BALANCE_CACHE_MAX_STALE_SECONDS = int(os.getenv("BALANCE_CACHE_MAX_STALE_SECONDS", "600"))
+
+    # Bulk balance lookups: concurrent computations and wallets per request
+    BALANCE_BULK_CONCURRENCY = int(os.getenv("BALANCE_BULK_CONCURRENCY", "8"))
+    BALANCE_BULK_MAX_WALLETS = int(os.getenv("BALANCE_BULK_MAX_WALLETS", "100"))
+
+settings = Settings()
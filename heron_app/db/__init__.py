@@ -4,6 +4,8 @@ from .models.transaction_output import TransactionOutput
 from .models.transaction_output_asset import TransactionOutputAsset
 from .models.minting_policies import MintingPolicy
 from .models.transaction_mint import TransactionMint
+from .models.chain_block import ChainBlock
+from .models.wallet_utxo import WalletUtxo
 
 __all__ = [
     "Wallet",
@@ -12,4 +14,6 @@ __all__ = [
     "TransactionOutputAsset",
     "MintingPolicy",
     "TransactionMint",
+    "ChainBlock",
+    "WalletUtxo",
 ]
\ No newline at end of file
@@ -0,0 +1,57 @@
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Query, Session, joinedload, selectinload  # type: ignore
+
+from heron_app.db.models.minting_policies import MintingPolicy
+from heron_app.db.models.transaction import Transaction
+from heron_app.db.models.transaction_mint import TransactionMint
+from heron_app.db.models.transaction_output import TransactionOutput
+from heron_app.db.models.wallet import Wallet
+
+
+class BuildPlan:
+    """
+    Everything needed to build one on-chain transaction: the transaction
+    row(s) it carries (one, or a payout batch) with their wallet, outputs,
+    output assets, mints and minting policies already loaded.
+
+    Rows must come from `hydrated_transactions`, otherwise accessing the
+    relationships below falls back to one lazy query per row.
+    """
+
+    def __init__(self, transactions: List[Transaction]):
+        self.transactions = transactions
+
+    @property
+    def wallet(self) -> Wallet:
+        return self.transactions[0].wallet
+
+    @property
+    def outputs(self) -> List[TransactionOutput]:
+        return [out for tx in self.transactions for out in tx.outputs]
+
+    @property
+    def mints(self) -> List[TransactionMint]:
+        return [mint for tx in self.transactions for mint in tx.mints]
+
+    @property
+    def policies(self) -> Dict[str, MintingPolicy]:
+        return {mint.policy_id: mint.policy for mint in self.mints if mint.policy is not None}
+
+
+def hydrated_transactions(session: Session) -> Query:
+    """
+    Transaction query that eager-loads everything a build touches, in a fixed
+    number of round trips (transaction + wallet, outputs, output assets,
+    mints + policies) no matter how many outputs or mints there are.
+    """
+    return session.query(Transaction).options(
+        joinedload(Transaction.wallet),
+        selectinload(Transaction.outputs).selectinload(TransactionOutput.assets),
+        selectinload(Transaction.mints).joinedload(TransactionMint.policy),
+    )
+
+
+def load_build_plan(session: Session, transaction_id) -> Optional[BuildPlan]:
+    tx = hydrated_transactions(session).filter(Transaction.id == transaction_id).first()
+    return BuildPlan([tx]) if tx else None
@@ -1,18 +1,93 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 import os
+from uuid import uuid4
 from dotenv import load_dotenv
 
+from heron_app.core.config import settings
+from heron_app.utils import metrics
+
 load_dotenv()
 
 
 POSTGRES_USER = os.getenv("POSTGRES_USER", "postgres")
 POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
 
-SQLALCHEMY_DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@db:5432/heron_db"
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+ASYNC_SQLALCHEMY_DATABASE_URL = settings.ASYNC_DATABASE_URL
+
+
+def _pool_options(is_async: bool = False) -> dict:
+    """
+    Engine keyword arguments for the pool selected by DB_POOL_MODE.
+    """
+    if settings.DB_POOL_MODE == "null":
+        options = {"poolclass": NullPool}
+        if is_async:
+            # PgBouncer in transaction mode cannot keep server-side prepared
+            # statements across transactions. asyncpg still prepares every
+            # statement, so give each a unique name: the same name may come
+            # back on a server connection that already holds it.
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        return options
+    if settings.DB_POOL_MODE != "queue":
+        raise ValueError(f"Invalid DB_POOL_MODE: {settings.DB_POOL_MODE}. Must be 'queue' or 'null'.")
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _instrument(sync_engine, name: str) -> None:
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.incr(f"db.{name}.connect")
 
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.incr(f"db.{name}.checkout")
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **_pool_options())
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
+
+# Used by the API routers. Workers and startup code keep the sync session.
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, **_pool_options(is_async=True))
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+_instrument(engine, "sync")
+_instrument(async_engine.sync_engine, "async")
+
+
+def pool_status() -> dict:
+    """
+    Current state of this process's connection pools, plus connect/checkout
+    counters since startup.
+    """
+    status = {}
+    for name, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool)):
+        entry = {"class": type(pool).__name__}
+        if not isinstance(pool, NullPool):
+            entry.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            })
+        entry.update({
+            "connects": metrics.snapshot(f"db.{name}.connect").get(f"db.{name}.connect", 0),
+            "checkouts": metrics.snapshot(f"db.{name}.checkout").get(f"db.{name}.checkout", 0),
+        })
+        status[name] = entry
+    return status
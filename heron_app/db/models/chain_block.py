@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime # type: ignore
+
+from datetime import datetime
+from heron_app.db.database import Base
+
+class ChainBlock(Base):
+    """
+    Recent blocks applied by the chain follower, newest last. Rolled-back
+    blocks are deleted; the oldest are pruned past CHAIN_FOLLOWER_MAX_ROLLBACK.
+    """
+    __tablename__ = "chain_blocks"
+
+    slot = Column(BigInteger, primary_key=True)
+    hash = Column(String, nullable=False)
+    height = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Integer
+from sqlalchemy import Column, String, DateTime, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from heron_app.db.database import Base
 import uuid
@@ -6,6 +6,9 @@ from datetime import datetime
 
 class MintingPolicy(Base):
     __tablename__ = "minting_policies"
+    __table_args__ = (
+        Index("ix_minting_policies_created_at_id", "created_at", "id"),  # keyset pagination
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, unique=True, nullable=False)
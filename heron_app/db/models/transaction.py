@@ -6,9 +6,25 @@ import uuid
 from datetime import datetime
 from heron_app.db.database import Base
 from heron_app.db.models.transaction_output import TransactionOutput
+from heron_app.db.models.transaction_mint import TransactionMint
+from heron_app.db.models.wallet import Wallet
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Keyset pagination of GET /transactions, unfiltered or by wallet/status
+        sa.Index("ix_transactions_created_at_id", "created_at", "id"),
+        sa.Index("ix_transactions_wallet_id_created_at_id", "wallet_id", "created_at", "id"),
+        sa.Index("ix_transactions_status_created_at_id", "status", "created_at", "id"),
+        # Queued rows of a wallet in submission order (batching, startup requeue)
+        sa.Index("ix_transactions_queued", "wallet_id", "created_at", postgresql_where=sa.text("status = 'queued'")),
+        # Submitted rows awaiting the chain (pending hashes, oura intersect)
+        sa.Index("ix_transactions_in_flight", "created_at", postgresql_where=sa.text("status IN ('submitted', 'on_chain')")),
+        # Rows to confirm as the tip advances
+        sa.Index("ix_transactions_on_chain_height", "block_height", postgresql_where=sa.text("status = 'on_chain'")),
+        # Rows to revert on a rollback
+        sa.Index("ix_transactions_block_slot", "block_slot", postgresql_where=sa.text("block_slot IS NOT NULL")),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     numeric_id = Column(
@@ -21,7 +37,7 @@ class Transaction(Base):
     wallet_id = Column(UUID(as_uuid=True), ForeignKey("wallets.id"), nullable=False)
     metadata_json = Column(JSON, nullable=True)
     status = Column(String, default="queued")
-    tx_hash = Column(String, nullable=True)
+    tx_hash = Column(String, nullable=True, index=True)
     tx_fee = Column(Integer, nullable=True)
     tx_size = Column(Integer, nullable=True)
     error_message = Column(String, nullable=True)
@@ -29,4 +45,12 @@ class Transaction(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     retries = Column(Integer, default=0)
     confirmed_at = Column(DateTime, nullable=True)
-    outputs = relationship("TransactionOutput", backref="transaction", cascade="all, delete-orphan")
+    next_attempt_at = Column(DateTime, nullable=True)  # earliest retry after a failed attempt
+    batch_id = Column(UUID(as_uuid=True), nullable=True)  # shared by rows batched into one on-chain tx
+    # Block the tx was seen in by the chain follower; cleared on rollback
+    block_hash = Column(String, nullable=True)
+    block_height = Column(Integer, nullable=True)
+    block_slot = Column(sa.BigInteger, nullable=True)
+    outputs = relationship("TransactionOutput", backref="transaction", cascade="all, delete-orphan", order_by="TransactionOutput.id")
+    mints = relationship("TransactionMint", backref="transaction", cascade="all, delete-orphan", order_by="TransactionMint.id")
+    wallet = relationship("Wallet")
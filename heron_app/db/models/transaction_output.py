@@ -11,11 +11,11 @@ class TransactionOutput(Base):
     __tablename__ = "transaction_outputs"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    transaction_id = Column(Integer, ForeignKey("transactions.numeric_id"), nullable=False)
+    transaction_id = Column(Integer, ForeignKey("transactions.numeric_id"), nullable=False, index=True)
     address = Column(String, nullable=False)
     datum = Column(JSON, nullable=True)  # JSON for inline datum
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
-    assets = relationship("TransactionOutputAsset", backref="output", cascade="all, delete-orphan")
+    assets = relationship("TransactionOutputAsset", backref="output", cascade="all, delete-orphan", order_by="TransactionOutputAsset.id")
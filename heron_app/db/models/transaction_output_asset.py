@@ -9,7 +9,7 @@ class TransactionOutputAsset(Base):
     __tablename__ = "transaction_output_assets"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    output_id = Column(Integer, ForeignKey("transaction_outputs.id"), nullable=False)
+    output_id = Column(Integer, ForeignKey("transaction_outputs.id"), nullable=False, index=True)
     unit = Column(String, nullable=False)  # 'lovelace', 'policyid.assetname'
     quantity = Column(String, nullable=False)  # store as string to avoid int overflow
     created_at = Column(DateTime, default=datetime.utcnow)
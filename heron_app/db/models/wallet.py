@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime # type: ignore
+from sqlalchemy import Column, String, DateTime, BigInteger, Index # type: ignore
 from sqlalchemy.dialects.postgresql import UUID # type: ignore
 import uuid
 from datetime import datetime
@@ -6,9 +6,15 @@ from heron_app.db.database import Base
 
 class Wallet(Base):
     __tablename__ = "wallets"
+    __table_args__ = (
+        Index("ix_wallets_created_at_id", "created_at", "id"),  # keyset pagination
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
     address = Column(String, nullable=False, unique=True)
     encrypted_root_key = Column(String, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.utcnow)
+    # Slot of the Blockfrost snapshot the local UTxO ledger was built from;
+    # None until the chain follower has synced the address (or after a resync request)
+    utxos_synced_slot = Column(BigInteger, nullable=True)
\ No newline at end of file
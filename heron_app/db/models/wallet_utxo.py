@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, Integer, BigInteger, JSON, Index, text # type: ignore
+
+from heron_app.db.database import Base
+
+class WalletUtxo(Base):
+    """
+    Outputs held by our wallet addresses, maintained by the chain follower.
+    Spent outputs stay (with spent_slot) until they are too deep to be
+    rolled back.
+    """
+    __tablename__ = "wallet_utxos"
+    __table_args__ = (
+        # Rollbacks and pruning select by slot; snapshot and unspent rows have none
+        Index("ix_wallet_utxos_created_slot", "created_slot", postgresql_where=text("created_slot IS NOT NULL")),
+        Index("ix_wallet_utxos_spent_slot", "spent_slot", postgresql_where=text("spent_slot IS NOT NULL")),
+    )
+
+    tx_hash = Column(String, primary_key=True)
+    tx_index = Column(Integer, primary_key=True)
+    address = Column(String, nullable=False, index=True)
+    amounts = Column(JSON, nullable=False)  # {unit: quantity}, as in the UTxO cache
+    created_slot = Column(BigInteger, nullable=True)  # None when taken from a Blockfrost snapshot
+    spent_slot = Column(BigInteger, nullable=True)
+    spent_by = Column(String, nullable=True)
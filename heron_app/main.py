@@ -2,13 +2,17 @@ from fastapi import FastAPI # type: ignore
 from heron_app.api.routes import router as api_router
 from heron_app.db.database import SessionLocal
 from heron_app.db.models.transaction import Transaction
-from heron_app.workers.tasks import process_transaction, enqueue_transaction
+from heron_app.core.config import settings
+from heron_app.workers.tasks import dispatch_transactions
 from heron_app.db.models.wallet import Wallet
-from heron_app.workers.start_wallet_worker import start_worker
+from heron_app.workers.start_wallet_worker import start_all_workers
 from heron_app.utils.registry_loader import start_registry_loader
 
 import time
 import os
+from collections import defaultdict
+
+from sqlalchemy import func, null, select # type: ignore
 
 
 app = FastAPI()
@@ -38,14 +42,44 @@ def requeue_pending_transactions():
             start_registry_loader()
 
             wallets = session.query(Wallet).all()
-            for wallet in wallets:
-                start_worker(str(wallet.id))
-
-            time.sleep(2)  # Wait for workers to start
+            start_all_workers([str(wallet.id) for wallet in wallets])
 
-            pending_txs = session.query(Transaction).filter_by(status="queued").all()
-            for tx in pending_txs:
-                print(f"Requeuing transaction {tx.id}")
-                enqueue_transaction(str(tx.id))  # Send to Celery
+            # No need to wait for the workers: the broker holds the messages
+            requeue_queued_transactions(session)
         finally:
-            session.close()
\ No newline at end of file
+            session.close()
+
+
+def requeue_queued_transactions(session) -> int:
+    """
+    Send every 'queued' transaction back to its wallet's queue, oldest
+    first. Rows are streamed from a server-side cursor REQUEUE_BATCH_SIZE
+    at a time, and each batch is published as one group with the messages
+    of a wallet kept together and in order. In chaining or batching mode
+    one chain task is sent per wallet; each chain sends itself again while
+    the wallet has more queued rows than fit in one.
+    """
+    queued = Transaction.status == "queued"
+    unit = "transaction(s)"
+    if settings.TX_CHAINING_ENABLED or settings.TX_BATCHING_ENABLED:
+        unit = "wallet chain(s)"
+        stmt = (
+            select(null(), Transaction.wallet_id)
+            .where(queued)
+            .group_by(Transaction.wallet_id)
+            .order_by(func.min(Transaction.created_at))
+        )
+    else:
+        stmt = select(Transaction.id, Transaction.wallet_id).where(queued).order_by(Transaction.created_at, Transaction.id)
+
+    started = time.monotonic()
+    requeued = 0
+    result = session.execute(stmt.execution_options(yield_per=settings.REQUEUE_BATCH_SIZE))
+    for batch in result.partitions():
+        by_wallet = defaultdict(list)
+        for transaction_id, wallet_id in batch:
+            by_wallet[wallet_id].append((transaction_id, wallet_id))
+        dispatch_transactions([row for rows in by_wallet.values() for row in rows])
+        requeued += len(batch)
+        print(f"Requeued {requeued} {unit} in {time.monotonic() - started:.1f}s")
+    return requeued
\ No newline at end of file
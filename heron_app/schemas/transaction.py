@@ -25,8 +25,18 @@ class TransactionOut(BaseModel):
     tx_size: Optional[int] = None
     updated_at: datetime
     error_message: Optional[str] = None
+    retries: Optional[int] = None
+    next_attempt_at: Optional[datetime] = None
+    batch_id: Optional[UUID] = None
+    block_hash: Optional[str] = None
+    block_height: Optional[int] = None
+    block_slot: Optional[int] = None
+    confirmations: Optional[int] = None
     outputs: List[TransactionOutputSchema]
     outputs: List[TransactionOutputSchema]
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class TransactionBulkOut(BaseModel):
+    ids: List[UUID]
@@ -0,0 +1,137 @@
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import redis
+
+from heron_app.core.config import settings
+from heron_app.utils import metrics
+from heron_app.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_PREFIX = "heron:balance"
+
+
+def _key(address: str) -> str:
+    return f"{REDIS_PREFIX}:{address}"
+
+
+def _fresh_key(address: str) -> str:
+    return f"{REDIS_PREFIX}:fresh:{address}"
+
+
+def sum_utxos(utxos: list) -> dict:
+    """
+    Balance ({"lovelace", "assets"}, quantities as strings) of UTxO cache entries.
+    """
+    total_lovelace = 0
+    asset_totals: dict = {}
+
+    for utxo in utxos:
+        for unit, quantity in utxo["amounts"].items():
+            if unit == "lovelace":
+                total_lovelace += int(quantity)
+            else:
+                if unit not in asset_totals:
+                    asset_totals[unit] = 0
+                asset_totals[unit] += int(quantity)
+
+    return {
+        "lovelace": str(total_lovelace),
+        "assets": {k: str(v) for k, v in asset_totals.items()},
+    }
+
+
+def get_balances(addresses: List[str]) -> Dict[str, Tuple[dict, bool]]:
+    """
+    Cached balances as {address: (balance, is_fresh)}, in two round trips.
+    A balance is fresh for BALANCE_CACHE_FRESH_SECONDS after it was written
+    and can be served stale for up to BALANCE_CACHE_MAX_STALE_SECONDS.
+    Missing addresses are left out.
+    """
+    if not addresses:
+        return {}
+    try:
+        client = get_redis()
+        values = client.mget([_key(a) for a in addresses])
+        fresh = client.mget([_fresh_key(a) for a in addresses])
+    except redis.RedisError as e:
+        logger.warning(f"Balance cache read failed: {e}")
+        return {}
+
+    cached = {}
+    for address, value, is_fresh in zip(addresses, values, fresh):
+        if value is None:
+            metrics.incr("balance_cache.miss")
+            continue
+        metrics.incr("balance_cache.hit" if is_fresh else "balance_cache.stale")
+        cached[address] = (json.loads(value), is_fresh is not None)
+    return cached
+
+
+def get_balance(address: str) -> Optional[Tuple[dict, bool]]:
+    return get_balances([address]).get(address)
+
+
+def set_balances(balances: Dict[str, dict], fresh: bool = True) -> None:
+    """
+    Cache `balances`. With fresh=False they are served, but revalidated on
+    the next read (see mark_stale).
+    """
+    if not balances:
+        return
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for address, balance in balances.items():
+            pipe.set(_key(address), json.dumps(balance), ex=settings.BALANCE_CACHE_MAX_STALE_SECONDS)
+            if fresh:
+                pipe.set(_fresh_key(address), 1, ex=settings.BALANCE_CACHE_FRESH_SECONDS)
+            else:
+                pipe.delete(_fresh_key(address))
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Balance cache write failed: {e}")
+
+
+def set_balance(address: str, balance: dict, fresh: bool = True) -> None:
+    set_balances({address: balance}, fresh=fresh)
+
+
+def mark_stale(addresses: Iterable[str]) -> None:
+    """
+    Keep serving the cached balances, but revalidate them on the next read.
+    """
+    keys = [_fresh_key(a) for a in addresses]
+    if not keys:
+        return
+    try:
+        get_redis().delete(*keys)
+    except redis.RedisError as e:
+        logger.warning(f"Balance cache invalidation failed: {e}")
+
+
+def invalidate(address: str) -> None:
+    try:
+        get_redis().delete(_key(address), _fresh_key(address))
+    except redis.RedisError as e:
+        logger.warning(f"Balance cache invalidation failed: {e}")
+
+
+def claim_refreshes(addresses: List[str]) -> List[str]:
+    """
+    The addresses whose stale balance this reader should revalidate, in one
+    round trip: each is claimed by one reader across processes, the others
+    keep serving the stale value meanwhile.
+    """
+    if not addresses:
+        return []
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for address in addresses:
+            pipe.set(f"{REDIS_PREFIX}:refresh:{address}", 1, nx=True, ex=settings.BALANCE_CACHE_FRESH_SECONDS)
+        claimed = pipe.execute()
+    except redis.RedisError:
+        return []
+    return [address for address, ok in zip(addresses, claimed) if ok]
+
@@ -0,0 +1,52 @@
+from typing import List, Optional
+
+import httpx
+from blockfrost import ApiError
+
+from heron_app.core.config import settings
+from heron_app.utils.rate_limiter import get_blockfrost_limiter
+
+
+class AsyncBlockFrostApi:
+    """
+    Minimal asyncio Blockfrost client for the API layer, covering the
+    endpoints the routers need. One pooled httpx client is kept per process,
+    and requests go through the shared Blockfrost rate limiter.
+    Errors are raised as blockfrost.ApiError, like the sync client.
+    """
+
+    def __init__(self, project_id: str, base_url: str, timeout: float = 10.0):
+        self.base_url = base_url.rstrip("/")
+        self._client = httpx.AsyncClient(
+            base_url=f"{self.base_url}/v0",
+            headers={"project_id": project_id},
+            timeout=timeout,
+        )
+
+    async def _get(self, path: str, **params):
+        limiter = get_blockfrost_limiter()
+        for attempt in range(settings.BLOCKFROST_429_RETRIES + 1):
+            await limiter.acquire_async()
+            response = await self._client.get(path, params=params)
+            if response.status_code == 429 and attempt < settings.BLOCKFROST_429_RETRIES:
+                await limiter.throttled_async()
+                continue
+            if response.status_code != 200:
+                raise ApiError(response)
+            return response.json()
+
+    async def address_utxos(self, address: str, count: int = 100, page: int = 1) -> List[dict]:
+        return await self._get(f"/addresses/{address}/utxos", count=count, page=page)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_api: Optional[AsyncBlockFrostApi] = None
+
+
+def get_async_blockfrost_api(project_id: str, base_url: str) -> AsyncBlockFrostApi:
+    global _api
+    if _api is None:
+        _api = AsyncBlockFrostApi(project_id, base_url)
+    return _api
@@ -1,8 +1,11 @@
+import asyncio
+import logging
 import os
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Dict, List, Optional, Union
 
 from fastapi import HTTPException  # type: ignore
+from starlette.concurrency import run_in_threadpool  # type: ignore
 from blockfrost import BlockFrostApi, ApiError, ApiUrls, BlockFrostIPFS
 from pycardano import (
     Address,
@@ -14,6 +17,16 @@ from pycardano import (
     InvalidHereAfter,
 )
 
+from heron_app.core.config import settings
+from heron_app.db.database import AsyncSessionLocal, SessionLocal
+from heron_app.utils import balance_cache
+from heron_app.utils.balance_cache import sum_utxos
+from heron_app.utils.blockfrost_async import get_async_blockfrost_api
+from heron_app.utils.rate_limiter import RateLimitedBlockFrostApi
+from heron_app.workers.utxo_ledger import ledger_utxos, ledger_utxos_async
+
+logger = logging.getLogger(__name__)
+
 SLOTS_PER_SECOND = 1  # Preprod is 1 slot/sec
 NETWORK_START = datetime(2020, 7, 29, tzinfo=timezone.utc)  # Shelley start
 
@@ -64,14 +77,18 @@ class GenericSubmitError(TransactionSubmitError):
     """Fallback for other transaction submit errors"""
     pass
 
+class TransactionTooLargeError(TransactionSubmitError):
+    """Raised when the built transaction exceeds the protocol's max_tx_size"""
+    pass
+
 network = os.getenv("network")
 
 
-def _get_blockfrost_api() -> BlockFrostApi:
+def _get_blockfrost_api() -> RateLimitedBlockFrostApi:
     """
     Centralized Blockfrost API client construction with validated configuration.
     """
-    return BlockFrostApi(project_id=BLOCKFROST_API_KEY, base_url=BASE_URL)
+    return RateLimitedBlockFrostApi(BlockFrostApi(project_id=BLOCKFROST_API_KEY, base_url=BASE_URL))
 
 
 def _validate_address(address: str) -> None:
@@ -92,18 +109,29 @@ def _validate_address(address: str) -> None:
 def get_balance(address: str) -> dict:
     """
     Return balance for a given address by aggregating all UTXOs.
+    Served from the local UTxO ledger when it covers the address, otherwise
+    fetched from Blockfrost. The workers' UTxO cache is not used: it only
+    sees the wallet's own spends, not incoming payments.
     Performs internal address validation before querying Blockfrost.
     """
 
     _validate_address(address)
+
+    session = SessionLocal()
+    try:
+        ledger = ledger_utxos(session, address)
+    finally:
+        session.close()
+    if ledger is not None:
+        return sum_utxos(ledger)
+
     api = _get_blockfrost_api()
 
     try:
         # Use explicit pagination to minimise repeated calls from higher layers.
         # This fetches all pages once per call and aggregates locally.
         page = 1
-        total_lovelace = 0
-        asset_totals: dict = {}
+        all_utxos = []
 
         while True:
             utxos = api.address_utxos(address=address, count=100, page=page)
@@ -111,38 +139,152 @@ def get_balance(address: str) -> dict:
                 break
 
             for utxo in utxos:
-                for amt in utxo.amount:
-                    if amt.unit == "lovelace":
-                        total_lovelace += int(amt.quantity)
-                    else:
-                        if amt.unit not in asset_totals:
-                            asset_totals[amt.unit] = 0
-                        asset_totals[amt.unit] += int(amt.quantity)
+                all_utxos.append({
+                    "tx_hash": utxo.tx_hash,
+                    "tx_index": utxo.tx_index,
+                    "amounts": {amt.unit: int(amt.quantity) for amt in utxo.amount},
+                })
+
+            if len(utxos) < 100:
+                break
+
+            page += 1
+
+        return sum_utxos(all_utxos)
+
+    except ApiError as e:
+        return _balance_error(e)
+
+
+async def get_balance_async(address: str, fresh: bool = False) -> dict:
+    """
+    Async variant of get_balance for the API layer: Blockfrost pages are
+    fetched with the non-blocking client instead of tying up a threadpool
+    worker for the whole pagination.
+    With fresh=True the balance always comes from Blockfrost.
+    """
+
+    _validate_address(address)
+
+    if not fresh:
+        async with AsyncSessionLocal() as session:
+            ledger = await ledger_utxos_async(session, address)
+        if ledger is not None:
+            return sum_utxos(ledger)
+
+    api = get_async_blockfrost_api(BLOCKFROST_API_KEY, BASE_URL)
+
+    try:
+        page = 1
+        all_utxos = []
+
+        while True:
+            utxos = await api.address_utxos(address=address, count=100, page=page)
+            if not utxos:
+                break
+
+            for utxo in utxos:
+                all_utxos.append({
+                    "tx_hash": utxo["tx_hash"],
+                    "tx_index": utxo["tx_index"],
+                    "amounts": {amt["unit"]: int(amt["quantity"]) for amt in utxo["amount"]},
+                })
 
             if len(utxos) < 100:
                 break
 
             page += 1
 
-        return {
-            "lovelace": str(total_lovelace),
-            "assets": {k: str(v) for k, v in asset_totals.items()},
-        }
+        return sum_utxos(all_utxos)
 
     except ApiError as e:
-        # 404: Treat as "no balance yet" instead of hard error.
-        if e.status_code == 404:
-            return {"lovelace": "0", "assets": {}}
-
-        # Authentication / quota issues – surface a clear, firm error.
-        if e.status_code in (401, 403, 429):
-            raise HTTPException(
-                status_code=502,
-                detail=f"Blockfrost API authentication or rate-limit error: {e}",
-            )
-
-        # Fallback – still differentiate as upstream issue.
-        raise HTTPException(status_code=502, detail=f"Blockfrost API error: {e}")
+        return _balance_error(e)
+
+
+# Background revalidations, referenced until done so they aren't collected
+_refreshing: set = set()
+
+
+async def _refresh_balance(address: str) -> None:
+    # From the ledger or Blockfrost, which see the payments and confirmations
+    # the chain follower marked the balance stale for
+    try:
+        await run_in_threadpool(balance_cache.set_balance, address, await get_balance_async(address))
+    except Exception as e:
+        logger.warning(f"Balance refresh of {address} failed: {e}")
+
+
+async def _revalidate(addresses: List[str]) -> None:
+    if not addresses:
+        return
+    for address in await run_in_threadpool(balance_cache.claim_refreshes, addresses):
+        task = asyncio.create_task(_refresh_balance(address))
+        _refreshing.add(task)
+        task.add_done_callback(_refreshing.discard)
+
+
+async def get_cached_balance_async(address: str, fresh: bool = False) -> dict:
+    """
+    Balance for the API, served from the balance cache (see
+    heron_app.utils.balance_cache). A stale balance is returned as is while
+    one request revalidates it in the background; a miss, or fresh=True,
+    computes it now (from Blockfrost for fresh=True) and caches it.
+    Redis is called from the threadpool, off the event loop.
+    """
+    if not fresh:
+        cached = await run_in_threadpool(balance_cache.get_balance, address)
+        if cached:
+            balance, is_fresh = cached
+            if not is_fresh:
+                await _revalidate([address])
+            return balance
+
+    balance = await get_balance_async(address, fresh=fresh)
+    await run_in_threadpool(balance_cache.set_balance, address, balance)
+    return balance
+
+
+async def get_cached_balances_async(addresses: List[str], fresh: bool = False) -> Dict[str, Union[dict, Exception]]:
+    """
+    get_cached_balance_async for many addresses: cached balances are read,
+    and the stale ones claimed for revalidation, in one round trip each; the
+    rest are computed concurrently, at most BALANCE_BULK_CONCURRENCY at a
+    time. A failed address maps to its exception instead of failing the
+    others.
+    """
+    cached = {} if fresh else await run_in_threadpool(balance_cache.get_balances, addresses)
+    await _revalidate([address for address, (_, is_fresh) in cached.items() if not is_fresh])
+
+    semaphore = asyncio.Semaphore(settings.BALANCE_BULK_CONCURRENCY)
+
+    async def compute(address: str) -> dict:
+        async with semaphore:
+            return await get_balance_async(address, fresh=fresh)
+
+    missing = [address for address in dict.fromkeys(addresses) if address not in cached]
+    computed = dict(zip(missing, await asyncio.gather(*map(compute, missing), return_exceptions=True)))
+    ok = {address: balance for address, balance in computed.items() if not isinstance(balance, Exception)}
+    await run_in_threadpool(balance_cache.set_balances, ok)
+
+    balances = {address: balance for address, (balance, _) in cached.items()}
+    balances.update(computed)
+    return balances
+
+
+def _balance_error(e: ApiError) -> dict:
+    # 404: Treat as "no balance yet" instead of hard error.
+    if e.status_code == 404:
+        return {"lovelace": "0", "assets": {}}
+
+    # Authentication / quota issues – surface a clear, firm error.
+    if e.status_code in (401, 403, 429):
+        raise HTTPException(
+            status_code=502,
+            detail=f"Blockfrost API authentication or rate-limit error: {e}",
+        )
+
+    # Fallback – still differentiate as upstream issue.
+    raise HTTPException(status_code=502, detail=f"Blockfrost API error: {e}")
 
 
 def generate_policy(lock_date: Optional[datetime] = None):
@@ -0,0 +1,153 @@
+import dataclasses
+import json
+import logging
+import threading
+import time
+from fractions import Fraction
+from typing import Optional
+
+import redis
+from pycardano import BlockFrostChainContext, GenesisParameters, ProtocolParameters
+
+from heron_app.core.config import settings
+from heron_app.utils import metrics
+from heron_app.utils.rate_limiter import RateLimitedBlockFrostApi
+from heron_app.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_PREFIX = "heron:chain"
+
+
+def _encode(params) -> str:
+    def default(value):
+        if isinstance(value, Fraction):
+            return {"__fraction__": [value.numerator, value.denominator]}
+        raise TypeError(f"Unsupported type in chain parameters: {type(value)}")
+
+    return json.dumps(dataclasses.asdict(params), default=default)
+
+
+def _decode(cls, raw: str):
+    def hook(obj):
+        if "__fraction__" in obj:
+            return Fraction(*obj["__fraction__"])
+        return obj
+
+    return cls(**json.loads(raw, object_hook=hook))
+
+
+class CachedBlockFrostChainContext(BlockFrostChainContext):
+    """
+    BlockFrostChainContext meant to live for the whole process.
+
+    Protocol and genesis parameters are kept until the current epoch ends or
+    CHAIN_PARAMS_TTL_SECONDS pass, whichever comes first, and are shared with
+    other processes through Redis when CHAIN_PARAMS_SHARED is set. The tip
+    slot is extrapolated from the last fetched block (one slot per second)
+    for TIP_SLOT_TTL_SECONDS. Hits and misses are counted under the
+    "chain_context." metrics prefix. Blockfrost calls go through the shared
+    rate limiter.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.api = RateLimitedBlockFrostApi(self.api)
+        self._lock = threading.RLock()
+        self._cached_at = {}
+        self._tip = None
+
+    def _epoch_end(self) -> int:
+        if int(time.time()) >= self._epoch_info.end_time:
+            self._epoch_info = self.api.epoch_latest()
+            metrics.incr("chain_context.epoch.refresh")
+        return self._epoch_info.end_time
+
+    def _fresh(self, name: str) -> bool:
+        cached = self._cached_at.get(name)
+        if cached is None:
+            return False
+        cached_at, epoch = cached
+        self._epoch_end()
+        return epoch == self._epoch_info.epoch and time.time() - cached_at <= settings.CHAIN_PARAMS_TTL_SECONDS
+
+    def _load_shared(self, name: str, cls):
+        if not settings.CHAIN_PARAMS_SHARED:
+            return None
+        try:
+            raw = get_redis().get(f"{REDIS_PREFIX}:{name}:{self._epoch_info.epoch}")
+        except redis.RedisError as e:
+            logger.warning(f"Shared chain parameter read failed: {e}")
+            return None
+        return _decode(cls, raw) if raw else None
+
+    def _store_shared(self, name: str, params) -> None:
+        if not settings.CHAIN_PARAMS_SHARED:
+            return
+        ttl = max(1, min(settings.CHAIN_PARAMS_TTL_SECONDS, self._epoch_end() - int(time.time())))
+        try:
+            get_redis().set(f"{REDIS_PREFIX}:{name}:{self._epoch_info.epoch}", _encode(params), ex=ttl)
+        except redis.RedisError as e:
+            logger.warning(f"Shared chain parameter write failed: {e}")
+
+    def _cached(self, name: str, cls, fetch):
+        attr = f"_{name}"
+        with self._lock:
+            if getattr(self, attr) is not None and self._fresh(name):
+                metrics.incr(f"chain_context.{name}.hit")
+                return getattr(self, attr)
+
+            params = self._load_shared(name, cls)
+            if params is not None:
+                metrics.incr(f"chain_context.{name}.shared_hit")
+            else:
+                metrics.incr(f"chain_context.{name}.miss")
+                setattr(self, attr, None)
+                params = fetch(self)
+                self._store_shared(name, params)
+
+            setattr(self, attr, params)
+            self._cached_at[name] = (time.time(), self._epoch_info.epoch)
+            return params
+
+    @property
+    def epoch(self) -> int:
+        with self._lock:
+            self._epoch_end()
+            return self._epoch_info.epoch
+
+    @property
+    def protocol_param(self) -> ProtocolParameters:
+        return self._cached("protocol_param", ProtocolParameters, BlockFrostChainContext.protocol_param.fget)
+
+    @property
+    def genesis_param(self) -> GenesisParameters:
+        return self._cached("genesis_param", GenesisParameters, BlockFrostChainContext.genesis_param.fget)
+
+    @property
+    def last_block_slot(self) -> int:
+        with self._lock:
+            now = time.monotonic()
+            if self._tip is not None and now - self._tip[1] <= settings.TIP_SLOT_TTL_SECONDS:
+                metrics.incr("chain_context.last_block_slot.hit")
+                return self._tip[0] + int(now - self._tip[1])
+
+            metrics.incr("chain_context.last_block_slot.miss")
+            slot = self.api.block_latest().slot
+            self._tip = (slot, now)
+            return slot
+
+
+_context: Optional[CachedBlockFrostChainContext] = None
+_context_lock = threading.Lock()
+
+
+def get_chain_context(project_id: str, base_url: str) -> CachedBlockFrostChainContext:
+    """
+    Process-wide chain context, created on first use.
+    """
+    global _context
+    with _context_lock:
+        if _context is None:
+            _context = CachedBlockFrostChainContext(project_id=project_id, base_url=base_url)
+    return _context
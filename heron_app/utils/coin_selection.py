@@ -0,0 +1,321 @@
+import heapq
+import random
+from typing import Dict, Iterable, Iterator, ItemsView, List, Optional, Tuple, Union
+
+
+UtxoKey = Tuple[str, int]
+
+LOVELACE = "lovelace"
+
+# Up to this many UTxOs, walking a sorted list beats heap lookups per input
+LINEAR_SCAN_MAX_UTXOS = 64
+
+
+def utxo_key(utxo: dict) -> UtxoKey:
+    return (utxo["tx_hash"], utxo["tx_index"])
+
+
+class UtxoIndex:
+    """
+    Index over the cached UTxO entries of a single wallet.
+
+    Entries use the cache format ({"tx_hash", "tx_index", "amounts"}). A
+    max-heap by quantity is built per unit the first time that unit is
+    queried, so looking up or removing the largest holder of a unit is
+    O(log n) and units that are never selected on cost nothing. Removal is
+    lazy: heap entries pointing at UTxOs that are no longer indexed are
+    discarded when they reach the top, and the heaps are dropped for a rebuild
+    once stale entries dominate. For small wallets (up to
+    LINEAR_SCAN_MAX_UTXOS) `holders` sorts the entries instead of building
+    a heap.
+    """
+
+    def __init__(self, utxos: Iterable[dict] = ()):
+        self._utxos: Dict[UtxoKey, dict] = {utxo_key(utxo): utxo for utxo in utxos}
+        self._heaps: Dict[str, List[Tuple[int, str, int]]] = {}
+        self._stale = 0
+
+    def __len__(self) -> int:
+        return len(self._utxos)
+
+    def __contains__(self, utxo: Union[dict, UtxoKey]) -> bool:
+        key = utxo if isinstance(utxo, tuple) else utxo_key(utxo)
+        return key in self._utxos
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(list(self._utxos.values()))
+
+    def items(self) -> ItemsView[UtxoKey, dict]:
+        """
+        Live (key, entry) view of the indexed UTxOs; unlike iterating the
+        index it doesn't copy them, so don't add or remove while walking it.
+        """
+        return self._utxos.items()
+
+    def add(self, utxo: dict) -> None:
+        key = utxo_key(utxo)
+        if key in self._utxos:
+            return
+        self._utxos[key] = utxo
+        for unit, qty in utxo["amounts"].items():
+            if unit in self._heaps:
+                heapq.heappush(self._heaps[unit], (-int(qty), key[0], key[1]))
+
+    def remove(self, utxo: Union[dict, UtxoKey]) -> Optional[dict]:
+        key = utxo if isinstance(utxo, tuple) else utxo_key(utxo)
+        removed = self._utxos.pop(key, None)
+        if removed is not None and self._heaps:
+            self._stale += sum(1 for unit in removed["amounts"] if unit in self._heaps)
+            if self._stale > 64 and self._stale > 2 * len(self._utxos):
+                self._heaps = {}
+                self._stale = 0
+        return removed
+
+    def largest(self, unit: str = LOVELACE) -> Optional[dict]:
+        heap = self._heap(unit)
+        while heap:
+            _, tx_hash, tx_index = heap[0]
+            utxo = self._utxos.get((tx_hash, tx_index))
+            if utxo is not None:
+                return utxo
+            heapq.heappop(heap)
+            self._stale -= 1
+        return None
+
+    def pop_largest(self, unit: str = LOVELACE) -> Optional[dict]:
+        utxo = self.largest(unit)
+        if utxo is not None:
+            self.remove(utxo)
+        return utxo
+
+    def holders(self, unit: str) -> List[dict]:
+        """
+        All indexed UTxOs holding `unit`, largest first.
+        """
+        if unit not in self._heaps and self.small:
+            # One sort is cheaper than building a heap to read it in order
+            holding = [(key, utxo) for key, utxo in self._utxos.items() if unit in utxo["amounts"]]
+            holding.sort(key=lambda entry: (-int(entry[1]["amounts"][unit]), entry[0]))
+            return [utxo for _, utxo in holding]
+        return [
+            self._utxos[(tx_hash, tx_index)]
+            for _, tx_hash, tx_index in sorted(self._heap(unit))
+            if (tx_hash, tx_index) in self._utxos
+        ]
+
+    @property
+    def small(self) -> bool:
+        return len(self._utxos) <= LINEAR_SCAN_MAX_UTXOS
+
+    def _heap(self, unit: str) -> List[Tuple[int, str, int]]:
+        heap = self._heaps.get(unit)
+        if heap is None:
+            heap = [
+                (-int(utxo["amounts"][unit]), key[0], key[1])
+                for key, utxo in self._utxos.items()
+                if unit in utxo["amounts"]
+            ]
+            heapq.heapify(heap)
+            self._heaps[unit] = heap
+        return heap
+
+
+def _consume(index: UtxoIndex, utxo: dict, remaining: Dict[str, int], selected: List[dict]) -> None:
+    index.remove(utxo)
+    selected.append(utxo)
+    for unit, qty in utxo["amounts"].items():
+        if unit in remaining:
+            remaining[unit] -= int(qty)
+
+
+def _shortfall(remaining: Dict[str, int]) -> Dict[str, int]:
+    return {unit: qty for unit, qty in remaining.items() if qty > 0}
+
+
+def _ordered_units(needed: Dict[str, int]) -> List[str]:
+    """
+    Native assets first: the UTxOs carrying them also contribute lovelace,
+    which reduces how much pure ADA has to be selected afterwards.
+    """
+    return [u for u in needed if u != LOVELACE] + ([LOVELACE] if LOVELACE in needed else [])
+
+
+class CoinSelectionStrategy:
+    """
+    Base class for coin selection strategies.
+
+    `select` removes the chosen inputs from the index and returns them along
+    with whatever could not be covered ({unit: missing quantity}).
+    """
+
+    name = ""
+
+    def select(self, index: UtxoIndex, needed: Dict[str, int]) -> Tuple[List[dict], Dict[str, int]]:
+        raise NotImplementedError
+
+
+class LargestFirst(CoinSelectionStrategy):
+    name = "largest-first"
+
+    def select(self, index, needed):
+        if index.small:
+            return self._select_small(index, needed)
+        remaining = dict(needed)
+        selected: List[dict] = []
+        for unit in _ordered_units(needed):
+            while remaining[unit] > 0:
+                utxo = index.largest(unit)
+                if utxo is None:
+                    break
+                _consume(index, utxo, remaining, selected)
+        return selected, _shortfall(remaining)
+
+    def _select_small(self, index, needed):
+        # The same picks as repeated largest(), from one sorted pass per unit:
+        # for a handful of UTxOs the heap bookkeeping costs more than it saves
+        remaining = dict(needed)
+        selected: List[dict] = []
+        for unit in _ordered_units(needed):
+            if remaining[unit] <= 0:
+                continue
+            ranked = [(-int(utxo["amounts"][unit]), key) for key, utxo in index.items() if unit in utxo["amounts"]]
+            ranked.sort()
+            for _, key in ranked:
+                utxo = index.remove(key)
+                selected.append(utxo)
+                for held, qty in utxo["amounts"].items():
+                    if held in remaining:
+                        remaining[held] -= int(qty)
+                if remaining[unit] <= 0:
+                    break
+        return selected, _shortfall(remaining)
+
+
+class RandomImprove(CoinSelectionStrategy):
+    """
+    CIP-2 Random-Improve: pick random holders until a unit is covered, then
+    keep adding random holders while that moves the selected amount closer to
+    twice the target without exceeding three times the target.
+    """
+
+    name = "random-improve"
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self._rng = rng or random.Random()
+
+    def select(self, index, needed):
+        remaining = dict(needed)
+        selected: List[dict] = []
+        for unit in _ordered_units(needed):
+            target = remaining[unit]
+            if target <= 0:
+                continue
+
+            candidates = index.holders(unit)
+            self._rng.shuffle(candidates)
+            candidates = iter(candidates)
+
+            for utxo in candidates:
+                if remaining[unit] <= 0:
+                    break
+                if utxo in index:
+                    _consume(index, utxo, remaining, selected)
+
+            if remaining[unit] > 0:
+                continue
+
+            ideal, upper = 2 * target, 3 * target
+            for utxo in candidates:
+                if utxo not in index:
+                    continue
+                covered = target - remaining[unit]
+                proposed = covered + int(utxo["amounts"][unit])
+                if proposed > upper or abs(ideal - proposed) >= abs(ideal - covered):
+                    break
+                _consume(index, utxo, remaining, selected)
+
+        return selected, _shortfall(remaining)
+
+
+class BranchAndBound(CoinSelectionStrategy):
+    """
+    Covers native assets largest-first, then searches for a set of UTxOs whose
+    lovelace lands in [target, target + cost_of_change] so the transaction
+    needs little or no change. Falls back to largest-first when no such set is
+    found within `max_tries` search steps.
+    """
+
+    name = "branch-and-bound"
+
+    def __init__(self, cost_of_change: int = 1_000_000, max_tries: int = 100_000):
+        self.cost_of_change = cost_of_change
+        self.max_tries = max_tries
+
+    def select(self, index, needed):
+        assets = {unit: qty for unit, qty in needed.items() if unit != LOVELACE}
+        selected, _ = LargestFirst().select(index, assets)
+
+        remaining = dict(needed)
+        for utxo in selected:
+            for unit, qty in utxo["amounts"].items():
+                if unit in remaining:
+                    remaining[unit] -= int(qty)
+
+        target = remaining.get(LOVELACE, 0)
+        if target > 0:
+            match = self._search(index.holders(LOVELACE), target)
+            if match is not None:
+                for utxo in match:
+                    _consume(index, utxo, remaining, selected)
+            else:
+                extra, _ = LargestFirst().select(index, {LOVELACE: target})
+                for utxo in extra:
+                    selected.append(utxo)
+                    for unit, qty in utxo["amounts"].items():
+                        if unit in remaining:
+                            remaining[unit] -= int(qty)
+
+        return selected, _shortfall(remaining)
+
+    def _search(self, candidates: List[dict], target: int) -> Optional[List[dict]]:
+        values = [int(u["amounts"][LOVELACE]) for u in candidates]
+        if sum(values) < target:
+            return None
+
+        # suffix[i] = lovelace still available from candidates[i:]
+        suffix = [0] * (len(values) + 1)
+        for i in range(len(values) - 1, -1, -1):
+            suffix[i] = suffix[i + 1] + values[i]
+
+        upper = target + self.cost_of_change
+        stack = [(0, 0, [])]
+        tries = 0
+        while stack and tries < self.max_tries:
+            tries += 1
+            depth, total, chosen = stack.pop()
+            if total >= target:
+                if total <= upper:
+                    return [candidates[i] for i in chosen]
+                continue
+            if depth >= len(values) or total + suffix[depth] < target:
+                continue
+            # Exclusion pushed first so inclusion (largest values) is explored first.
+            stack.append((depth + 1, total, chosen))
+            stack.append((depth + 1, total + values[depth], chosen + [depth]))
+        return None
+
+
+STRATEGIES = {
+    LargestFirst.name: LargestFirst,
+    RandomImprove.name: RandomImprove,
+    BranchAndBound.name: BranchAndBound,
+}
+
+
+def get_strategy(name: str) -> CoinSelectionStrategy:
+    try:
+        return STRATEGIES[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown coin selection strategy '{name}'. Must be one of {sorted(STRATEGIES)}."
+        )
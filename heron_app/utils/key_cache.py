@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple, Type
+
+from pycardano.key import Key
+
+from heron_app.core.config import settings
+from heron_app.utils import metrics
+
+
+class SigningKeyCache:
+    """
+    Per-process LRU cache of derived signing keys, so the mnemonic decryption
+    and BIP32 derivation are paid once per worker rather than per transaction.
+
+    Key material is held in a bytearray and overwritten with zeros when an
+    entry expires, is evicted or the cache is cleared. Callers get a fresh key
+    object built from a copy of that buffer; they should not keep it beyond
+    the transaction being signed. Intermediate values (mnemonic, HD wallet)
+    are ordinary Python objects and cannot be wiped, so this is best effort.
+
+    While the cache holds keys, a daemon thread purges expired entries every
+    `sweep_seconds` (default: the TTL, at most a minute), so the keys of an
+    idle worker don't stay in memory until its next transaction.
+    """
+
+    def __init__(self, ttl_seconds: int = 900, max_size: int = 256, sweep_seconds: Optional[float] = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.sweep_seconds = sweep_seconds if sweep_seconds is not None else min(ttl_seconds, 60)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Type[Key], str, str, bytearray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_size > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, name: Hashable) -> Optional[Key]:
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return None
+            expires_at, key_cls, key_type, description, payload = entry
+            if time.monotonic() >= expires_at:
+                self._drop(name)
+                return None
+            self._entries.move_to_end(name)
+            return key_cls(bytes(payload), key_type=key_type, description=description)
+
+    def put(self, name: Hashable, key: Key) -> None:
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if name in self._entries:
+                self._drop(name)
+            self._purge(now)
+            self._entries[name] = (
+                now + self.ttl_seconds,
+                type(key),
+                key.key_type,
+                key.description,
+                bytearray(key.payload),
+            )
+            while len(self._entries) > self.max_size:
+                self._drop(next(iter(self._entries)))
+                metrics.incr("key_cache.evicted")
+            # Not alive in a forked child: each process sweeps its own copy
+            if self._sweeper is None or not self._sweeper.is_alive():
+                self._sweeper = threading.Thread(target=self._sweep, name="key-cache-sweeper", daemon=True)
+                self._sweeper.start()
+
+    def get_or_load(self, name: Hashable, loader: Callable[[], Key]) -> Key:
+        key = self.get(name)
+        if key is not None:
+            metrics.incr("key_cache.hit")
+            return key
+        metrics.incr("key_cache.miss")
+        key = loader()
+        self.put(name, key)
+        return key
+
+    def invalidate(self, name: Hashable) -> None:
+        with self._lock:
+            self._drop(name)
+
+    def clear(self) -> None:
+        with self._lock:
+            for name in list(self._entries):
+                self._drop(name)
+
+    def purge_expired(self) -> None:
+        with self._lock:
+            self._purge(time.monotonic())
+
+    def _purge(self, now: float) -> None:
+        for name in [n for n, entry in self._entries.items() if now >= entry[0]]:
+            self._drop(name)
+
+    def _sweep(self) -> None:
+        while True:
+            time.sleep(self.sweep_seconds)
+            with self._lock:
+                self._purge(time.monotonic())
+                if not self._entries:
+                    # Started again by the next put
+                    self._sweeper = None
+                    return
+
+    def _drop(self, name: Hashable) -> None:
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            payload = entry[-1]
+            payload[:] = bytes(len(payload))
+
+
+_cache: Optional[SigningKeyCache] = None
+
+
+def get_key_cache() -> SigningKeyCache:
+    """
+    Process-wide signing key cache configured from KEY_CACHE_TTL_SECONDS and
+    KEY_CACHE_MAX_SIZE.
+    """
+    global _cache
+    if _cache is None:
+        _cache = SigningKeyCache(ttl_seconds=settings.KEY_CACHE_TTL_SECONDS, max_size=settings.KEY_CACHE_MAX_SIZE)
+    return _cache
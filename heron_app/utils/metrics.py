@@ -0,0 +1,22 @@
+import threading
+from collections import Counter
+from typing import Dict
+
+_counters: Counter = Counter()
+_lock = threading.Lock()
+
+
+def incr(name: str, amount: int = 1) -> None:
+    """
+    Increment a process-local counter, e.g. incr("chain_context.protocol_param.hit").
+    """
+    with _lock:
+        _counters[name] += amount
+
+
+def snapshot(prefix: str = "") -> Dict[str, int]:
+    """
+    Current values of all counters whose name starts with `prefix`.
+    """
+    with _lock:
+        return {name: value for name, value in sorted(_counters.items()) if name.startswith(prefix)}
@@ -0,0 +1,181 @@
+import asyncio
+import functools
+import logging
+import time
+from typing import Optional
+
+import redis
+from blockfrost import ApiError
+from starlette.concurrency import run_in_threadpool  # type: ignore
+
+from heron_app.core.config import settings
+from heron_app.utils import metrics
+from heron_app.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_PREFIX = "heron:blockfrost"
+BUCKET_KEY = f"{REDIS_PREFIX}:bucket"
+COOLDOWN_KEY = f"{REDIS_PREFIX}:cooldown"
+STRIKES_KEY = f"{REDIS_PREFIX}:429s"
+
+# Takes a token from the bucket (KEYS[1]: tokens and last refill in ms),
+# refilled at ARGV[1] tokens/s up to ARGV[2]. Returns 0 when a token was
+# taken, otherwise the milliseconds to wait before trying again: until the
+# next token, or until a 429 cooldown (KEYS[2]) ends. Uses the Redis clock
+# so hosts with skewed clocks share one bucket.
+_ACQUIRE = """
+local cooldown = redis.call('PTTL', KEYS[2])
+if cooldown > 0 then
+    return cooldown
+end
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate / 1000)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst * 1000 / rate) + 1000)
+return wait
+"""
+
+
+class BlockfrostRateLimiter:
+    """
+    Token bucket shared through Redis by every process calling Blockfrost,
+    sized to the plan with BLOCKFROST_RATE_PER_SECOND and BLOCKFROST_BURST.
+
+    A 429 from Blockfrost (see `throttled`) pauses all callers for a
+    cooldown that doubles with every 429 seen within a minute. Time spent
+    waiting is counted under the "blockfrost." metrics prefix. Redis
+    failures let calls through unthrottled rather than failing them.
+    """
+
+    def __init__(self):
+        self._script = None
+
+    def _wait_ms(self) -> int:
+        if not settings.BLOCKFROST_RATE_LIMIT_ENABLED:
+            return 0
+        try:
+            if self._script is None:
+                self._script = get_redis().register_script(_ACQUIRE)
+            return int(self._script(
+                keys=[BUCKET_KEY, COOLDOWN_KEY],
+                args=[settings.BLOCKFROST_RATE_PER_SECOND, settings.BLOCKFROST_BURST],
+            ))
+        except redis.RedisError as e:
+            logger.warning(f"Blockfrost rate limiter unavailable, not throttling: {e}")
+            return 0
+
+    def _record(self, waited_ms: int) -> None:
+        metrics.incr("blockfrost.calls")
+        if waited_ms:
+            metrics.incr("blockfrost.waits")
+            metrics.incr("blockfrost.wait_ms", waited_ms)
+
+    def acquire(self) -> None:
+        """
+        Block until this process may make one Blockfrost call.
+        """
+        waited = 0
+        while True:
+            wait = self._wait_ms()
+            if not wait:
+                break
+            time.sleep(wait / 1000)
+            waited += wait
+        self._record(waited)
+
+    async def acquire_async(self) -> None:
+        """
+        acquire for the event loop; Redis is called from the threadpool.
+        """
+        waited = 0
+        while True:
+            wait = await run_in_threadpool(self._wait_ms)
+            if not wait:
+                break
+            await asyncio.sleep(wait / 1000)
+            waited += wait
+        self._record(waited)
+
+    async def throttled_async(self) -> None:
+        await run_in_threadpool(self.throttled)
+
+    def throttled(self) -> None:
+        """
+        Blockfrost answered 429: back off every caller for
+        BLOCKFROST_429_COOLDOWN_MS, doubled for each 429 within the last
+        minute, up to BLOCKFROST_429_MAX_COOLDOWN_MS.
+        """
+        metrics.incr("blockfrost.throttled")
+        try:
+            client = get_redis()
+            pipe = client.pipeline()
+            pipe.incr(STRIKES_KEY)
+            pipe.expire(STRIKES_KEY, 60)
+            strikes = pipe.execute()[0]
+            cooldown = min(
+                settings.BLOCKFROST_429_COOLDOWN_MS * 2 ** (strikes - 1),
+                settings.BLOCKFROST_429_MAX_COOLDOWN_MS,
+            )
+            client.set(COOLDOWN_KEY, 1, px=cooldown)
+            logger.warning(f"Blockfrost rate limit hit ({strikes} in the last minute), pausing calls for {cooldown} ms")
+        except redis.RedisError as e:
+            logger.warning(f"Could not record Blockfrost throttling: {e}")
+
+
+_limiter: Optional[BlockfrostRateLimiter] = None
+
+
+def get_blockfrost_limiter() -> BlockfrostRateLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = BlockfrostRateLimiter()
+    return _limiter
+
+
+def limited_call(fn, *args, **kwargs):
+    """
+    Call `fn` (a Blockfrost client method) once the limiter allows it,
+    retrying up to BLOCKFROST_429_RETRIES times after a 429.
+    """
+    limiter = get_blockfrost_limiter()
+    for attempt in range(settings.BLOCKFROST_429_RETRIES + 1):
+        limiter.acquire()
+        try:
+            return fn(*args, **kwargs)
+        except ApiError as e:
+            if e.status_code != 429 or attempt == settings.BLOCKFROST_429_RETRIES:
+                raise
+            limiter.throttled()
+
+
+class RateLimitedBlockFrostApi:
+    """
+    A blockfrost.BlockFrostApi whose method calls go through limited_call.
+    """
+
+    def __init__(self, api):
+        self._api = api
+
+    def __getattr__(self, name):
+        attr = getattr(self._api, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def limited(*args, **kwargs):
+            return limited_call(attr, *args, **kwargs)
+
+        return limited
@@ -0,0 +1,16 @@
+import redis
+
+from heron_app.core.config import settings
+
+_client = None
+
+
+def get_redis() -> redis.Redis:
+    """
+    Process-wide Redis client. Connections are only opened on first use, so
+    importing modules that depend on Redis stays side-effect free.
+    """
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _client
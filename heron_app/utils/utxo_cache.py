@@ -0,0 +1,169 @@
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import redis
+
+from heron_app.core.config import settings
+from heron_app.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class UtxoCache:
+    """
+    Cache of wallet UTxO entries, keyed by address.
+
+    Entries use the format produced by `reload_utxos`:
+    {"tx_hash": str, "tx_index": int, "amounts": {unit: int}}.
+
+    Every write and invalidation bumps a per-address version, and `set`
+    returns the new one (0 if the write failed). A worker keeping its own
+    view of a wallet compares it with `version` to tell whether another
+    process has replaced or invalidated the entry since.
+    """
+
+    def get(self, address: str) -> List[dict]:
+        raise NotImplementedError
+
+    def version(self, address: str) -> Optional[int]:
+        """
+        Version of the cached entry, or None if there is none (never written,
+        invalidated or expired).
+        """
+        raise NotImplementedError
+
+    def set(self, address: str, utxos: List[dict]) -> int:
+        raise NotImplementedError
+
+    def invalidate(self, address: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryUtxoCache(UtxoCache):
+    """
+    Per-process cache. Only useful for single-process setups and development.
+    """
+
+    def __init__(self, ttl_seconds: int = 0):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[int, float, List[dict]]] = {}
+
+    def get(self, address):
+        version, stored_at, utxos = self._entries.get(address, (0, 0.0, []))
+        if self.ttl_seconds and utxos and time.monotonic() - stored_at > self.ttl_seconds:
+            return []
+        return list(utxos)
+
+    def version(self, address):
+        version, stored_at, utxos = self._entries.get(address, (0, 0.0, []))
+        if not utxos or (self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds):
+            return None
+        return version
+
+    def set(self, address, utxos):
+        version = self._entries.get(address, (0, 0.0, []))[0]
+        self._entries[address] = (version + 1, time.monotonic(), list(utxos))
+        return version + 1
+
+    def invalidate(self, address):
+        version = self._entries.get(address, (0, 0.0, []))[0]
+        self._entries[address] = (version + 1, 0.0, [])
+
+
+class RedisUtxoCache(UtxoCache):
+    """
+    Cache shared by the worker processes: one Redis hash per address (field
+    "<tx_hash>#<tx_index>", value the JSON-encoded amounts) plus a version
+    counter. Writes replace the whole hash inside a MULTI block so readers
+    never see a half-written set.
+
+    Redis failures degrade to a cold cache rather than failing the caller.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None, ttl_seconds: int = 3600, prefix: str = "heron:utxos"):
+        self._client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    @property
+    def client(self) -> redis.Redis:
+        return self._client or get_redis()
+
+    def _keys(self, address: str) -> Tuple[str, str]:
+        return f"{self.prefix}:{address}", f"{self.prefix}:{address}:version"
+
+    def get(self, address):
+        entries_key, _ = self._keys(address)
+        try:
+            raw = self.client.hgetall(entries_key)
+        except redis.RedisError as e:
+            logger.warning(f"UTxO cache read failed for {address}: {e}")
+            return []
+
+        utxos = []
+        for field, amounts in raw.items():
+            tx_hash, tx_index = field.rsplit("#", 1)
+            utxos.append({"tx_hash": tx_hash, "tx_index": int(tx_index), "amounts": json.loads(amounts)})
+        return utxos
+
+    def version(self, address):
+        entries_key, version_key = self._keys(address)
+        try:
+            pipe = self.client.pipeline(transaction=True)
+            pipe.exists(entries_key)
+            pipe.get(version_key)
+            exists, version = pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"UTxO cache read failed for {address}: {e}")
+            return None
+        return int(version or 0) if exists else None
+
+    def set(self, address, utxos):
+        entries_key, version_key = self._keys(address)
+        mapping = {
+            f"{u['tx_hash']}#{u['tx_index']}": json.dumps(u["amounts"]) for u in utxos
+        }
+        try:
+            pipe = self.client.pipeline(transaction=True)
+            pipe.delete(entries_key)
+            if mapping:
+                pipe.hset(entries_key, mapping=mapping)
+                if self.ttl_seconds:
+                    pipe.expire(entries_key, self.ttl_seconds)
+            pipe.incr(version_key)
+            return pipe.execute()[-1]
+        except redis.RedisError as e:
+            logger.warning(f"UTxO cache write failed for {address}: {e}")
+            return 0
+
+    def invalidate(self, address):
+        entries_key, version_key = self._keys(address)
+        try:
+            pipe = self.client.pipeline(transaction=True)
+            pipe.delete(entries_key)
+            pipe.incr(version_key)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"UTxO cache invalidation failed for {address}: {e}")
+
+
+_cache: Optional[UtxoCache] = None
+
+
+def get_utxo_cache() -> UtxoCache:
+    """
+    Process-wide cache instance for the backend selected by UTXO_CACHE_BACKEND.
+    """
+    global _cache
+    if _cache is None:
+        if settings.UTXO_CACHE_BACKEND == "redis":
+            _cache = RedisUtxoCache(ttl_seconds=settings.UTXO_CACHE_TTL_SECONDS)
+        elif settings.UTXO_CACHE_BACKEND == "memory":
+            _cache = MemoryUtxoCache(ttl_seconds=settings.UTXO_CACHE_TTL_SECONDS)
+        else:
+            raise ValueError(
+                f"Invalid UTXO_CACHE_BACKEND: {settings.UTXO_CACHE_BACKEND}. Must be 'redis' or 'memory'."
+            )
+    return _cache
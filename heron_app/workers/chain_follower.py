@@ -0,0 +1,289 @@
+import json
+import logging
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import redis
+from sqlalchemy import delete, insert, select, update
+
+from heron_app.core.config import settings
+from heron_app.db.database import SessionLocal
+from heron_app.db.models.chain_block import ChainBlock
+from heron_app.db.models.transaction import Transaction
+from heron_app.utils import balance_cache, metrics
+from heron_app.utils.redis_client import get_redis
+from heron_app.workers.pending_hashes import PendingTxHashes
+from heron_app.workers.utxo_ledger import UtxoLedger
+
+logger = logging.getLogger(__name__)
+
+# Latest block seen by the follower ({"slot", "height", "hash"}), read by the API
+TIP_KEY = "heron:chain:tip"
+
+# Statuses of rows included in a block: "on_chain" until the block is
+# TX_CONFIRMATION_DEPTH deep, then "confirmed". A rollback past the block
+# puts them back to "submitted".
+INCLUDED_STATUSES = ("on_chain", "confirmed")
+
+
+def get_tip() -> Optional[dict]:
+    try:
+        raw = get_redis().get(TIP_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"Chain tip lookup failed: {e}")
+        return None
+    return json.loads(raw) if raw else None
+
+
+def confirmations(tx, tip: Optional[dict]) -> Optional[int]:
+    """
+    Number of blocks on top of (and including) the one `tx` was seen in, or
+    None if it hasn't been seen on chain or the tip is unknown.
+    """
+    if tx.block_height is None or not tip:
+        return None
+    return max(tip["height"] - tx.block_height + 1, 0)
+
+
+def _block(record: dict) -> Optional[dict]:
+    if record.get("slot") is None or record.get("hash") is None or record.get("number") is None:
+        return None
+    return {"slot": record["slot"], "height": record["number"], "hash": record["hash"]}
+
+
+def parse_events(messages) -> Iterator[Tuple[str, object]]:
+    """
+    Chain events in a batch of oura stream entries, in order:
+    ("transaction", (tx_hash, block, record)), ("block", block) or
+    ("roll_back", slot). Blocks are {"slot", "height", "hash"}; records are
+    oura's transaction records (inputs and outputs included).
+    """
+    for msg_id, msg_data in messages:
+        raw_event = next(iter(msg_data.values()), None)
+        if not raw_event:
+            continue
+        try:
+            event = json.loads(raw_event)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Failed to parse event JSON: {e}")
+            continue
+
+        context = event.get("context") or {}
+        if "block" in event:
+            block = _block(event["block"] or {})
+            if block:
+                yield "block", block
+        elif "transaction" in event:
+            record = event["transaction"] or {}
+            tx_hash = record.get("hash") or context.get("tx_hash")
+            block = _block({
+                "slot": context.get("slot"),
+                "number": context.get("block_number"),
+                "hash": context.get("block_hash"),
+            })
+            if tx_hash and block:
+                yield "transaction", (tx_hash, block, record)
+        elif "roll_back" in event:
+            slot = (event["roll_back"] or {}).get("block_slot")
+            if slot is not None:
+                yield "roll_back", slot
+        elif "block_end" not in event:
+            logger.warning("Unknown event format.")
+
+
+def record_inclusions(session, seen: Dict[str, dict]) -> int:
+    """
+    Move the 'submitted' rows of the given tx hashes to 'on_chain' with the
+    block each was seen in (one UPDATE per block). Returns the row count;
+    the caller commits.
+    """
+    by_block = defaultdict(list)
+    for tx_hash, block in seen.items():
+        by_block[(block["slot"], block["height"], block["hash"])].append(tx_hash)
+
+    updated = 0
+    for (slot, height, block_hash), tx_hashes in by_block.items():
+        result = session.execute(
+            update(Transaction)
+            .where(Transaction.tx_hash.in_(tx_hashes), Transaction.status == "submitted")
+            .values(status="on_chain", block_slot=slot, block_height=height, block_hash=block_hash)
+            .execution_options(synchronize_session=False)
+        )
+        updated += result.rowcount
+    return updated
+
+
+def promote_confirmed(session, tip_height: int) -> int:
+    """
+    Confirm the 'on_chain' rows whose block is now TX_CONFIRMATION_DEPTH
+    deep. Returns the row count; the caller commits.
+    """
+    result = session.execute(
+        update(Transaction)
+        .where(
+            Transaction.status == "on_chain",
+            Transaction.block_height <= tip_height - settings.TX_CONFIRMATION_DEPTH + 1,
+        )
+        .values(status="confirmed", confirmed_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def revert_after(session, slot: int) -> List[str]:
+    """
+    Put rows seen in blocks after `slot` back to 'submitted'. Returns their
+    tx hashes; the caller commits.
+    """
+    result = session.execute(
+        update(Transaction)
+        .where(Transaction.block_slot > slot, Transaction.status.in_(INCLUDED_STATUSES))
+        .values(status="submitted", block_slot=None, block_height=None, block_hash=None, confirmed_at=None)
+        .returning(Transaction.tx_hash)
+        .execution_options(synchronize_session=False)
+    )
+    return list(set(result.scalars()))
+
+
+class ChainFollower:
+    """
+    Follows the chain through oura's Transaction, Block and RollBack events
+    without asking Blockfrost about individual transactions.
+
+    Our transactions are recorded with the block they were seen in, the tip
+    advances with every Block event and rows are confirmed once their block
+    is TX_CONFIRMATION_DEPTH deep. On a rollback the blocks after the
+    rollback point are dropped and the rows seen in them go back to
+    'submitted' (and back into the pending set) until they are seen again.
+
+    Applied blocks are stored in chain_blocks in the same transaction as the
+    status changes and the UtxoLedger updates, so the history oura restarts
+    from (see oura/prepare_oura.py) never runs ahead of what was applied.
+    """
+
+    def __init__(self, pending: PendingTxHashes, ledger: Optional[UtxoLedger] = None):
+        self.pending = pending
+        self.ledger = ledger or UtxoLedger()
+        # Recent blocks, oldest first; mirrors chain_blocks once loaded
+        self.blocks = deque(maxlen=settings.CHAIN_FOLLOWER_MAX_ROLLBACK)
+        self._loaded = False
+        # Addresses whose ledger UTxOs changed in the current batch
+        self._touched = set()
+
+    @property
+    def tip(self) -> Optional[dict]:
+        return self.blocks[-1] if self.blocks else None
+
+    def _load(self, session) -> None:
+        rows = session.scalars(
+            select(ChainBlock).order_by(ChainBlock.slot.desc()).limit(self.blocks.maxlen)
+        ).all()
+        self.blocks.clear()
+        self.blocks.extend({"slot": b.slot, "height": b.height, "hash": b.hash} for b in reversed(rows))
+        self._loaded = True
+
+    def _applied(self, block: dict) -> bool:
+        # Older than anything we remember: can't tell, treat as a replay
+        if self.blocks and block["slot"] < self.blocks[0]["slot"]:
+            return True
+        for known in reversed(self.blocks):
+            if known["slot"] <= block["slot"]:
+                return known["slot"] == block["slot"] and known["hash"] == block["hash"]
+        return False
+
+    def _push(self, session, block: dict) -> None:
+        self.blocks.append(block)
+        session.execute(insert(ChainBlock).values(slot=block["slot"], hash=block["hash"], height=block["height"]))
+
+    def _roll_back(self, session, slot: int) -> List[str]:
+        while self.blocks and self.blocks[-1]["slot"] > slot:
+            self.blocks.pop()
+        self.pending.forget_after(slot)
+        session.execute(delete(ChainBlock).where(ChainBlock.slot > slot))
+        self._touched.update(self.ledger.roll_back(session, slot))
+        reverted = revert_after(session, slot)
+        metrics.incr("chain.rollbacks")
+        logger.warning(f"Rolled back to slot {slot}; {len(reverted)} tx hash(es) reverted")
+        return reverted
+
+    def _prune(self, session) -> None:
+        if len(self.blocks) == self.blocks.maxlen:
+            session.execute(delete(ChainBlock).where(ChainBlock.slot < self.blocks[0]["slot"]))
+            self.ledger.prune(session, self.blocks[0]["slot"])
+
+    def _publish_tip(self) -> None:
+        try:
+            if self.tip:
+                get_redis().set(TIP_KEY, json.dumps(self.tip))
+            else:
+                # Rolled back past the blocks we remember; unknown until the next block
+                get_redis().delete(TIP_KEY)
+        except redis.RedisError as e:
+            logger.warning(f"Could not publish chain tip: {e}")
+
+    def handle(self, messages) -> None:
+        """
+        Apply one batch of stream entries. Raises on database errors, in
+        which case the batch is meant to be re-read.
+        """
+        session = SessionLocal()
+        included, reverted = [], []
+        self._touched = set()
+        try:
+            if not self._loaded:
+                self._load(session)
+            tip = self.tip
+            transactions = []
+            for kind, payload in parse_events(messages):
+                if kind == "transaction":
+                    transactions.append(payload)
+                elif kind == "block":
+                    # Replayed after a restart or a failed batch
+                    if self._applied(payload):
+                        continue
+                    if self.tip and payload["slot"] <= self.tip["slot"]:
+                        # oura intersected behind our tip without a RollBack
+                        included.extend(self._apply(session, transactions))
+                        transactions = []
+                        reverted.extend(self._roll_back(session, payload["slot"] - 1))
+                    self._push(session, payload)
+                elif kind == "roll_back":
+                    # Everything read before the rollback happened first
+                    included.extend(self._apply(session, transactions))
+                    transactions = []
+                    reverted.extend(self._roll_back(session, payload))
+            included.extend(self._apply(session, transactions))
+
+            self._prune(session)
+            confirmed = promote_confirmed(session, self.tip["height"]) if self.tip else 0
+            session.commit()
+        except Exception:
+            session.rollback()
+            # Memory may be ahead of the database now; start again from it
+            self._loaded = False
+            raise
+        finally:
+            session.close()
+
+        self.pending.discard([h for h in included if h not in reverted])
+        for tx_hash in reverted:
+            self.pending.add(tx_hash)
+        if self.tip != tip:
+            self._publish_tip()
+        # Cached balances of these addresses are revalidated on the next read
+        balance_cache.mark_stale(self._touched)
+        if confirmed:
+            metrics.incr("chain.confirmed", confirmed)
+            logger.info(f"✅ Updated {confirmed} transaction(s) to 'confirmed' at height {self.tip['height']}")
+        self.ledger.sync(self.tip)
+
+    def _apply(self, session, transactions) -> List[str]:
+        self._touched.update(self.ledger.apply(session, transactions))
+        matches = self.pending.match(session, {tx_hash: block for tx_hash, block, _ in transactions})
+        if not matches:
+            return []
+        updated = record_inclusions(session, matches)
+        logger.info(f"Seen {len(matches)} of our tx hash(es) on chain ({updated} transaction(s))")
+        return list(matches)
+
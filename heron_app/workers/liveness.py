@@ -0,0 +1,103 @@
+import logging
+import os
+import threading
+from typing import Iterable, Set
+
+import redis
+from celery.signals import worker_ready, worker_shutdown
+
+from heron_app.core.config import settings
+from heron_app.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_PREFIX = "heron:worker"
+
+# Set by start_wallet_worker when it launches a wallet/partition consumer.
+QUEUE_ENV = "HERON_WORKER_QUEUE"
+
+_stop = threading.Event()
+
+
+def _key(queue_name: str) -> str:
+    return f"{REDIS_PREFIX}:{queue_name}"
+
+
+def is_queue_alive(queue_name: str) -> bool:
+    """
+    True if a consumer for `queue_name` sent a heartbeat within
+    WORKER_HEARTBEAT_TTL_SECONDS, or was launched and is still starting.
+    """
+    try:
+        return bool(get_redis().exists(_key(queue_name)))
+    except redis.RedisError as e:
+        logger.warning(f"Worker liveness lookup failed for {queue_name}: {e}")
+        return False
+
+
+def alive_queues(queue_names: Iterable[str]) -> Set[str]:
+    """
+    Subset of `queue_names` with a live consumer, in one round trip.
+    """
+    queue_names = list(queue_names)
+    if not queue_names:
+        return set()
+    try:
+        values = get_redis().mget([_key(q) for q in queue_names])
+    except redis.RedisError as e:
+        logger.warning(f"Worker liveness lookup failed: {e}")
+        return set()
+    return {q for q, value in zip(queue_names, values) if value is not None}
+
+
+def claim_launch(queue_name: str, nodename: str) -> bool:
+    """
+    Reserve the right to launch a consumer for `queue_name`. The reservation
+    lasts WORKER_STARTUP_GRACE_SECONDS, after which the worker's own
+    heartbeat has to keep the key alive. Returns False if a consumer is
+    already live or being launched by another process.
+    """
+    try:
+        return bool(get_redis().set(
+            _key(queue_name), f"starting:{nodename}", nx=True, ex=settings.WORKER_STARTUP_GRACE_SECONDS
+        ))
+    except redis.RedisError as e:
+        # Without Redis nothing can be dispatched anyway; launch rather than
+        # leave the queue without a consumer.
+        logger.warning(f"Worker launch claim failed for {queue_name}: {e}")
+        return True
+
+
+def _heartbeat(queue_name: str, nodename: str) -> None:
+    while True:
+        try:
+            get_redis().set(_key(queue_name), nodename, ex=settings.WORKER_HEARTBEAT_TTL_SECONDS)
+        except redis.RedisError as e:
+            logger.warning(f"Worker heartbeat failed for {queue_name}: {e}")
+        if _stop.wait(settings.WORKER_HEARTBEAT_INTERVAL_SECONDS):
+            return
+
+
+@worker_ready.connect
+def _start_heartbeat(sender, **kwargs):
+    queue_name = os.getenv(QUEUE_ENV)
+    if not queue_name:
+        return
+    _stop.clear()
+    thread = threading.Thread(target=_heartbeat, args=(queue_name, sender.hostname), daemon=True)
+    thread.start()
+
+
+@worker_shutdown.connect
+def _stop_heartbeat(sender=None, **kwargs):
+    queue_name = os.getenv(QUEUE_ENV)
+    if not queue_name:
+        return
+    _stop.set()
+    nodename = getattr(sender, "hostname", None)
+    try:
+        # Leave the key alone if another consumer of the queue owns it now.
+        if get_redis().get(_key(queue_name)) == nodename:
+            get_redis().delete(_key(queue_name))
+    except redis.RedisError:
+        pass
@@ -1,12 +1,15 @@
 import json
+import socket
+import time
 import redis
 import logging
 import threading
 from celery import Celery
 from celery.signals import worker_ready
+from heron_app.core.config import settings
 from heron_app.db.database import SessionLocal
-from heron_app.db.models.transaction import Transaction
-from datetime import datetime
+from heron_app.workers.chain_follower import ChainFollower, parse_events, record_inclusions
+from heron_app.workers.pending_hashes import PendingTxHashes, follow_announcements
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -21,71 +24,154 @@ logger.propagate = False
 # Redis client
 redis_client = redis.Redis(host="redis", port=6379, decode_responses=True)
 stream_name = "oura.events"
+group_name = settings.OURA_CONSUMER_GROUP
+consumer_name = settings.OURA_CONSUMER_NAME or socket.gethostname()
 
 # Celery app
 celery = Celery("oura_listener", broker="redis://redis:6379/0")
 
 
+# Kept for events queued by listeners that dispatched one task per transaction
 @celery.task
 def handle_oura_event(event):
     logger.debug(f"Processing Oura Event: {json.dumps(event)[:100]}")
-    tx_hash = event.get("transaction", {}).get("hash")
-    if not tx_hash:
+    seen = {payload[0]: payload[1] for kind, payload in parse_events([(None, {"event": json.dumps(event)})])
+            if kind == "transaction"}
+    if not seen:
         return
 
-    logger.debug(f"✅ Found transaction hash: {tx_hash}")
-
     session = SessionLocal()
     try:
-        tx = session.query(Transaction).filter_by(tx_hash=tx_hash).first()
-        if tx and tx.status == "submitted":
-            tx.status = "confirmed"
-            tx.confirmed_at = datetime.utcnow()
-            session.commit()
-            logger.info(f"✅ Updated transaction {tx_hash} to 'confirmed'")
-        else:
-            logger.debug(f"Transaction {tx_hash} not tracked or already confirmed.")
+        updated = record_inclusions(session, seen)
+        session.commit()
+        logger.info(f"✅ Recorded {updated} transaction(s) {list(seen)} as 'on_chain'")
     except Exception as e:
-        logger.error(f"❌ DB error confirming tx {tx_hash}: {e}")
+        logger.error(f"❌ DB error recording txs {list(seen)}: {e}")
         session.rollback()
     finally:
         session.close()
 
 
+def _stream_id(entry_id: str):
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def _ensure_group() -> None:
+    try:
+        # Start from the beginning so the first boot picks up entries oura
+        # wrote before the group existed; afterwards Redis keeps the position.
+        redis_client.xgroup_create(stream_name, group_name, id="0", mkstream=True)
+    except redis.ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+def _claim_stale() -> None:
+    """
+    Take over the entries earlier leaders read but never acknowledged, so
+    they are applied before anything newer.
+    """
+    start = "-"
+    while True:
+        entries = redis_client.xpending_range(
+            stream_name, group_name, min=start, max="+", count=settings.OURA_READ_BATCH_SIZE
+        )
+        stale = [entry["message_id"] for entry in entries if entry["consumer"] != consumer_name]
+        if stale:
+            redis_client.xclaim(stream_name, group_name, consumer_name, min_idle_time=0, message_ids=stale, justid=True)
+            logger.info(f"Claimed {len(stale)} unacknowledged stream entries")
+        if len(entries) < settings.OURA_READ_BATCH_SIZE:
+            return
+        start = f"({entries[-1]['message_id']}"
+
+
+def _trim() -> None:
+    """
+    Drop entries every consumer group has acknowledged: everything before
+    the oldest unacknowledged (or not yet delivered) entry of any group,
+    plus an optional OURA_STREAM_MAXLEN cap.
+    """
+    floor = None
+    for group in redis_client.xinfo_groups(stream_name):
+        candidates = [group["last-delivered-id"]]
+        if group["pending"]:
+            candidates.append(redis_client.xpending(stream_name, group["name"])["min"])
+        oldest = min(candidates, key=_stream_id)
+        if floor is None or _stream_id(oldest) < _stream_id(floor):
+            floor = oldest
+    if floor is not None:
+        redis_client.xtrim(stream_name, minid=floor, approximate=True)
+    if settings.OURA_STREAM_MAXLEN:
+        redis_client.xtrim(stream_name, maxlen=settings.OURA_STREAM_MAXLEN, approximate=True)
+
+
 def stream_listener():
-    logger.info("Started Redis stream listener thread.")
-    last_id = "0"  # Start from new messages only
+    """
+    Consume oura.events as `consumer_name` in the `group_name` consumer
+    group. Entries are acknowledged once they are applied, so a restart
+    resumes from the group's position and re-reads only unacknowledged
+    entries.
+
+    Block and rollback events have to be applied in stream order, so one
+    consumer of the group reads at a time, holding a lease renewed with
+    every batch. Other listeners (distinct OURA_CONSUMER_NAMEs) stand by and
+    take over when the lease lapses for OURA_LEASE_SECONDS.
+    """
+    logger.info(f"Started Redis stream listener thread as {group_name}/{consumer_name}.")
+    pending = PendingTxHashes()
+    follower = ChainFollower(pending)
+    threading.Thread(target=follow_announcements, args=(pending,), daemon=True).start()
+    lease = redis_client.lock(
+        f"heron:oura:leader:{group_name}", timeout=settings.OURA_LEASE_SECONDS, blocking=False
+    )
+    leading = False
+    # Read our own unacknowledged entries ("0") before new ones (">")
+    backlog = True
     while True:
         try:
-            results = redis_client.xread({stream_name: last_id}, block=5000, count=10)
-
-            logger.debug(f"Received {len(results)} messages from Redis stream.")
-            for stream, messages in results:
-                logger.debug(f"Reading {len(messages)} messages from stream: {stream}")
-                for msg_id, msg_data in messages:
-                    logger.debug(f"Raw message data: {msg_data}")
-                    last_id = msg_id
-                    raw_event = list(msg_data.values())[0]
-                    if raw_event:
-                        try:
-                            event = json.loads(raw_event)
-
-                            if "block" in event:
-                                logger.debug("Skipping block event.")
-                                continue
-                            elif "transaction" in event:
-                                logger.debug("Transaction event received.")
-                                handle_oura_event.delay(event)
-                            else:
-                                logger.warning("Unknown event format.")
-                        except json.JSONDecodeError as e:
-                            logger.warning(f"Failed to parse event JSON: {e}")
+            if not leading:
+                if not lease.acquire():
+                    time.sleep(settings.OURA_LEASE_SECONDS / 4)
+                    continue
+                logger.info(f"{consumer_name} is now reading {stream_name}")
+                leading = True
+                _ensure_group()
+                _claim_stale()
+                backlog = True
+            else:
+                lease.reacquire()
+
+            results = redis_client.xreadgroup(
+                group_name, consumer_name, {stream_name: "0" if backlog else ">"},
+                count=settings.OURA_READ_BATCH_SIZE, block=None if backlog else 5000,
+            )
+            messages = results[0][1] if results else []
+            if not messages:
+                backlog = False
+                continue
+
+            logger.debug(f"Reading {len(messages)} messages from stream: {stream_name}")
+            follower.handle(messages)
+            redis_client.xack(stream_name, group_name, *[msg_id for msg_id, _ in messages])
+            _trim()
+        except redis.exceptions.LockError as e:
+            logger.warning(f"Lost the {stream_name} lease: {e}")
+            leading = False
         except Exception as e:
             logger.error(f"Error polling Redis stream: {e}")
+            # Re-read unacknowledged entries, recreating the group if the
+            # stream was deleted meanwhile
+            leading = False
+            try:
+                lease.release()
+            except redis.exceptions.LockError:
+                pass
+            time.sleep(1)
 
 
 @worker_ready.connect
 def start_listener_thread(sender, **kwargs):
     logger.info("Worker is ready. Launching Redis listener thread.")
     t = threading.Thread(target=stream_listener, daemon=True)
-    t.start()
\ No newline at end of file
+    t.start()
@@ -0,0 +1,124 @@
+import logging
+import threading
+import time
+from typing import Dict, Iterable, Set
+
+import redis
+from sqlalchemy import select
+
+from heron_app.core.config import settings
+from heron_app.db.models.transaction import Transaction
+from heron_app.utils import metrics
+from heron_app.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Wallet workers publish the hash of every transaction they submit here.
+CHANNEL = "heron:tx-submitted"
+
+
+def announce_submitted(tx_hash: str) -> None:
+    """
+    Tell the oura listener about a hash we just submitted, so it is matched
+    before the listener's next reload from the database.
+    """
+    try:
+        get_redis().publish(CHANNEL, tx_hash)
+    except redis.RedisError as e:
+        # The next reload picks the hash up from the transactions table.
+        logger.warning(f"Could not announce submitted tx {tx_hash}: {e}")
+
+
+class PendingTxHashes:
+    """
+    Hashes of our transactions in 'submitted', kept in memory so the oura
+    listener can drop the chain transactions that aren't ours without
+    touching the database or the broker.
+
+    The set is reloaded from the transactions table at most every
+    OURA_PENDING_REFRESH_SECONDS and extended in between by the hashes the
+    wallet workers announce on CHANNEL. Hashes seen on chain during the last
+    two reload windows are matched too, so a transaction whose announcement
+    was lost is still confirmed on the next reload.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hashes: Set[str] = set()
+        # Announced since the current reload started; survives the swap.
+        self._announced: Set[str] = set()
+        self._loaded_at = None
+        # tx hash -> block it was seen in, for the current and previous window
+        self._recent: Dict[str, dict] = {}
+        self._previous: Dict[str, dict] = {}
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def add(self, tx_hash: str) -> None:
+        with self._lock:
+            self._hashes.add(tx_hash)
+            self._announced.add(tx_hash)
+
+    def discard(self, tx_hashes: Iterable[str]) -> None:
+        with self._lock:
+            self._hashes.difference_update(tx_hashes)
+            self._announced.difference_update(tx_hashes)
+
+    def _reload_if_stale(self, session) -> None:
+        now = time.monotonic()
+        if self._loaded_at is not None and now - self._loaded_at < settings.OURA_PENDING_REFRESH_SECONDS:
+            return
+        with self._lock:
+            self._announced.clear()
+        loaded = set(session.scalars(
+            select(Transaction.tx_hash)
+            .where(Transaction.status == "submitted", Transaction.tx_hash.isnot(None))
+            .distinct()
+        ))
+        with self._lock:
+            self._hashes = loaded | self._announced
+            self._announced.clear()
+        self._previous, self._recent = self._recent, {}
+        self._loaded_at = now
+        logger.info(f"Tracking {len(self._hashes)} submitted tx hash(es); {metrics.snapshot('oura.')}")
+
+    def match(self, session, seen: Dict[str, dict]) -> Dict[str, dict]:
+        """
+        Our pending hashes among `seen` (tx hash -> block) and the recently
+        seen ones, with the block each was seen in.
+        """
+        self._reload_if_stale(session)
+        self._recent.update(seen)
+        with self._lock:
+            matches = {h: self._previous[h] for h in self._hashes.intersection(self._previous)}
+            matches.update((h, self._recent[h]) for h in self._hashes.intersection(self._recent))
+        metrics.incr("oura.tx_events.seen", len(seen))
+        metrics.incr("oura.tx_events.matched", len(matches.keys() & seen.keys()))
+        return matches
+
+    def forget_after(self, slot: int) -> None:
+        """
+        Drop recently seen hashes from blocks after `slot` (rolled back).
+        """
+        for window in (self._recent, self._previous):
+            for tx_hash in [h for h, block in window.items() if block["slot"] > slot]:
+                del window[tx_hash]
+
+
+def follow_announcements(pending: PendingTxHashes) -> None:
+    """
+    Add every hash announced on CHANNEL to `pending`. Runs forever;
+    reconnects after Redis errors (announcements missed meanwhile are
+    picked up by the next reload).
+    """
+    while True:
+        try:
+            pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(CHANNEL)
+            for message in pubsub.listen():
+                if message["type"] == "message":
+                    pending.add(message["data"])
+        except redis.RedisError as e:
+            logger.warning(f"Submitted tx announcements interrupted: {e}")
+            time.sleep(1)
@@ -0,0 +1,92 @@
+import logging
+import zlib
+from typing import Optional
+
+import redis
+from redis.lock import Lock
+
+from heron_app.core.config import settings
+from heron_app.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+def partitioned() -> bool:
+    return settings.WALLET_SCHEDULER == "partitioned"
+
+
+def wallet_partition(wallet_id) -> int:
+    """
+    Stable partition for a wallet (crc32, so every process agrees on it).
+    """
+    return zlib.crc32(str(wallet_id).encode()) % settings.WALLET_PARTITIONS
+
+
+def partition_queue(partition: int) -> str:
+    return f"wallet_partition_{partition}"
+
+
+def wallet_queue(wallet_id) -> str:
+    """
+    Celery queue serving a wallet. In "per-wallet" mode every wallet has its
+    own queue and worker process; in "partitioned" mode wallets are spread
+    over WALLET_PARTITIONS shared queues, each consumed by one single-process
+    worker, so a wallet's tasks still run one at a time.
+    """
+    if partitioned():
+        return partition_queue(wallet_partition(wallet_id))
+    return f"wallet_{str(wallet_id)}"
+
+
+class _NullLock:
+    name = None
+
+    def reacquire(self) -> None:
+        pass
+
+    def release(self) -> None:
+        pass
+
+
+def acquire_wallet_lock(wallet_id) -> Optional[Lock]:
+    """
+    Non-blocking per-wallet lock for partitioned mode. Guards serialization
+    when more than one consumer serves a partition (e.g. several API hosts
+    each launching partition workers). Returns None if the wallet is busy.
+    Always succeeds (without a lock) in per-wallet mode.
+    """
+    if not partitioned():
+        return _NullLock()
+    lock = get_redis().lock(
+        f"heron:wallet-lock:{wallet_id}",
+        timeout=settings.WALLET_LOCK_TIMEOUT_SECONDS,
+        blocking=False,
+    )
+    return lock if lock.acquire() else None
+
+
+def extend_wallet_lock(lock) -> bool:
+    """
+    Reset the lock's timeout to WALLET_LOCK_TIMEOUT_SECONDS, for tasks that
+    may hold it longer than that. Returns False if the lock expired and
+    may be held by another task now.
+    """
+    try:
+        lock.reacquire()
+    except redis.exceptions.LockError as e:
+        logger.warning(f"Wallet lock {lock.name} expired while held: {e}")
+        return False
+    except redis.RedisError as e:
+        # Still ours until the timeout, unless Redis lost it too
+        logger.warning(f"Wallet lock {lock.name} could not be extended: {e}")
+    return True
+
+
+def release_wallet_lock(lock) -> None:
+    if lock is None:
+        return
+    try:
+        lock.release()
+    except redis.exceptions.LockError as e:
+        # Expired while the task was still running; nothing left to release.
+        logger.warning(f"Wallet lock {lock.name} was already released: {e}")
@@ -2,44 +2,76 @@ import subprocess
 import os
 import socket
 
+from heron_app.core.config import settings
+from heron_app.workers.liveness import QUEUE_ENV, alive_queues, claim_launch, is_queue_alive
+from heron_app.workers.scheduling import partition_queue, partitioned, wallet_queue
+
+
 def is_worker_alive(wallet_id: str) -> bool:
     """
-    Ask Celery for all of its registered nodes (with `status`),
-    then see if any of them start with "wallet_<id>@".
-    """
-    queue_prefix = f"wallet_{wallet_id}@"
-    try:
-        # `status` will list all nodes that have ever joined the cluster
-        out = subprocess.check_output(
-            ["celery", "-A", "heron_app.workers.worker", "status"],
-            stderr=subprocess.DEVNULL
-        )
-        text = out.decode("utf-8")
-        # look for any line like "-> wallet_<id>@<hostname>: OK"
-        return any(line.strip().startswith("-> "+queue_prefix) for line in text.splitlines())
-    except subprocess.CalledProcessError:
-        # if Celery isn't up yet, status will fail; treat that as "no node"
-        return False
+    Whether the queue serving this wallet has a live consumer, from the
+    workers' Redis heartbeats (a single key lookup).
+    """
+    return is_queue_alive(wallet_queue(wallet_id))
 
-def start_worker(wallet_id: str):
+
+def _launch(queue_name: str) -> None:
     """
-    Launch exactly one celery worker on queue `wallet_<id>` using
-    a unique node name that includes this container's hostname.
+    Launch one single-process celery worker on `queue_name` using a unique
+    node name that includes this container's hostname, unless a consumer is
+    already live or another process is launching one.
     """
-    queue_name = f"wallet_{wallet_id}"
     # use the container's hostname so that repeated restarts don't collide
     host = socket.gethostname()
     nodename = f"{queue_name}@{host}"
 
-    if is_worker_alive(wallet_id):
-        print(f"[Worker] {nodename} is already running, skipping launch")
+    if not claim_launch(queue_name, nodename):
+        print(f"[Worker] {queue_name} is already running, skipping launch")
         return
 
     print(f"[Worker] Starting new worker for queue={queue_name} as node={nodename}")
+    # One task at a time per queue: keep the connection pool small.
+    env = dict(
+        os.environ,
+        DB_POOL_SIZE=str(settings.DB_WORKER_POOL_SIZE),
+        DB_MAX_OVERFLOW=str(settings.DB_WORKER_MAX_OVERFLOW),
+        **{QUEUE_ENV: queue_name},
+    )
     subprocess.Popen([
         "celery", "-A", "heron_app.workers.worker", "worker",
         "-Q", queue_name,
         "-n", nodename,
         "--concurrency=1",
         "--loglevel=info"
-    ])
\ No newline at end of file
+    ], env=env)
+
+
+def start_worker(wallet_id: str):
+    """
+    Make sure a worker is consuming the queue that serves `wallet_id`: the
+    wallet's partition worker in partitioned mode, or a dedicated worker on
+    `wallet_<id>` in per-wallet mode.
+    """
+    queue_name = wallet_queue(wallet_id)
+    if is_queue_alive(queue_name):
+        return
+    _launch(queue_name)
+
+
+def start_all_workers(wallet_ids) -> None:
+    """
+    Startup: launch every partition worker (partitioned mode) or one worker
+    per wallet (per-wallet mode) that has no live consumer, checking all
+    heartbeats in one round trip.
+    """
+    if partitioned():
+        queues = [partition_queue(p) for p in range(settings.WALLET_PARTITIONS)]
+    else:
+        queues = [wallet_queue(wallet_id) for wallet_id in wallet_ids]
+
+    alive = alive_queues(queues)
+    for queue_name in queues:
+        if queue_name in alive:
+            print(f"[Worker] {queue_name} is already running, skipping launch")
+        else:
+            _launch(queue_name)
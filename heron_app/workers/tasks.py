@@ -1,12 +1,16 @@
 import logging
 import os
 import json
+import random
 import traceback
 import time
-from datetime import datetime
-from collections import defaultdict
-from typing import Any, Dict, List, Union, Mapping, Optional
+from datetime import datetime, timedelta
+from collections import defaultdict, deque
+from uuid import uuid4
+from typing import Any, Dict, List, Union, Mapping, Optional, Tuple
 
+from celery import group
+from celery.signals import worker_shutdown
 from celery.utils.log import get_task_logger
 from blockfrost import BlockFrostApi, ApiError, ApiUrls
 from cryptography.fernet import Fernet
@@ -46,11 +50,19 @@ from pycardano.plutus import RawPlutusData, Datum
 from pycardano.exception import (
     TransactionFailedException,
     InsufficientUTxOBalanceException,
+    InvalidTransactionException,
     UTxOSelectionException,
 )
 
+from sqlalchemy import func, or_, select
+
 from heron_app.workers.worker import celery
+from heron_app.workers.pending_hashes import announce_submitted
+from heron_app.workers.scheduling import acquire_wallet_lock, extend_wallet_lock, release_wallet_lock, wallet_queue
+from heron_app.workers.utxo_ledger import ledger_utxos, request_resync
+from heron_app.core.config import settings
 from heron_app.db.database import SessionLocal
+from heron_app.db.build_plan import BuildPlan, hydrated_transactions
 from heron_app.db.models.transaction import Transaction
 from heron_app.db.models.transaction_output import TransactionOutput
 from heron_app.db.models.transaction_output_asset import TransactionOutputAsset
@@ -62,7 +74,15 @@ from heron_app.utils.cardano import (
     ValueNotConservedError,
     BadInputsError,
     GenericSubmitError,
+    TransactionTooLargeError,
 )
+from heron_app.utils import balance_cache, metrics
+from heron_app.utils.balance_cache import sum_utxos
+from heron_app.utils.chain_context import get_chain_context
+from heron_app.utils.coin_selection import UtxoIndex, get_strategy
+from heron_app.utils.key_cache import get_key_cache
+from heron_app.utils.rate_limiter import RateLimitedBlockFrostApi
+from heron_app.utils.utxo_cache import get_utxo_cache
 
 import cbor2
 import hashlib
@@ -84,7 +104,6 @@ if not logger.hasHandlers():
 logger.propagate = True
 
 
-WALLET_UTXO_CACHE: Dict[str, list] = {}
 MAX_FEE = 0
 
 BLOCKFROST_API_KEY = os.getenv("BLOCKFROST_PROJECT_ID")
@@ -127,33 +146,96 @@ BASE_URL = network_map.get(network, os.getenv("CUSTOM_BLOCKFROST_API_URL"))
 def _get_blockfrost_context() -> BlockFrostChainContext:
     """
     Centralized Blockfrost chain context construction, so configuration and
-    error handling stay in one place.
+    error handling stay in one place. The context is shared by every task in
+    the process and caches protocol parameters per epoch.
     """
-    return BlockFrostChainContext(project_id=BLOCKFROST_API_KEY, base_url=BASE_URL)
+    return get_chain_context(BLOCKFROST_API_KEY, BASE_URL)
 
 
-def _get_blockfrost_api() -> BlockFrostApi:
+def _get_blockfrost_api() -> RateLimitedBlockFrostApi:
     """
     Centralized Blockfrost REST client construction.
     """
-    return BlockFrostApi(project_id=BLOCKFROST_API_KEY, base_url=BASE_URL)
+    return RateLimitedBlockFrostApi(BlockFrostApi(project_id=BLOCKFROST_API_KEY, base_url=BASE_URL))
+
+
+def dispatch_transaction(transaction_id, wallet_id, countdown=None):
+    """
+    Send a queued transaction to its wallet's queue: on its own, or as part of
+    the wallet's next chain when TX_CHAINING_ENABLED or TX_BATCHING_ENABLED
+    is set.
+    """
+    queue_name = wallet_queue(wallet_id)
+    if settings.TX_CHAINING_ENABLED or settings.TX_BATCHING_ENABLED:
+        process_wallet_chain.apply_async(args=[str(wallet_id)], queue=queue_name, countdown=countdown)
+    else:
+        process_transaction.apply_async(args=[transaction_id], queue=queue_name, countdown=countdown)
+
+
+def dispatch_transactions(transactions):
+    """
+    Bulk variant of dispatch_transaction for (transaction_id, wallet_id)
+    pairs: all messages are published as one Celery group. In chaining or
+    batching mode a single chain task is sent per wallet; it keeps sending
+    itself until the wallet's queued rows are done.
+    """
+    if settings.TX_CHAINING_ENABLED or settings.TX_BATCHING_ENABLED:
+        wallet_ids = dict.fromkeys(str(wallet_id) for _, wallet_id in transactions)
+        signatures = [
+            process_wallet_chain.signature(args=[wallet_id], queue=wallet_queue(wallet_id))
+            for wallet_id in wallet_ids
+        ]
+    else:
+        signatures = [
+            process_transaction.signature(args=[str(transaction_id)], queue=wallet_queue(wallet_id))
+            for transaction_id, wallet_id in transactions
+        ]
+    if signatures:
+        group(signatures).apply_async()
 
 
 def enqueue_transaction(transaction_id):
     session = SessionLocal()
     tx = session.query(Transaction).filter(Transaction.id == transaction_id).first()
     if tx:
-        wallet = tx.wallet_id
-        queue_name = f"wallet_{str(wallet)}"
-        process_transaction.apply_async(args=[transaction_id], queue=queue_name)
+        dispatch_transaction(transaction_id, tx.wallet_id)
     session.close()
 
 def get_utxos_from_cache(address):
-    return WALLET_UTXO_CACHE.get(address, [])
+    return get_utxo_cache().get(address)
+
 
+def set_utxos_to_cache(address, utxo_list, fresh: bool = True) -> int:
+    version = get_utxo_cache().set(address, utxo_list)
+    # After a submit (fresh=False) it's the balance without the spent inputs,
+    # with the change: only the worker's view until the chain confirms it.
+    balance_cache.set_balance(address, sum_utxos(utxo_list), fresh=fresh)
+    return version
 
-def set_utxos_to_cache(address, utxo_list):
-    WALLET_UTXO_CACHE[address] = utxo_list
+
+def invalidate_utxo_cache(address):
+    get_utxo_cache().invalidate(address)
+    balance_cache.mark_stale([address])
+
+
+def _entry_to_utxo(address: str, entry: dict) -> UTxO:
+    """
+    Convert a cached UTXO entry into a pycardano UTxO owned by `address`.
+    """
+    tx_input = TransactionInput.from_primitive([entry["tx_hash"], entry["tx_index"]])
+    val = Value(int(entry["amounts"].get("lovelace", 0)))
+
+    for unit, amount in entry["amounts"].items():
+        if unit == "lovelace":
+            continue
+
+        policy = ScriptHash.from_primitive(unit[:56])
+        asset_name = AssetName(bytes.fromhex(unit[56:]))
+        if policy not in val.multi_asset:
+            val.multi_asset[policy] = Asset()
+        val.multi_asset[policy][asset_name] = int(amount)
+
+    return UTxO(tx_input, CardanoTxOutput(Address.from_primitive(address), val))
 
 
 def _validate_wallet_address(address: str) -> None:
@@ -170,11 +252,21 @@ def _validate_wallet_address(address: str) -> None:
 
 def reload_utxos(address):
     """
-    Fetch and cache all UTXOs for an address using Blockfrost, with internal
-    validation and robust error handling.
+    Fetch and cache all UTXOs for an address from the local UTxO ledger, or
+    from Blockfrost when the ledger doesn't cover the address yet.
     """
 
     _validate_wallet_address(address)
+
+    session = SessionLocal()
+    try:
+        ledger = ledger_utxos(session, address)
+    finally:
+        session.close()
+    if ledger is not None:
+        set_utxos_to_cache(address, ledger)
+        return
+
     api = _get_blockfrost_api()
 
     page = 1
@@ -248,514 +340,678 @@ def dict_to_datum(obj: dict) -> RawPlutusData:
     return RawPlutusData(tag121_construct)
 
 
-@celery.task(name="heron_app.workers.tasks.process_transaction", bind=True)
-def process_transaction(self, transaction_id):
+def _load_available_utxos(wallet, transaction_id) -> list:
+    """
+    Cached UTXOs for the wallet, falling back to a reload (local ledger or
+    Blockfrost) when the cache is cold.
+    """
+    address = wallet.address
+    available_utxos = get_utxos_from_cache(address)
 
+    if len(available_utxos) == 0:
+        logger.info(f"No cached UTXOs found for wallet {wallet.id} ({address}), reloading")
+        reload_utxos(address)
+        available_utxos = get_utxos_from_cache(address)
+        if len(available_utxos) == 0:
+            logger.error(f"No UTXOs found for wallet {wallet.id} ({address}), cannot process transaction {transaction_id}")
+            raise BadInputsError(f"No UTXOs found for wallet {wallet.id} ({address})")
 
-    context = _get_blockfrost_context()
-    
-    logger.info(f"Processing transaction {transaction_id}")
+    logger.debug(f"Available UTXOs for wallet {wallet.id} ({address}): {available_utxos}")
+    return available_utxos
 
-    session = SessionLocal()
-    try:
-        tx = session.query(Transaction).filter(Transaction.id == transaction_id).first()
-        if not tx:
-            return
-        wallet = session.query(Wallet).filter(Wallet.id == tx.wallet_id).first()
-        if not wallet:
-            tx.status = "failed"
-            session.commit()
-            return
 
-        address = wallet.address
-        available_utxos = get_utxos_from_cache(address)
+# UtxoIndex of the wallets this process submitted for last, with the UTxO
+# cache version it was written as (at most UTXO_INDEX_KEEP wallets)
+UTXO_INDEX_KEEP = 64
+_utxo_indexes: Dict[str, Tuple[int, UtxoIndex]] = {}
 
-        if len(available_utxos) == 0:
-            logger.info(f"No cached UTXOs found for wallet {wallet.id} ({address}), fetching from Blockfrost")
-            reload_utxos(address)
-            available_utxos = get_utxos_from_cache(address)
-            if len(available_utxos) == 0:
-                logger.error(f"No UTXOs found for wallet {wallet.id} ({address}), cannot process transaction {transaction_id}")
-                raise BadInputsError(f"No UTXOs found for wallet {wallet.id} ({address})")
-
-        logger.debug(f"Available UTXOs for wallet {wallet.id} ({address}): {available_utxos}")
-        
+
+def _utxo_index(wallet, transaction_id) -> UtxoIndex:
+    """
+    The wallet's UtxoIndex: the one this process kept after its last submit,
+    heaps and all, while the UTxO cache still holds that version; otherwise
+    built from the cache (see _load_available_utxos).
+    """
+    kept = _utxo_indexes.pop(wallet.address, None)
+    if kept is not None and len(kept[1]) and get_utxo_cache().version(wallet.address) == kept[0]:
+        metrics.incr("utxo_index.reused")
+        return kept[1]
+    return UtxoIndex(_load_available_utxos(wallet, transaction_id))
+
+
+def _keep_utxo_index(address: str, version: int, utxo_index: UtxoIndex) -> None:
+    if not version:
+        return
+    _utxo_indexes[address] = (version, utxo_index)
+    if len(_utxo_indexes) > UTXO_INDEX_KEEP:
+        del _utxo_indexes[next(iter(_utxo_indexes))]
+
+
+def _derive_payment_skey(wallet) -> ExtendedSigningKey:
+    def derive():
         fernet = Fernet(os.getenv("WALLET_ENCRYPTION_KEY"))
         mnemonic = fernet.decrypt(wallet.encrypted_root_key.encode()).decode()
         root_key = crypto.bip32.HDWallet.from_mnemonic(mnemonic)
         payment_key = root_key.derive_from_path("m/1852'/1815'/0'/0/0")
-        payment_skey = ExtendedSigningKey.from_hdwallet(payment_key)
+        return ExtendedSigningKey.from_hdwallet(payment_key)
 
+    return get_key_cache().get_or_load(("wallet", str(wallet.id)), derive)
 
-        MAX_FEE = context.protocol_param.min_fee_constant + (context.protocol_param.max_tx_size * context.protocol_param.min_fee_coefficient)
 
-        logger.debug(f"Max fee: {MAX_FEE}")
+def _policy_skey(policy) -> PaymentSigningKey:
+    def decrypt():
+        fernet = Fernet(os.getenv("WALLET_ENCRYPTION_KEY"))
+        skey_cbor_hex = fernet.decrypt(policy.encrypted_policy_skey.encode()).decode("utf8")
+        return PaymentSigningKey.from_cbor(skey_cbor_hex)
 
+    return get_key_cache().get_or_load(("policy", policy.policy_id), decrypt)
 
 
-        outputs_db = session.query(TransactionOutput).filter(TransactionOutput.transaction_id == tx.numeric_id).all()
-        assets_needed = {}
+@worker_shutdown.connect
+def _wipe_key_cache(**kwargs):
+    get_key_cache().clear()
 
-        builder = TransactionBuilder(context)
 
-        assets_needed["lovelace"] = MAX_FEE
+def _build_and_sign_checked(builder, signers, address) -> CardanoTransaction:
+    """
+    builder.build_and_sign, raising TransactionTooLargeError when the result
+    exceeds max_tx_size so batches can be split.
+    """
+    try:
+        return builder.build_and_sign(signers, change_address=address)
+    except InvalidTransactionException as e:
+        if "exceeds the max limit" in str(e):
+            raise TransactionTooLargeError(str(e)) from e
+        raise
 
-        print(f"Assets needed: {assets_needed}")
 
-        for out in outputs_db:
-            val = Value(0)
-            ma = MultiAsset()
-            assets = session.query(TransactionOutputAsset).filter(TransactionOutputAsset.output_id == out.id).all()
-            for asset in assets:
+def _build_and_sign(plan, address, payment_skey, context, utxo_index) -> CardanoTransaction:
+    """
+    Build and sign one on-chain transaction carrying the outputs and mints of
+    every row in the plan (a single row, or a payout batch). Inputs are taken
+    out of `utxo_index`.
+    """
+    txs = plan.transactions
+    tx = txs[0]
+    transaction_id = str(tx.id) if len(txs) == 1 else f"batch[{len(txs)}] {tx.id}"
 
-                if asset.unit == "lovelace":
-                    val.coin += int(asset.quantity)
-                    if "lovelace" not in assets_needed:
-                        assets_needed["lovelace"] = 0
-                    assets_needed["lovelace"] += val.coin
-                else:
-                    policy_id = asset.unit[:56]
-                    asset_name_hex = asset.unit[56:]
-                    policy = ScriptHash.from_primitive(policy_id)
-                    asset_name = AssetName(bytes.fromhex(asset_name_hex))
-                    if policy not in ma:
-                        ma[policy] = Asset()
-                    ma[policy][asset_name] = int(asset.quantity)
+    protocol_param = context.protocol_param
+    MAX_FEE = protocol_param.min_fee_constant + (protocol_param.max_tx_size * protocol_param.min_fee_coefficient)
 
-                    if asset.unit not in assets_needed:
-                        assets_needed[asset.unit] = 0
-                    assets_needed[asset.unit] += int(asset.quantity)        
+    logger.debug(f"Max fee: {MAX_FEE}")
+    logger.debug(f"Chain context cache: {metrics.snapshot('chain_context.')}")
 
 
-            if ma:
-                val.multi_asset = ma
-                min_ada_required = min_lovelace_post_alonzo(CardanoTxOutput(Address.from_primitive(out.address), val), context)
 
-                if val.coin < min_ada_required:
-                    logger.debug(f"Output {out.id} has insufficient ADA for assets, adjusting to minimum required: {min_ada_required}")
-                    if "lovelace" not in assets_needed:
-                        assets_needed["lovelace"] = 0
-                    assets_needed["lovelace"] = assets_needed["lovelace"] - val.coin + min_ada_required
-                    val.coin = min_ada_required
+    outputs_db = plan.outputs
+    assets_needed = {}
 
+    builder = TransactionBuilder(context)
 
-            if out.datum and isinstance(out.datum, dict):
+    assets_needed["lovelace"] = MAX_FEE
 
+    print(f"Assets needed: {assets_needed}")
 
-                inline_datum = dict_to_datum(out.datum)
+    for out in outputs_db:
+        val = Value(0)
+        ma = MultiAsset()
+        for asset in out.assets:
 
+            if asset.unit == "lovelace":
+                val.coin += int(asset.quantity)
+                if "lovelace" not in assets_needed:
+                    assets_needed["lovelace"] = 0
+                assets_needed["lovelace"] += val.coin
+            else:
+                policy_id = asset.unit[:56]
+                asset_name_hex = asset.unit[56:]
+                policy = ScriptHash.from_primitive(policy_id)
+                asset_name = AssetName(bytes.fromhex(asset_name_hex))
+                if policy not in ma:
+                    ma[policy] = Asset()
+                ma[policy][asset_name] = int(asset.quantity)
 
-                builder.add_output(CardanoTxOutput(
-                    Address.from_primitive(out.address),
-                    val,
-                    datum=inline_datum
-                ))
+                if asset.unit not in assets_needed:
+                    assets_needed[asset.unit] = 0
+                assets_needed[asset.unit] += int(asset.quantity)        
 
-            else:
-                logger.debug(f"Adding output without inline datum.")
 
-                builder.add_output(CardanoTxOutput(
-                    Address.from_primitive(out.address),
-                    val
-                ))
+        if ma:
+            val.multi_asset = ma
+            min_ada_required = min_lovelace_post_alonzo(CardanoTxOutput(Address.from_primitive(out.address), val), context)
 
-        mints = session.query(TransactionMint).filter(TransactionMint.transaction_id == tx.numeric_id).all()
+            if val.coin < min_ada_required:
+                logger.debug(f"Output {out.id} has insufficient ADA for assets, adjusting to minimum required: {min_ada_required}")
+                if "lovelace" not in assets_needed:
+                    assets_needed["lovelace"] = 0
+                assets_needed["lovelace"] = assets_needed["lovelace"] - val.coin + min_ada_required
+                val.coin = min_ada_required
 
-        if mints:
-            logger.debug(f"Found {len(mints)} mints for transaction {transaction_id}")
 
-            # We'll accumulate quantities per (policy_id, asset_name)
-            policy_ids = {}
+        if out.datum and isinstance(out.datum, dict):
 
-            for mint in mints:
-                logger.info(f"Mint request: {mint.policy_id}.{mint.asset_name} × {mint.quantity}")
 
-                if mint.policy_id not in policy_ids:
-                    policy_ids[mint.policy_id] = {}
+            inline_datum = dict_to_datum(out.datum)
 
-                if mint.asset_name not in policy_ids[mint.policy_id]:
-                    policy_ids[mint.policy_id][mint.asset_name] = 0
 
-                policy_ids[mint.policy_id][mint.asset_name] += int(mint.quantity)
+            builder.add_output(CardanoTxOutput(
+                Address.from_primitive(out.address),
+                val,
+                datum=inline_datum
+            ))
 
+        else:
+            logger.debug(f"Adding output without inline datum.")
 
+            builder.add_output(CardanoTxOutput(
+                Address.from_primitive(out.address),
+                val
+            ))
 
-            # Build the MultiAsset and the list of native_scripts
-            multi_asset = MultiAsset()
-            native_scripts = []
+    mints = plan.mints
 
-            logger.info(f"policy_ids: {policy_ids}")
+    if mints:
+        logger.debug(f"Found {len(mints)} mints for transaction {transaction_id}")
 
-            for policy_id in policy_ids:
-                # fetch & decrypt your signing key for this policy
-                mp = session.query(MintingPolicy).filter_by(policy_id=policy_id).first()
-                if not mp:
-                    raise BadInputsError(f"Unknown policy {policy_id}")
-                
-                logger.info(f"Processing policy {policy_id}")
-                logger.info(f"Processing assets {policy_ids[policy_id]}")
+        # We'll accumulate quantities per (policy_id, asset_name)
+        policy_ids = {}
 
-                # prepare the minting script
+        for mint in mints:
+            logger.info(f"Mint request: {mint.policy_id}.{mint.asset_name} × {mint.quantity}")
 
-                fernet = Fernet(os.getenv("WALLET_ENCRYPTION_KEY"))
-                skey_cbor_hex = fernet.decrypt(mp.encrypted_policy_skey.encode()).decode("utf8")
-                policy_skey = PaymentSigningKey.from_cbor(skey_cbor_hex)
+            if mint.policy_id not in policy_ids:
+                policy_ids[mint.policy_id] = {}
 
+            if mint.asset_name not in policy_ids[mint.policy_id]:
+                policy_ids[mint.policy_id][mint.asset_name] = 0
 
-                script = ScriptAll([ScriptPubkey(policy_skey.to_verification_key().hash())])
+            policy_ids[mint.policy_id][mint.asset_name] += int(mint.quantity)
 
 
-                if script not in native_scripts:
-                    native_scripts.append(script)
 
-                # prepare an Asset map under this policy
-                asset_map = Asset()
-                # find all assets under this policy
-                for asset in policy_ids[policy_id]:
+        # Build the MultiAsset and the list of native_scripts
+        multi_asset = MultiAsset()
+        native_scripts = []
 
-                    name = AssetName(asset.encode("utf-8"))
-                    qty = policy_ids[policy_id][asset]
-                    asset_map[name] = qty
+        logger.info(f"policy_ids: {policy_ids}")
 
-                multi_asset[ScriptHash.from_primitive(policy_id)] = asset_map
+        for policy_id in policy_ids:
+            # fetch & decrypt your signing key for this policy
+            mp = plan.policies.get(policy_id)
+            if not mp:
+                raise BadInputsError(f"Unknown policy {policy_id}")
+            
+            logger.info(f"Processing policy {policy_id}")
+            logger.info(f"Processing assets {policy_ids[policy_id]}")
 
-            # finally, attach to the builder
-            builder.mint = multi_asset
-            builder.native_scripts = native_scripts
+            # prepare the minting script
 
+            policy_skey = _policy_skey(mp)
 
-        logger.debug("Finding assets in available UTXOs to cover transaction outputs...")
-        logger.debug(f"Available UTXOs: {len(available_utxos)}")
-        logger.debug(f"Available UTXOs: {available_utxos}")
-        logger.debug(f"Assets needed: {assets_needed}")
 
-        while len(available_utxos) > 0 and len(assets_needed) > 1:
+            script = ScriptAll([ScriptPubkey(policy_skey.to_verification_key().hash())])
 
-            if len(assets_needed) == 1 and "lovelace" in assets_needed:
-                break
-          
-            for unit, qty in assets_needed.items():
 
-                if unit == "lovelace":
-                    continue
+            if script not in native_scripts:
+                native_scripts.append(script)
 
-   
-                policy_id = unit[:56]
-                asset_name_hex = unit[56:]
-                policy = ScriptHash.from_primitive(policy_id)
-                asset_name = AssetName(bytes.fromhex(asset_name_hex))
-                for utxo in available_utxos:
-                    if unit in utxo["amounts"]:
-                        tx_input = TransactionInput.from_primitive([utxo["tx_hash"], utxo["tx_index"]])
-
-                        val = Value(0)
-                        ma = MultiAsset()
-
-                        val.coin += utxo["amounts"]["lovelace"]
-                        
-                        if "lovelace" in assets_needed:
-                            assets_needed['lovelace'] -= utxo["amounts"]["lovelace"]
-
-                        for utxo_unit, amount in utxo["amounts"].items():
-                            if utxo_unit == "lovelace":
-                                continue
-
-                            policy_id = utxo_unit[:56]
-                            asset_name_hex = utxo_unit[56:]
-                            policy = ScriptHash.from_primitive(policy_id)
-                            asset_name = AssetName(bytes.fromhex(asset_name_hex))
-
-
-
-                            if policy not in ma:
-                                ma[policy] = Asset()
-                            ma[policy][asset_name] = int(utxo["amounts"][utxo_unit])
-                            if utxo_unit in assets_needed:
-                                assets_needed[utxo_unit] -= utxo["amounts"][utxo_unit]
-
-                            if ma:
-                                val.multi_asset = ma
-                      
-                        available_utxos.remove(utxo)
-
-                        builder.add_input(UTxO(tx_input, CardanoTxOutput(Address.from_primitive(address), val)))
-
-
-                        if assets_needed[unit] <= 0:    
-                            break
-
-            assets_needed = {k: v for k, v in assets_needed.items() if v > 0}
-
-        
-        if len(available_utxos) == 0 and len(assets_needed) > 1:
-            logger.error(f"Not enough UTXOs available to cover transaction {transaction_id} outputs")
-            raise InsufficientUTxOBalanceException(f"Not enough UTXOs available to cover transaction {transaction_id} outputs")
-        
-        while len(available_utxos) > 0 and len(assets_needed) > 0 and 'lovelace' in assets_needed and assets_needed['lovelace'] > 0:
-
-            logger.debug(f"Assets needed: {assets_needed}")
-
-            max_ada_utxo = None
-            max_ada = 0
-            for utxo in available_utxos:
-                if utxo["amounts"]["lovelace"] > max_ada:
-                    max_ada_utxo = utxo
-                    max_ada = utxo["amounts"]["lovelace"]
-            if max_ada_utxo:
-                logger.debug(f"Selected UTXO {max_ada_utxo['tx_hash']} with {max_ada} ADA")
-                tx_input = TransactionInput.from_primitive([max_ada_utxo["tx_hash"], max_ada_utxo["tx_index"]])
-                val = Value(0)
-                val.coin += max_ada_utxo["amounts"]["lovelace"]
-
-                for unit, amount in max_ada_utxo["amounts"].items():
-                    if unit == "lovelace":
-                        continue
-
-                    policy_id = unit[:56]
-                    asset_name_hex = unit[56:]
-                    policy = ScriptHash.from_primitive(policy_id)
-                    asset_name = AssetName(bytes.fromhex(asset_name_hex))
-                    if policy not in val.multi_asset:
-                        val.multi_asset[policy] = Asset()
-                    val.multi_asset[policy][asset_name] = max_ada_utxo["amounts"][unit]
-
-                builder.add_input(UTxO(tx_input, CardanoTxOutput(Address.from_primitive(address), val)))
-                available_utxos.remove(max_ada_utxo)
-                logger.debug(f"Added UTXO {max_ada_utxo['tx_hash']} with amounts: {max_ada_utxo['amounts']}")
-                assets_needed['lovelace'] -= max_ada_utxo["amounts"]["lovelace"]
-            
-            assets_needed = {k: v for k, v in assets_needed.items() if v > 0}
+            # prepare an Asset map under this policy
+            asset_map = Asset()
+            # find all assets under this policy
+            for asset in policy_ids[policy_id]:
 
-        if len(available_utxos) == 0 and len(assets_needed) > 1:
-            logger.error(f"Not enough UTXOs available to cover transaction {transaction_id} outputs")
-            raise InsufficientUTxOBalanceException(f"Not enough UTXOs available to cover transaction {transaction_id} outputs")
+                name = AssetName(asset.encode("utf-8"))
+                qty = policy_ids[policy_id][asset]
+                asset_map[name] = qty
 
-        if tx.metadata_json:
-            try:
-                # If it's a string, parse it, otherwise use it directly
-                metadata_raw = tx.metadata_json
+            multi_asset[ScriptHash.from_primitive(policy_id)] = asset_map
 
-                logger.debug(f"Metadata raw: {metadata_raw}")
-                logger.debug(f"Metadata type: {type(metadata_raw)}")
+        # finally, attach to the builder
+        builder.mint = multi_asset
+        builder.native_scripts = native_scripts
 
-                if isinstance(metadata_raw, str):
-                    metadata_raw = json.loads(metadata_raw)
 
-                metadata_dict = {int(k): v for k, v in metadata_raw.items()}
-                auxiliary_data = AuxiliaryData(AlonzoMetadata(metadata=Metadata(metadata_dict)))
-                builder.auxiliary_data = auxiliary_data
+    logger.debug("Finding assets in available UTXOs to cover transaction outputs...")
+    logger.debug(f"Available UTXOs: {len(utxo_index)}")
+    logger.debug(f"Assets needed: {assets_needed}")
 
-            except Exception as e:
-                logger.warning(f"Metadata error: {e}")
+    strategy = get_strategy(settings.COIN_SELECTION_STRATEGY)
+    selected_utxos, shortfall = strategy.select(utxo_index, assets_needed)
 
-        signers = []
-        signers.append(payment_skey)
+    if any(unit != "lovelace" for unit in shortfall):
+        logger.error(f"Not enough UTXOs available to cover transaction {transaction_id} outputs")
+        raise InsufficientUTxOBalanceException(f"Not enough UTXOs available to cover transaction {transaction_id} outputs")
 
-        if mints:
-            for mint in mints:
+    for utxo in selected_utxos:
+        logger.debug(f"Selected UTXO {utxo['tx_hash']}#{utxo['tx_index']} with amounts: {utxo['amounts']}")
+        builder.add_input(_entry_to_utxo(address, utxo))
 
-                policy_details = session.query(MintingPolicy).filter(MintingPolicy.policy_id == mint.policy_id).first()
+    if tx.metadata_json:
+        try:
+            # If it's a string, parse it, otherwise use it directly
+            metadata_raw = tx.metadata_json
 
-                if policy_details:
-                    fernet = Fernet(os.getenv("WALLET_ENCRYPTION_KEY"))
-                    skey_cbor_hex = fernet.decrypt(policy_details.encrypted_policy_skey.encode()).decode("utf8")
+            logger.debug(f"Metadata raw: {metadata_raw}")
+            logger.debug(f"Metadata type: {type(metadata_raw)}")
 
-                    logger.info(f"Payment signing key: {payment_skey}")
-                    logger.info(f"Payment verification key: {payment_skey.to_verification_key()}")
-                    logger.info(f"skey_cbor_hex: {skey_cbor_hex}")
+            if isinstance(metadata_raw, str):
+                metadata_raw = json.loads(metadata_raw)
 
-                    policy_skey = PaymentSigningKey.from_cbor(skey_cbor_hex)
+            metadata_dict = {int(k): v for k, v in metadata_raw.items()}
+            auxiliary_data = AuxiliaryData(AlonzoMetadata(metadata=Metadata(metadata_dict)))
+            builder.auxiliary_data = auxiliary_data
 
-                    logger.info(f"policy_skey: {policy_skey}")
+        except Exception as e:
+            logger.warning(f"Metadata error: {e}")
 
-                    if policy_skey not in signers:
-                        signers.append(policy_skey)
+    signers = []
+    signers.append(payment_skey)
 
+    if mints:
+        for mint in mints:
 
+            policy_details = mint.policy
 
-        try:
+            if policy_details:
+                policy_skey = _policy_skey(policy_details)
 
-            logger.debug(f"signers: {signers}")
-
-
-            final_tx = builder.build_and_sign(signers, change_address=address)
-        except (InsufficientUTxOBalanceException, UTxOSelectionException) as e:
-            logger.debug(f"Insufficient UTXO balance for transaction {transaction_id}")
-
-            max_ada_utxo = None
-            max_ada = 0
-            for utxo in available_utxos:
-                if utxo["amounts"]["lovelace"] > max_ada:
-                    max_ada_utxo = utxo
-                    max_ada = utxo["amounts"]["lovelace"]
-
-            if max_ada_utxo:
-                logger.debug(f"Selected UTXO {max_ada_utxo['tx_hash']} with {max_ada} ADA")
-                tx_input = TransactionInput.from_primitive([max_ada_utxo["tx_hash"], max_ada_utxo["tx_index"]])
-                val = Value(0)
-                val.coin += max_ada_utxo["amounts"]["lovelace"]
-
-                for unit, amount in max_ada_utxo["amounts"].items():
-                    if unit == "lovelace":
-                        continue
-
-                    policy_id = unit[:56]
-                    asset_name_hex = unit[56:]
-                    policy = ScriptHash.from_primitive(policy_id)
-                    asset_name = AssetName(bytes.fromhex(asset_name_hex))
-                    if policy not in val.multi_asset:
-                        val.multi_asset[policy] = Asset()
-                    val.multi_asset[policy][asset_name] = max_ada_utxo["amounts"][unit]
-                
-                if "lovelace" in assets_needed:
-                    assets_needed['lovelace'] -= max_ada_utxo["amounts"]["lovelace"]
-
-                builder.add_input(UTxO(tx_input, CardanoTxOutput(Address.from_primitive(address), val)))
-                available_utxos.remove(max_ada_utxo)
-                logger.debug(f"Added UTXO {max_ada_utxo['tx_hash']} with amounts: {max_ada_utxo['amounts']}")
-                
-                try:
-                    final_tx = builder.build_and_sign(signers, change_address=address)
-                except (InsufficientUTxOBalanceException, UTxOSelectionException) as e:
-                    logger.debug(f"Insufficient UTXO balance for transaction {transaction_id}")
-                    raise InsufficientUTxOBalanceException(f"Insufficient UTXO balance for transaction {transaction_id}") from e
-            else:
-                logger.error(f"No UTXOs available to cover transaction {transaction_id}")
-                raise InsufficientUTxOBalanceException(f"No UTXOs available to cover transaction {transaction_id}")
-            
-        final_body = final_tx.transaction_body
+                if policy_skey not in signers:
+                    signers.append(policy_skey)
 
 
-        logger.debug(f"Final transaction body: {final_body}")    
 
-        logger.debug(f"Data hash: {final_body.script_data_hash}")
+    try:
 
-    
-        logger.debug(f"final_tx: {final_tx}")
+        logger.debug(f"signers: {len(signers)}")
 
-        try:
 
-            if network == "mainnet":
-                time.sleep(0.4)  # Delay for mainnet to avoid rate limiting issues
+        final_tx = _build_and_sign_checked(builder, signers, address)
+    except (InsufficientUTxOBalanceException, UTxOSelectionException) as e:
+        logger.debug(f"Insufficient UTXO balance for transaction {transaction_id}")
 
-            tx_hash = context.submit_tx(final_tx.to_cbor())
-            logger.info(f"Transaction {tx.id} submitted successfully: {tx_hash}")
+        max_ada_utxo = utxo_index.pop_largest("lovelace")
 
-        except TransactionFailedException as tfe:
-            error_json = str(tfe)
-            # logger.error(f"Transaction submission failed: {error_json}")
+        if max_ada_utxo:
+            logger.debug(f"Added UTXO {max_ada_utxo['tx_hash']} with amounts: {max_ada_utxo['amounts']}")
+            builder.add_input(_entry_to_utxo(address, max_ada_utxo))
 
-            if "BadInputsUTxO" in error_json:
-                raise ValueNotConservedError("Value not conserved between inputs and outputs.") from tfe
-            elif "ValueNotConservedUTxO" in error_json:
-                raise BadInputsError("Bad or spent input UTXO detected.") from tfe
-            else:
-                logger.error(f"Unhandled submit error: {error_json}")
-                raise GenericSubmitError("Unhandled submit error occurred.") from tfe
-            
+            try:
+                final_tx = _build_and_sign_checked(builder, signers, address)
+            except (InsufficientUTxOBalanceException, UTxOSelectionException) as e:
+                logger.debug(f"Insufficient UTXO balance for transaction {transaction_id}")
+                raise InsufficientUTxOBalanceException(f"Insufficient UTXO balance for transaction {transaction_id}") from e
+        else:
+            logger.error(f"No UTXOs available to cover transaction {transaction_id}")
+            raise InsufficientUTxOBalanceException(f"No UTXOs available to cover transaction {transaction_id}")
+
+    logger.debug(f"Final transaction body: {final_tx.transaction_body}")
+    logger.debug(f"Data hash: {final_tx.transaction_body.script_data_hash}")
+    logger.debug(f"final_tx: {final_tx}")
+
+    return final_tx
+
+
+def _submit(context, tx, final_tx) -> str:
+    try:
+        tx_hash = context.submit_tx(final_tx.to_cbor())
+        logger.info(f"Transaction {tx.id} submitted successfully: {tx_hash}")
+        return tx_hash
+
+    except TransactionFailedException as tfe:
+        error_json = str(tfe)
+        # logger.error(f"Transaction submission failed: {error_json}")
+
+        if "BadInputsUTxO" in error_json:
+            raise BadInputsError("Bad or spent input UTXO detected.") from tfe
+        elif "ValueNotConservedUTxO" in error_json:
+            raise ValueNotConservedError("Value not conserved between inputs and outputs.") from tfe
+        else:
+            logger.error(f"Unhandled submit error: {error_json}")
+            raise GenericSubmitError("Unhandled submit error occurred.") from tfe
+
+
+def _record_submission(session, txs, final_tx, tx_hash, address, utxo_index) -> None:
+    """
+    Mark every row in `txs` as submitted and add the outputs paying back to
+    the wallet (change) to `utxo_index`, so they can be spent right away.
 
+    Rows sharing a batched transaction get a common batch_id; each records
+    the full tx_hash and tx_size and its share of the fee.
+    """
+    final_body = final_tx.transaction_body
+    tx_size = len(final_tx.to_cbor())
+    batch_id = uuid4() if len(txs) > 1 else None
+    fee_share, fee_remainder = divmod(final_body.fee, len(txs))
+
+    for position, tx in enumerate(txs):
         tx.status = "submitted"
         tx.error_message = None
         tx.tx_hash = tx_hash
-        tx.tx_fee = final_body.fee
-        tx.tx_size = len(final_tx.to_cbor())
+        tx.tx_fee = fee_share + (fee_remainder if position == 0 else 0)
+        tx.tx_size = tx_size
+        tx.batch_id = batch_id
         tx.updated_at = datetime.utcnow()
-        session.commit()
+    session.commit()
+    announce_submitted(tx_hash)
 
-        new_utxos = []
+    new_utxos = []
 
-        logger.debug(f"Available UTXOs: {len(available_utxos)}")
-        logger.debug(f"Available UTXOs: {available_utxos}")
+    for i, output in enumerate(final_body.outputs):
+        if output.address == Address.from_primitive(address):
+            amounts = {"lovelace": output.amount.coin}
+            if output.amount.multi_asset:
+                for policy_id, assets in output.amount.multi_asset.items():
+                    for asset_name, qty in assets.items():
+                        unit = policy_id.to_primitive().hex() + asset_name.to_primitive().hex()
+                        amounts[unit] = qty
+            new_utxos.append({
+                "tx_hash": tx_hash,
+                "tx_index": i,
+                "amounts": amounts
+            })
 
-        for i, output in enumerate(final_tx.transaction_body.outputs):
-            if output.address == Address.from_primitive(address):
-                amounts = {"lovelace": output.amount.coin}
-                if output.amount.multi_asset:
-                    for policy_id, assets in output.amount.multi_asset.items():
-                        for asset_name, qty in assets.items():
-                            unit = policy_id.to_primitive().hex() + asset_name.to_primitive().hex()
-                            amounts[unit] = qty
-                new_utxos.append({
-                    "tx_hash": tx_hash,
-                    "tx_index": i,
-                    "amounts": amounts
-                })
 
+    logger.debug(f"len new_utxos: {len(new_utxos)}")
+    logger.debug(f"new_utxos: {new_utxos}")
 
-        logger.debug(f"len new_utxos: {len(new_utxos)}")
-        logger.debug(f"new_utxos: {new_utxos}")
+    for utxo in new_utxos:
+        utxo_index.add(utxo)
 
 
-        available_utxos.extend(new_utxos)
-        set_utxos_to_cache(address, available_utxos)
+def _process_group(session, txs, address, payment_skey, context, utxo_index) -> None:
+    """
+    Build, submit and record one on-chain transaction for `txs`.
+    """
+    # The build takes inputs out of the index: don't reuse it if this fails
+    _utxo_indexes.pop(address, None)
+    final_tx = _build_and_sign(BuildPlan(txs), address, payment_skey, context, utxo_index)
+    tx_hash = _submit(context, txs[0], final_tx)
+    if len(txs) > 1:
+        logger.info(f"Batched {len(txs)} transactions into {tx_hash}")
+    _record_submission(session, txs, final_tx, tx_hash, address, utxo_index)
 
-        logger.debug(f"Available UTXOs: {len(available_utxos)}")
-        logger.debug(f"Available UTXOs: {available_utxos}")
+    available_utxos = list(utxo_index)
+    _keep_utxo_index(address, set_utxos_to_cache(address, available_utxos, fresh=False), utxo_index)
 
-    except ValueNotConservedError as e:
-        logger.error(f"Transaction {transaction_id} failed due to value not conserved: {str(e)}")
-        tx.status = "queued"
-        tx.error_message = str(e)
-        tx.retries += 1
-        tx.updated_at = datetime.utcnow()
-        session.commit()
-        enqueue_transaction(transaction_id)
+    logger.debug(f"Available UTXOs: {len(available_utxos)}")
+    logger.debug(f"Available UTXOs: {available_utxos}")
 
-    except BadInputsError as e:
-        logger.error(f"Transaction {transaction_id} failed due to bad inputs: {str(e)}")
-        tx.status = "queued"
-        tx.retries += 1
-        tx.error_message = str(e)
-        tx.updated_at = datetime.utcnow()
-        session.commit()
 
-        time.sleep(60)
-        reload_utxos(address)
-        enqueue_transaction(transaction_id)
+def retry_delay(e: Exception, attempt: int) -> float:
+    """
+    Seconds to wait before retry number `attempt` (1-based) after `e`:
+    exponential backoff from a base per error class, with equal jitter so
+    rows that failed together don't all come back at once.
+    """
+    # Bad inputs: give the node and Blockfrost time to agree on our UTxOs again
+    base = settings.TX_RETRY_BAD_INPUTS_BASE_SECONDS if isinstance(e, BadInputsError) else settings.TX_RETRY_BASE_SECONDS
+    ceiling = min(settings.TX_RETRY_MAX_SECONDS, base * 2 ** (attempt - 1))
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
 
-    except GenericSubmitError as e:
-        logger.error(f"Transaction {transaction_id} failed due to generic submit error: {str(e)}")
+def _handle_processing_error(session, txs, address, e) -> None:
+    """
+    Record a failed attempt on every row in `txs` (one row, or a payout batch)
+    and schedule their retry with a countdown (see retry_delay), or mark them
+    failed once they ran out of retries. The worker moves on to other work
+    in the meantime.
+    """
+    session.rollback()
+    if not txs:
+        logger.error(f"Transaction processing failed before the transaction was loaded: {str(e)}")
+        logger.error(traceback.format_exc())
+        return
 
-        if tx.retries <= 5:
+    for tx in txs:
+        if isinstance(e, ValueNotConservedError):
+            logger.error(f"Transaction {tx.id} failed due to value not conserved: {str(e)}")
+        elif isinstance(e, BadInputsError):
+            logger.error(f"Transaction {tx.id} failed due to bad inputs: {str(e)}")
+        elif isinstance(e, GenericSubmitError):
+            logger.error(f"Transaction {tx.id} failed due to generic submit error: {str(e)}")
+        elif isinstance(e, InsufficientUTxOBalanceException):
+            logger.error(f"Transaction {tx.id} failed due to insufficient UTXO balance: {str(e)}")
+        else:
+            logger.error(f"Transaction {tx.id} failed: {str(e)}")
+            logger.error(traceback.format_exc())
+
+    # Rows of a batch are retried together
+    delay = retry_delay(e, max(tx.retries for tx in txs) + 1)
+    now = datetime.utcnow()
+    retrying = []
+    for tx in txs:
+        tx.error_message = str(e)
+        tx.updated_at = now
+        if tx.retries < settings.TX_MAX_RETRIES:
             tx.status = "queued"
             tx.retries += 1
-            session.commit()
-            enqueue_transaction(transaction_id)
+            tx.next_attempt_at = now + timedelta(seconds=delay)
+            retrying.append(tx)
         else:
             tx.status = "failed"
-            tx.error_message = str(e)
-            tx.updated_at = datetime.utcnow()
-            session.commit()
+            metrics.incr("tx.failed")
 
-    except InsufficientUTxOBalanceException as e:
-        logger.error(f"Transaction {transaction_id} failed due to insufficient UTXO balance: {str(e)}")
+    if isinstance(e, BadInputsError):
+        # The ledger may have missed a spend too: rebuild it from Blockfrost
+        request_resync(session, address)
+    session.commit()
 
-        if tx.retries <= 5:
-            tx.status = "queued"
-            tx.retries += 1
-            session.commit()
-            enqueue_transaction(transaction_id)
-        else:
+    if isinstance(e, BadInputsError):
+        # Reloaded by the retry, once the spends have settled
+        invalidate_utxo_cache(address)
+
+    if not retrying:
+        return
+    metrics.incr(f"tx.retry.{type(e).__name__}", len(retrying))
+    logger.info(f"Retrying {len(retrying)} transaction(s) in {delay:.0f}s")
+    if settings.TX_CHAINING_ENABLED or settings.TX_BATCHING_ENABLED:
+        retrying = retrying[:1]  # one chain task picks them all up
+    for tx in retrying:
+        dispatch_transaction(str(tx.id), tx.wallet_id, countdown=delay)
+
+
+@celery.task(name="heron_app.workers.tasks.process_transaction", bind=True)
+def process_transaction(self, transaction_id):
+
+
+    context = _get_blockfrost_context()
+    
+    logger.info(f"Processing transaction {transaction_id}")
+
+    session = SessionLocal()
+    tx = None
+    address = None
+    lock = None
+    try:
+        tx = hydrated_transactions(session).filter(Transaction.id == transaction_id).first()
+        if not tx:
+            return
+        if tx.status != "queued":
+            logger.info(f"Transaction {transaction_id} is {tx.status}, skipping")
+            return
+        wait = _seconds_until(tx.next_attempt_at)
+        if wait > 0:
+            # Early (startup requeue or a duplicate message): come back when due
+            logger.info(f"Transaction {transaction_id} is backing off, retrying in {wait:.0f}s")
+            dispatch_transaction(transaction_id, tx.wallet_id, countdown=wait)
+            return
+        wallet = tx.wallet
+        if not wallet:
             tx.status = "failed"
-            tx.error_message = str(e)
-            tx.updated_at = datetime.utcnow()
             session.commit()
+            return
+
+        lock = acquire_wallet_lock(wallet.id)
+        if lock is None:
+            logger.info(f"Wallet {wallet.id} is busy, retrying transaction {transaction_id} shortly")
+            dispatch_transaction(transaction_id, wallet.id, countdown=settings.WALLET_LOCK_RETRY_SECONDS)
+            return
+
+        address = wallet.address
+        utxo_index = _utxo_index(wallet, transaction_id)
+        payment_skey = _derive_payment_skey(wallet)
+
+        _process_group(session, [tx], address, payment_skey, context, utxo_index)
 
     except Exception as e:
-        logger.error(f"Transaction {transaction_id} failed: {str(e)}")
-        logger.error(traceback.format_exc())
-     
-        if tx.retries <= 5:
-            tx.status = "queued"
-            tx.retries += 1
-            session.commit()
-            enqueue_transaction(transaction_id)
-        else:
-            tx.status = "failed"
-            tx.error_message = str(e)
-            tx.updated_at = datetime.utcnow()
-            session.commit()
+        _handle_processing_error(session, [tx] if tx else [], address, e)
 
     finally:
+        release_wallet_lock(lock)
         session.close()
         logger.info(f"Finished processing transaction {transaction_id}")
+
+
+def _seconds_until(when: Optional[datetime]) -> float:
+    return (when - datetime.utcnow()).total_seconds() if when else 0
+
+
+def _is_batchable(tx) -> bool:
+    """
+    Plain payouts (no metadata, no mints) can share an on-chain transaction.
+    """
+    return not tx.metadata_json and not tx.mints
+
+
+def _plan_groups(pending) -> List[List[Transaction]]:
+    """
+    Split the wallet's pending rows into on-chain transactions: consecutive
+    batchable rows are coalesced up to TX_BATCH_MAX_SIZE when batching is
+    enabled, everything else gets a transaction of its own.
+    """
+    groups: List[List[Transaction]] = []
+    for tx in pending:
+        if (
+            settings.TX_BATCHING_ENABLED
+            and groups
+            and len(groups[-1]) < settings.TX_BATCH_MAX_SIZE
+            and _is_batchable(groups[-1][-1])
+            and _is_batchable(tx)
+        ):
+            groups[-1].append(tx)
+        else:
+            groups.append([tx])
+    return groups
+
+
+@celery.task(name="heron_app.workers.tasks.process_wallet_chain", bind=True)
+def process_wallet_chain(self, wallet_id):
+    """
+    Chaining mode: build and submit the wallet's queued transactions back to
+    back, oldest first, each one able to spend the change of the one before
+    it without waiting for confirmation. Keys, chain context and the UTxO
+    index are set up once for the whole chain.
+
+    With batching enabled, runs of plain payouts are coalesced into a single
+    on-chain transaction. A batch that exceeds max_tx_size is split in half
+    and retried.
+
+    A chain takes at most TX_CHAIN_MAX_LENGTH transactions (times
+    TX_BATCH_MAX_SIZE rows with batching); when it was full the task sends
+    itself again for the wallet's remaining queued rows.
+    """
+
+    context = _get_blockfrost_context()
+
+    logger.info(f"Processing transaction chain for wallet {wallet_id}")
+
+    session = SessionLocal()
+    lock = None
+    more = False
+    resume_in = None
+    try:
+        wallet = session.query(Wallet).filter(Wallet.id == wallet_id).first()
+        if not wallet:
+            return
+
+        lock = acquire_wallet_lock(wallet.id)
+        if lock is None:
+            logger.info(f"Wallet {wallet_id} is busy, retrying chain shortly")
+            process_wallet_chain.apply_async(
+                args=[str(wallet_id)], queue=wallet_queue(wallet_id), countdown=settings.WALLET_LOCK_RETRY_SECONDS
+            )
+            return
+
+        limit = settings.TX_CHAIN_MAX_LENGTH
+        if settings.TX_BATCHING_ENABLED:
+            limit *= settings.TX_BATCH_MAX_SIZE
+
+        due = or_(Transaction.next_attempt_at.is_(None), Transaction.next_attempt_at <= datetime.utcnow())
+        pending = (
+            hydrated_transactions(session)
+            .filter(Transaction.wallet_id == wallet.id, Transaction.status == "queued", due)
+            .order_by(Transaction.created_at)
+            .limit(limit)
+            .all()
+        )
+        if not pending:
+            # Rows backing off get a chain when they are due, also when their
+            # scheduled one was lost (e.g. requeued at startup)
+            next_attempt_at = session.scalar(
+                select(func.min(Transaction.next_attempt_at))
+                .where(Transaction.wallet_id == wallet.id, Transaction.status == "queued")
+            )
+            wait = _seconds_until(next_attempt_at)
+            if wait > 0:
+                process_wallet_chain.apply_async(args=[str(wallet_id)], queue=wallet_queue(wallet_id), countdown=wait)
+            return
+
+        address = wallet.address
+        payment_skey = None
+        utxo_index = None
+        submitted = 0
+        groups = deque(_plan_groups(pending))
+
+        while groups:
+            # A long chain can outlast WALLET_LOCK_TIMEOUT_SECONDS
+            if not extend_wallet_lock(lock):
+                # Another task may be running the wallet now: leave the rest
+                # to whichever chain holds the lock next
+                resume_in = settings.WALLET_LOCK_RETRY_SECONDS
+                break
+            txs = groups.popleft()
+            try:
+                if utxo_index is None:
+                    utxo_index = _utxo_index(wallet, txs[0].id)
+                if payment_skey is None:
+                    payment_skey = _derive_payment_skey(wallet)
+
+                _process_group(session, txs, address, payment_skey, context, utxo_index)
+                submitted += len(txs)
+
+            except TransactionTooLargeError as e:
+                # Inputs selected for the oversized build were never spent.
+                utxo_index = None
+                if len(txs) == 1:
+                    _handle_processing_error(session, txs, address, e)
+                    continue
+                half = len(txs) // 2
+                logger.info(f"Batch of {len(txs)} exceeds max_tx_size, splitting into {half} + {len(txs) - half}")
+                groups.appendleft(txs[half:])
+                groups.appendleft(txs[:half])
+
+            except Exception as e:
+                _handle_processing_error(session, txs, address, e)
+                if isinstance(e, BadInputsError):
+                    # The rest of the chain would spend the view the node just
+                    # rejected: resume it after the reload. The failed group
+                    # comes back with its own retry, if it has any left.
+                    resume_in = retry_delay(e, 1)
+                    break
+                # Inputs selected for the failed build were never spent.
+                utxo_index = None
+
+        logger.info(f"Submitted {submitted}/{len(pending)} chained transactions for wallet {wallet_id}")
+        # A full chain may have left queued rows behind
+        more = len(pending) == limit and resume_in is None
+
+    finally:
+        release_wallet_lock(lock)
+        session.close()
+
+    if resume_in is not None:
+        logger.info(f"Chain for wallet {wallet_id} stopped early, resuming in {resume_in:.0f}s")
+        process_wallet_chain.apply_async(args=[str(wallet_id)], queue=wallet_queue(wallet_id), countdown=resume_in)
+    elif more:
+        logger.info(f"Chain for wallet {wallet_id} was full, continuing with its next queued transactions")
+        process_wallet_chain.apply_async(args=[str(wallet_id)], queue=wallet_queue(wallet_id))
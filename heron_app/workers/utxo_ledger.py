@@ -0,0 +1,269 @@
+import logging
+import os
+import time
+from typing import Iterable, List, Optional, Set, Tuple
+
+from blockfrost import ApiError
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+
+from heron_app.core.config import settings
+from heron_app.db.database import SessionLocal
+from heron_app.db.models.wallet import Wallet
+from heron_app.db.models.wallet_utxo import WalletUtxo
+from heron_app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _entry(utxo: WalletUtxo) -> dict:
+    return {"tx_hash": utxo.tx_hash, "tx_index": utxo.tx_index, "amounts": dict(utxo.amounts)}
+
+
+def _unspent(address: str):
+    return (
+        select(WalletUtxo)
+        .where(WalletUtxo.address == address, WalletUtxo.spent_slot.is_(None))
+        .order_by(WalletUtxo.tx_hash, WalletUtxo.tx_index)
+    )
+
+
+def _synced(address: str):
+    return select(Wallet.utxos_synced_slot).where(Wallet.address == address)
+
+
+def ledger_utxos(session, address: str) -> Optional[List[dict]]:
+    """
+    Unspent outputs of `address` from the local ledger (UTxO cache format),
+    or None if the ledger is disabled or doesn't cover the address yet.
+    """
+    if not settings.UTXO_LEDGER_ENABLED or session.scalar(_synced(address)) is None:
+        metrics.incr("utxo_ledger.miss")
+        return None
+    metrics.incr("utxo_ledger.hit")
+    return [_entry(utxo) for utxo in session.scalars(_unspent(address))]
+
+
+async def ledger_utxos_async(session, address: str) -> Optional[List[dict]]:
+    """
+    ledger_utxos for an AsyncSession.
+    """
+    if not settings.UTXO_LEDGER_ENABLED or await session.scalar(_synced(address)) is None:
+        metrics.incr("utxo_ledger.miss")
+        return None
+    metrics.incr("utxo_ledger.hit")
+    return [_entry(utxo) for utxo in await session.scalars(_unspent(address))]
+
+
+def request_resync(session, address: str) -> None:
+    """
+    Stop serving `address` from the ledger until the chain follower has
+    rebuilt it from a fresh Blockfrost snapshot. The caller commits.
+    """
+    session.execute(update(Wallet).where(Wallet.address == address).values(utxos_synced_slot=None))
+
+
+def _output_amounts(output: dict) -> dict:
+    amounts = {"lovelace": int(output.get("amount") or 0)}
+    for asset in output.get("assets") or []:
+        unit = asset["policy"] + asset["asset"]
+        amounts[unit] = amounts.get(unit, 0) + int(asset["amount"])
+    return amounts
+
+
+class UtxoLedger:
+    """
+    Local UTxO set of our synced wallet addresses, applied by the chain
+    follower from oura Transaction events (include_transaction_details):
+    outputs paying those addresses are added, inputs spending them are
+    marked spent, and a rollback undoes both for the blocks after it.
+
+    An address is served from the ledger once it has been synced from a
+    Blockfrost snapshot taken at or after the follower's tip; the events
+    the follower applies afterwards replay idempotently on top of it.
+    """
+
+    def __init__(self, api=None):
+        self.addresses: Optional[Set[str]] = None
+        self._synced_at = None
+        # Blockfrost client for snapshots; built on first use when not given
+        self._api = api
+
+    def _blockfrost_api(self):
+        if self._api is None:
+            if not os.getenv("BLOCKFROST_PROJECT_ID"):
+                raise RuntimeError("BLOCKFROST_PROJECT_ID is not set: wallets can't be synced into the UTxO ledger")
+            # Late import: heron_app.utils.cardano checks the Blockfrost configuration at import
+            from heron_app.utils.cardano import _get_blockfrost_api
+
+            self._api = _get_blockfrost_api()
+        return self._api
+
+    def _load_addresses(self, session) -> None:
+        self.addresses = set(session.scalars(select(Wallet.address).where(Wallet.utxos_synced_slot.isnot(None))))
+
+    def apply(self, session, transactions: Iterable[Tuple[str, dict, dict]]) -> Set[str]:
+        """
+        Apply (tx_hash, block, record) events in chain order: one INSERT for
+        the outputs to our addresses, one SELECT to find which inputs are
+        ours and an UPDATE per transaction spending them. Returns the
+        addresses whose UTxOs changed.
+        """
+        if not settings.UTXO_LEDGER_ENABLED:
+            return set()
+        if self.addresses is None:
+            # First batch after a restart: usually the catch-up backlog
+            self._load_addresses(session)
+        outputs, spends = [], {}
+        for tx_hash, block, record in transactions:
+            for index, output in enumerate(record.get("outputs") or []):
+                if output.get("address") in self.addresses:
+                    outputs.append({
+                        "tx_hash": tx_hash,
+                        "tx_index": index,
+                        "address": output["address"],
+                        "amounts": _output_amounts(output),
+                        "created_slot": block["slot"],
+                    })
+            for tx_input in record.get("inputs") or []:
+                spends[(tx_input["tx_id"], tx_input["index"])] = (block["slot"], tx_hash)
+
+        touched = {output["address"] for output in outputs}
+        if outputs:
+            session.execute(insert(WalletUtxo).values(outputs).on_conflict_do_nothing())
+            metrics.incr("utxo_ledger.outputs", len(outputs))
+        if spends:
+            # Almost all inputs on chain are someone else's: find ours first
+            ours = session.execute(
+                select(WalletUtxo.tx_hash, WalletUtxo.tx_index, WalletUtxo.address)
+                .where(tuple_(WalletUtxo.tx_hash, WalletUtxo.tx_index).in_(list(spends)), WalletUtxo.spent_slot.is_(None))
+            ).all()
+            by_spender = {}
+            for tx_hash, tx_index, address in ours:
+                by_spender.setdefault(spends[(tx_hash, tx_index)], []).append((tx_hash, tx_index))
+                touched.add(address)
+            for (slot, tx_hash), refs in by_spender.items():
+                session.execute(
+                    update(WalletUtxo)
+                    .where(tuple_(WalletUtxo.tx_hash, WalletUtxo.tx_index).in_(refs))
+                    .values(spent_slot=slot, spent_by=tx_hash)
+                    .execution_options(synchronize_session=False)
+                )
+            metrics.incr("utxo_ledger.spent", len(ours))
+        return touched
+
+    def roll_back(self, session, slot: int) -> Set[str]:
+        """
+        Undo the blocks after `slot`. Returns the addresses whose UTxOs may
+        have changed.
+
+        Snapshot rows have no created_slot to undo them by, so addresses
+        snapshotted after `slot` are resynced instead: their snapshot may
+        hold outputs of the blocks rolled back.
+        """
+        if not settings.UTXO_LEDGER_ENABLED:
+            return set()
+        if self.addresses is None:
+            self._load_addresses(session)
+        touched = set(self.addresses)
+        session.execute(delete(WalletUtxo).where(WalletUtxo.created_slot > slot))
+        session.execute(
+            update(WalletUtxo)
+            .where(WalletUtxo.spent_slot > slot)
+            .values(spent_slot=None, spent_by=None)
+            .execution_options(synchronize_session=False)
+        )
+        resynced = session.execute(
+            update(Wallet).where(Wallet.utxos_synced_slot > slot).values(utxos_synced_slot=None)
+        ).rowcount
+        if resynced:
+            logger.info(f"Rollback to slot {slot} is below the snapshot of {resynced} wallet(s); resyncing them")
+            # Reloaded by the next batch, from this transaction or, if it
+            # fails, from the last committed one
+            self.addresses = None
+            self._synced_at = None
+        return touched
+
+    def prune(self, session, slot: int) -> None:
+        """
+        Forget outputs spent before `slot`, the oldest block that can still
+        be rolled back.
+        """
+        if settings.UTXO_LEDGER_ENABLED:
+            session.execute(delete(WalletUtxo).where(WalletUtxo.spent_slot < slot))
+
+    def sync(self, tip: Optional[dict]) -> None:
+        """
+        Every UTXO_LEDGER_SYNC_INTERVAL_SECONDS: reload the synced addresses
+        and snapshot up to UTXO_LEDGER_SYNC_BATCH wallets that aren't synced
+        yet (new wallets, or after request_resync) from Blockfrost.
+        """
+        if not settings.UTXO_LEDGER_ENABLED or tip is None:
+            return
+        now = time.monotonic()
+        if self._synced_at is not None and now - self._synced_at < settings.UTXO_LEDGER_SYNC_INTERVAL_SECONDS:
+            return
+        self._synced_at = now
+
+        # Runs after the batch was applied: never fail the batch for it
+        session = SessionLocal()
+        try:
+            pending = session.scalars(
+                select(Wallet.address).where(Wallet.utxos_synced_slot.is_(None)).limit(settings.UTXO_LEDGER_SYNC_BATCH)
+            ).all()
+            for address in pending:
+                try:
+                    self._snapshot(session, address, tip)
+                except Exception as e:
+                    logger.warning(
+                        f"UTxO ledger sync of {address} failed, retrying in {settings.UTXO_LEDGER_SYNC_INTERVAL_SECONDS}s: {e}"
+                    )
+            # Also after failed snapshots: the ones that succeeded are served now
+            self._load_addresses(session)
+        except Exception as e:
+            logger.warning(f"UTxO ledger sync failed, retrying in {settings.UTXO_LEDGER_SYNC_INTERVAL_SECONDS}s: {e}")
+        finally:
+            session.close()
+
+    def _snapshot(self, session, address: str, tip: dict) -> None:
+        api = self._blockfrost_api()
+        latest = api.block_latest()
+        if latest.slot < tip["slot"]:
+            # Blockfrost is behind the follower: events in between would be lost
+            logger.info(f"Blockfrost at slot {latest.slot} is behind the chain tip {tip['slot']}; syncing later")
+            return
+
+        try:
+            utxos, page = [], 1
+            while True:
+                batch = api.address_utxos(address=address, count=100, page=page)
+                utxos.extend(batch)
+                if len(batch) < 100:
+                    break
+                page += 1
+        except ApiError as e:
+            if e.status_code != 404:  # 404: address never used
+                raise
+            utxos = []
+
+        try:
+            session.execute(delete(WalletUtxo).where(WalletUtxo.address == address))
+            if utxos:
+                session.execute(insert(WalletUtxo).values([
+                    {
+                        "tx_hash": utxo.tx_hash,
+                        "tx_index": utxo.tx_index,
+                        "address": address,
+                        "amounts": {amt.unit: int(amt.quantity) for amt in utxo.amount},
+                        "created_slot": None,
+                    }
+                    for utxo in utxos
+                ]).on_conflict_do_nothing())
+            session.execute(update(Wallet).where(Wallet.address == address).values(utxos_synced_slot=latest.slot))
+            session.commit()
+            metrics.incr("utxo_ledger.synced")
+            logger.info(f"Synced {len(utxos)} UTxO(s) of {address} into the ledger at slot {latest.slot}")
+        except Exception:
+            session.rollback()
+            raise
+
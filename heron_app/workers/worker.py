@@ -11,4 +11,5 @@ celery = Celery(
 celery.conf.task_queues = []
 celery.conf.task_routes = {}
 
-from heron_app.workers import tasks 
\ No newline at end of file
+from heron_app.workers import tasks
+from heron_app.workers import liveness  # noqa: F401  (heartbeat signal handlers)
@@ -1,22 +1,15 @@
 from logging.config import fileConfig
-import os
 from sqlalchemy import engine_from_config, pool # type: ignore
 from alembic import context # type: ignore
-from dotenv import load_dotenv
 
+from heron_app.core.config import settings
 from heron_app.db.database import Base
-from heron_app.db.models import wallet, transaction, transaction_output, transaction_output_asset, minting_policies
-
-load_dotenv()
+from heron_app.db.models import wallet, transaction, transaction_output, transaction_output_asset, minting_policies, chain_block, wallet_utxo
 
 config = context.config
 
-POSTGRES_USER = os.getenv("POSTGRES_USER", "postgres")
-POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
-
-SQLALCHEMY_DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@db:5432/heron_db"
-
-config.set_main_option("sqlalchemy.url", SQLALCHEMY_DATABASE_URL)
+# Same database as the app (DB_HOST/DB_PORT); "%" is escaped for the ini interpolation
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("%", "%%"))
 
 fileConfig(config.config_file_name)
 
@@ -0,0 +1,38 @@
+"""add wallet_utxos
+
+Revision ID: 3f8b2e7a9c14
+Revises: e4a9d6c31b72
+Create Date: 2026-10-18 19:21:55.718420
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision = '3f8b2e7a9c14'
+down_revision = 'e4a9d6c31b72'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('wallet_utxos',
+    sa.Column('tx_hash', sa.String(), nullable=False),
+    sa.Column('tx_index', sa.Integer(), nullable=False),
+    sa.Column('address', sa.String(), nullable=False),
+    sa.Column('amounts', sa.JSON(), nullable=False),
+    sa.Column('created_slot', sa.BigInteger(), nullable=True),
+    sa.Column('spent_slot', sa.BigInteger(), nullable=True),
+    sa.Column('spent_by', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('tx_hash', 'tx_index')
+    )
+    op.create_index(op.f('ix_wallet_utxos_address'), 'wallet_utxos', ['address'], unique=False)
+    op.add_column('wallets', sa.Column('utxos_synced_slot', sa.BigInteger(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('wallets', 'utxos_synced_slot')
+    op.drop_index(op.f('ix_wallet_utxos_address'), table_name='wallet_utxos')
+    op.drop_table('wallet_utxos')
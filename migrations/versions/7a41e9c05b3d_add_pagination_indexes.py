@@ -0,0 +1,41 @@
+"""add pagination indexes
+
+Revision ID: 7a41e9c05b3d
+Revises: c5d83a1f6e27
+Create Date: 2026-10-18 22:17:48.204611
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision = '7a41e9c05b3d'
+down_revision = 'c5d83a1f6e27'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns) of the (created_at, id) keyset pagination indexes
+INDEXES = [
+    ('ix_transactions_created_at_id', 'transactions', ['created_at', 'id']),
+    ('ix_transactions_wallet_id_created_at_id', 'transactions', ['wallet_id', 'created_at', 'id']),
+    ('ix_transactions_status_created_at_id', 'transactions', ['status', 'created_at', 'id']),
+    ('ix_wallets_created_at_id', 'wallets', ['created_at', 'id']),
+    ('ix_minting_policies_created_at_id', 'minting_policies', ['created_at', 'id']),
+]
+
+
+def upgrade():
+    # Drop first: a failed concurrent build leaves an INVALID index behind
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,25 @@
+"""add transaction batch_id
+
+Revision ID: 9c2e51a7d3f0
+Revises: 4df5bb9ac58b
+Create Date: 2026-10-18 09:12:40.118274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision = '9c2e51a7d3f0'
+down_revision = '4df5bb9ac58b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('transactions', sa.Column('batch_id', sa.UUID(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('transactions', 'batch_id')
@@ -0,0 +1,29 @@
+"""add transaction block fields
+
+Revision ID: b71f0c2d8e45
+Revises: 9c2e51a7d3f0
+Create Date: 2026-10-18 14:03:27.561903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision = 'b71f0c2d8e45'
+down_revision = '9c2e51a7d3f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('transactions', sa.Column('block_hash', sa.String(), nullable=True))
+    op.add_column('transactions', sa.Column('block_height', sa.Integer(), nullable=True))
+    op.add_column('transactions', sa.Column('block_slot', sa.BigInteger(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('transactions', 'block_slot')
+    op.drop_column('transactions', 'block_height')
+    op.drop_column('transactions', 'block_hash')
@@ -0,0 +1,53 @@
+"""add hot query indexes
+
+Revision ID: c5d83a1f6e27
+Revises: 3f8b2e7a9c14
+Create Date: 2026-10-18 21:04:12.530917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d83a1f6e27'
+down_revision = '3f8b2e7a9c14'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns, partial index predicate)
+INDEXES = [
+    ('ix_transactions_tx_hash', 'transactions', ['tx_hash'], None),
+    ('ix_transactions_queued', 'transactions', ['wallet_id', 'created_at'], "status = 'queued'"),
+    ('ix_transactions_in_flight', 'transactions', ['created_at'], "status IN ('submitted', 'on_chain')"),
+    ('ix_transactions_on_chain_height', 'transactions', ['block_height'], "status = 'on_chain'"),
+    ('ix_transactions_block_slot', 'transactions', ['block_slot'], "block_slot IS NOT NULL"),
+    ('ix_transaction_outputs_transaction_id', 'transaction_outputs', ['transaction_id'], None),
+    ('ix_transaction_output_assets_output_id', 'transaction_output_assets', ['output_id'], None),
+    ('ix_transaction_mints_transaction_id', 'transaction_mints', ['transaction_id'], None),
+    ('ix_wallet_utxos_created_slot', 'wallet_utxos', ['created_slot'], "created_slot IS NOT NULL"),
+    ('ix_wallet_utxos_spent_slot', 'wallet_utxos', ['spent_slot'], "spent_slot IS NOT NULL"),
+]
+
+
+def upgrade():
+    # CONCURRENTLY keeps the tables writable while the indexes build, but
+    # can't run inside the migration's transaction. A failed concurrent
+    # build leaves an INVALID index behind: drop it first so a re-run
+    # rebuilds it instead of skipping it
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
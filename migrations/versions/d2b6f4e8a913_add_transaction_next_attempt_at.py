@@ -0,0 +1,25 @@
+"""add transaction next_attempt_at
+
+Revision ID: d2b6f4e8a913
+Revises: 7a41e9c05b3d
+Create Date: 2026-10-18 23:02:31.671045
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2b6f4e8a913'
+down_revision = '7a41e9c05b3d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('transactions', sa.Column('next_attempt_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('transactions', 'next_attempt_at')
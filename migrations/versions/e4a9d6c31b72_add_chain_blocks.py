@@ -0,0 +1,31 @@
+"""add chain_blocks
+
+Revision ID: e4a9d6c31b72
+Revises: b71f0c2d8e45
+Create Date: 2026-10-18 16:47:09.302816
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a9d6c31b72'
+down_revision = 'b71f0c2d8e45'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('chain_blocks',
+    sa.Column('slot', sa.BigInteger(), nullable=False),
+    sa.Column('hash', sa.String(), nullable=False),
+    sa.Column('height', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('slot')
+    )
+
+
+def downgrade():
+    op.drop_table('chain_blocks')
@@ -3,6 +3,9 @@ import psycopg2
 import requests
 from jinja2 import Template
 
+from heron_app.core.config import settings
+from heron_app.utils.rate_limiter import get_blockfrost_limiter
+
 # Configuration
 POSTGRES_USER = os.getenv("POSTGRES_USER", "postgres")
 POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
@@ -20,7 +23,7 @@ def get_pending_transaction_hash():
     cur = conn.cursor()
     cur.execute("""
         SELECT tx_hash FROM transactions
-        WHERE status = 'submitted'
+        WHERE status IN ('submitted', 'on_chain')
         ORDER BY created_at ASC LIMIT 1
     """)
     row = cur.fetchone()
@@ -29,12 +32,49 @@ def get_pending_transaction_hash():
     return row[0] if row else None
 
 
+def get_intersect_points():
+    """
+    Restart candidates from the chain follower's block history, newest
+    first: its tip, then the blocks 1, 2, 4, 8, ... behind it and the oldest
+    one kept, so oura intersects quickly even if recent blocks were rolled
+    back while it was down.
+    """
+    conn = psycopg2.connect(DB_URL)
+    cur = conn.cursor()
+    cur.execute("""
+        WITH recent AS (
+            SELECT slot, hash, ROW_NUMBER() OVER (ORDER BY slot DESC) - 1 AS depth
+            FROM chain_blocks
+        )
+        SELECT slot, hash FROM recent
+        WHERE depth = 0
+           OR depth & (depth - 1) = 0
+           OR depth = (SELECT MAX(depth) FROM recent)
+        ORDER BY slot DESC
+    """)
+    rows = cur.fetchall()
+    cur.close()
+    conn.close()
+    return rows
+
+
+def blockfrost_get(url, headers):
+    # Shares the API's and workers' Blockfrost rate limit
+    limiter = get_blockfrost_limiter()
+    for attempt in range(settings.BLOCKFROST_429_RETRIES + 1):
+        limiter.acquire()
+        response = requests.get(url, headers=headers)
+        if response.status_code != 429 or attempt == settings.BLOCKFROST_429_RETRIES:
+            return response
+        limiter.throttled()
+
+
 def fetch_earlier_block_point(tx_hash, steps_back=10):
     headers = {"project_id": BLOCKFROST_API_KEY}
 
     # Step 1: Get the block hash for the transaction
     tx_url = f"https://cardano-{network}.blockfrost.io/api/v0/txs/{tx_hash}"
-    tx_response = requests.get(tx_url, headers=headers)
+    tx_response = blockfrost_get(tx_url, headers)
     if tx_response.status_code != 200:
         raise Exception(f"❌ Failed to fetch tx info from Blockfrost: {tx_response.text}")
     block_hash = tx_response.json()["block"]
@@ -43,7 +83,7 @@ def fetch_earlier_block_point(tx_hash, steps_back=10):
     current_hash = block_hash
     for _ in range(steps_back):
         block_url = f"https://cardano-{network}.blockfrost.io/api/v0/blocks/{current_hash}"
-        block_response = requests.get(block_url, headers=headers)
+        block_response = blockfrost_get(block_url, headers)
         if block_response.status_code != 200:
             raise Exception(f"❌ Failed to fetch block info: {block_response.text}")
         block_data = block_response.json()
@@ -53,38 +93,53 @@ def fetch_earlier_block_point(tx_hash, steps_back=10):
 
     # Step 3: Get slot of final block
     final_block_url = f"https://cardano-{network}.blockfrost.io/api/v0/blocks/{current_hash}"
-    final_response = requests.get(final_block_url, headers=headers)
+    final_response = blockfrost_get(final_block_url, headers)
     if final_response.status_code != 200:
         raise Exception(f"❌ Failed to fetch final block info: {final_response.text}")
     final_data = final_response.json()
     return final_data["slot"], current_hash
 
 
-def render_oura_config(starting_point_type, slot=None, block_hash=None):
+def render_oura_config(starting_point_type, slot=None, block_hash=None, points=None):
     with open(OURA_TEMPLATE_PATH, "r") as f:
         template = Template(f.read())
 
     rendered = template.render(
         starting_point_type=starting_point_type,
         slot=slot,
-        block_hash=block_hash
+        block_hash=block_hash,
+        points=points or [],
     )
 
     with open(OURA_CONFIG_PATH, "w") as f:
         f.write(rendered)
-    print(f"✅ Oura config written with start: {starting_point_type} {slot or ''} {block_hash or ''}")
+    print(f"✅ Oura config written with start: {starting_point_type} {slot or ''} {block_hash or ''} {points or ''}")
+
+
+def remove_cursor():
+    # oura prefers its cursor over the configured intersect
+    if os.path.exists("/app/oura/cursor"):
+        os.remove("/app/oura/cursor")
+        print("🗑️ Removed /cursor file")
 
 
 def main():
+    points = get_intersect_points()
+    if points:
+        print(f"📦 Resuming from the chain follower's tip: [ {points[0][0]}, \"{points[0][1]}\" ] ({len(points)} candidates)")
+        remove_cursor()
+        render_oura_config("Fallbacks", points=points)
+        return
+
+    # No block history yet (first start with the chain follower): rewind
+    # from the oldest pending transaction through Blockfrost.
     tx_hash = get_pending_transaction_hash()
 
     if tx_hash:
         print(f"🔍 Found pending tx: {tx_hash}")
         slot, block_hash = fetch_earlier_block_point(tx_hash, steps_back=10)
 
-        if os.path.exists("/app/oura/cursor"):
-            os.remove("/app/oura/cursor")
-            print("🗑️ Removed /cursor file")
+        remove_cursor()
         print(f"📦 Using Point: [ {slot}, \"{block_hash}\" ]")
         render_oura_config("Point", slot, block_hash)
     else:
@@ -0,0 +1,258 @@
+"""
+Benchmark: query plans and latencies of the hot database lookups (chain
+follower, pending tx hashes, oura intersect, startup requeue, batching,
+build hydration, UTxO ledger) with and without the secondary indexes
+declared on the models.
+
+Seeds a throwaway `heron_bench` schema (dropped and recreated, the real
+tables are not touched) with --transactions rows, mostly confirmed history
+plus a small recent tail of queued/submitted/on_chain rows, two outputs and
+assets per row and a mint every 50 rows. Each query then runs --repeat
+times under EXPLAIN (ANALYZE, BUFFERS); writes are rolled back. Reports the
+median/p95 server execution time and the scans of the last plan.
+
+With --baseline (a previous --output file) the run fails when a query got
+more than --max-slowdown times slower with the indexes, or started
+sequentially scanning a table it didn't before.
+
+Needs a reachable Postgres (DATABASE_URL from the settings by default).
+
+Usage:
+    PYTHONPATH=. python scripts/benchmark_queries.py [--transactions 1000000]
+        [--wallets 100] [--repeat 20] [--output plans.json] [--baseline plans.json]
+"""
+import argparse
+import hashlib
+import json
+import statistics
+import sys
+
+from sqlalchemy import create_engine, text
+
+import heron_app.db  # noqa: F401  (registers the models)
+from heron_app.core.config import settings
+from heron_app.db.database import Base
+
+SCHEMA = "heron_bench"
+RECENT = 2000  # rows at the tip that aren't confirmed yet
+SLACK_MS = 1.0  # sub-millisecond queries are too noisy to compare by ratio
+
+
+def seed(conn, transactions, wallets):
+    params = {"n": transactions, "w": wallets, "recent": transactions - RECENT}
+    conn.execute(text("""
+        INSERT INTO wallets (id, name, address, encrypted_root_key, created_at, utxos_synced_slot)
+        SELECT md5('w' || i)::uuid, 'bench-' || i, 'addr_bench_' || i, 'x', now(), 0
+        FROM generate_series(1, :w) i
+    """), params)
+    conn.execute(text("""
+        INSERT INTO minting_policies (id, name, policy_id, encrypted_policy_skey, created_at)
+        VALUES (md5('p')::uuid, 'bench', repeat('ab', 28), 'x', now())
+    """))
+    conn.execute(text("""
+        INSERT INTO transactions (id, numeric_id, wallet_id, status, tx_hash, created_at, updated_at,
+                                  retries, block_hash, block_height, block_slot)
+        SELECT md5('t' || i)::uuid, i, md5('w' || (i % :w + 1))::uuid, s.status,
+               CASE WHEN s.status IN ('queued', 'failed') THEN NULL ELSE md5('h' || i) || md5('H' || i) END,
+               now() - make_interval(secs => :n - i), now(), 0,
+               CASE WHEN s.included THEN md5('b' || i / 10) END,
+               CASE WHEN s.included THEN i / 10 END,
+               CASE WHEN s.included THEN i END
+        FROM generate_series(1, :n) i,
+        LATERAL (SELECT CASE
+                     WHEN i > :recent THEN (ARRAY['queued', 'submitted', 'on_chain', 'on_chain'])[i % 4 + 1]
+                     WHEN i % 50 = 0 THEN 'failed'
+                     ELSE 'confirmed'
+                 END AS status) st,
+        LATERAL (SELECT st.status, st.status IN ('on_chain', 'confirmed') AS included) s
+    """), params)
+    conn.execute(text("""
+        INSERT INTO transaction_outputs (id, transaction_id, address, created_at, updated_at)
+        SELECT 2 * i - k, i, 'addr_bench_out', now(), now()
+        FROM generate_series(1, :n) i, generate_series(0, 1) k
+    """), params)
+    conn.execute(text("""
+        INSERT INTO transaction_output_assets (id, output_id, unit, quantity, created_at, updated_at)
+        SELECT id, id, 'lovelace', '1000000', now(), now() FROM transaction_outputs
+    """))
+    conn.execute(text("""
+        INSERT INTO transaction_mints (id, transaction_id, policy_id, asset_name, quantity, created_at, updated_at)
+        SELECT i / 50, i, repeat('ab', 28), 'bench', 1, now(), now()
+        FROM generate_series(50, :n, 50) i
+    """), params)
+    conn.execute(text("""
+        INSERT INTO wallet_utxos (tx_hash, tx_index, address, amounts, created_slot, spent_slot, spent_by)
+        SELECT md5('u' || i) || md5('U' || i), 0, 'addr_bench_' || (i % :w + 1), '{"lovelace": 1000000}',
+               i * 10, CASE WHEN i % 3 = 0 THEN i * 10 + 5 END, CASE WHEN i % 3 = 0 THEN md5('s' || i) END
+        FROM generate_series(1, :n / 10) i
+    """), params)
+
+
+def _tx_hash(i):
+    # As seeded: md5('h' || i) || md5('H' || i)
+    return hashlib.md5(f"h{i}".encode()).hexdigest() + hashlib.md5(f"H{i}".encode()).hexdigest()
+
+
+def hot_queries(transactions):
+    """
+    (name, SQL, params) of the lookups that run per block, per submit or
+    per build, written as the code issues them.
+    """
+    recent = transactions - RECENT
+    # A block's worth of tx hashes: mostly someone else's, a few of ours
+    ours = [_tx_hash(i) for i in range(recent + 1, recent + 40) if i % 4 == 1][:5]  # 'submitted' rows
+    seen = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(300)] + ours
+    return [
+        ("pending hashes reload",
+         "SELECT tx_hash FROM transactions WHERE status = 'submitted' AND tx_hash IS NOT NULL", {}),
+        ("oura intersect tx (prepare_oura)",
+         "SELECT tx_hash FROM transactions WHERE status IN ('submitted', 'on_chain') "
+         "ORDER BY created_at ASC LIMIT 1", {}),
+        ("startup requeue",
+         "SELECT id FROM transactions WHERE status = 'queued'", {}),
+        ("wallet batch candidates",
+         "SELECT id FROM transactions WHERE wallet_id = md5('w1')::uuid AND status = 'queued' "
+         "ORDER BY created_at LIMIT 20", {}),
+        ("record inclusions",
+         "UPDATE transactions SET status = 'on_chain', block_slot = :slot, block_height = :height, block_hash = 'x' "
+         "WHERE tx_hash = ANY(:hashes) AND status = 'submitted'",
+         {"slot": transactions + 1, "height": transactions // 10 + 1, "hashes": seen}),
+        ("promote confirmed",
+         "UPDATE transactions SET status = 'confirmed', confirmed_at = now() "
+         "WHERE status = 'on_chain' AND block_height <= :height",
+         {"height": transactions // 10 - settings.TX_CONFIRMATION_DEPTH + 1}),
+        ("rollback revert",
+         "UPDATE transactions SET status = 'submitted', block_slot = NULL, block_height = NULL, block_hash = NULL "
+         "WHERE block_slot > :slot AND status IN ('on_chain', 'confirmed') RETURNING tx_hash",
+         {"slot": transactions - 100}),
+        ("hydrate outputs",
+         "SELECT * FROM transaction_outputs WHERE transaction_id = ANY(:ids)",
+         {"ids": list(range(recent + 4, recent + 84, 4))}),
+        ("hydrate output assets",
+         "SELECT * FROM transaction_output_assets WHERE output_id = ANY(:ids)",
+         {"ids": list(range(2 * recent, 2 * recent + 40))}),
+        ("hydrate mints",
+         "SELECT * FROM transaction_mints WHERE transaction_id = ANY(:ids)",
+         {"ids": list(range(recent, recent + 1000, 50))}),
+        ("ledger rollback",
+         "DELETE FROM wallet_utxos WHERE created_slot > :slot",
+         {"slot": transactions - 1000}),
+        ("ledger prune",
+         "DELETE FROM wallet_utxos WHERE spent_slot < :slot",
+         {"slot": 1000}),
+    ]
+
+
+def scans(plan):
+    """(node type, relation, index) of every scan in a plan tree."""
+    found = []
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if "Scan" in node["Node Type"]:
+            found.append((node["Node Type"], node.get("Relation Name"), node.get("Index Name")))
+        stack.extend(node.get("Plans", []))
+    return found
+
+
+def run(engine, queries, repeat):
+    results = {}
+    for name, sql, params in queries:
+        times = []
+        for _ in range(repeat):
+            with engine.connect() as conn:
+                trans = conn.begin()
+                explain = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params).scalar()
+                trans.rollback()
+            explain = explain[0] if isinstance(explain, list) else json.loads(explain)[0]
+            times.append(explain["Execution Time"])
+        times.sort()
+        results[name] = {
+            "median_ms": statistics.median(times),
+            "p95_ms": times[min(len(times) - 1, int(len(times) * 0.95))],
+            "scans": scans(explain["Plan"]),
+        }
+    return results
+
+
+def secondary_indexes():
+    return [index for table in Base.metadata.sorted_tables for index in table.indexes if not index.unique]
+
+
+def report(label, results):
+    print(f"\n{label}")
+    for name, r in results.items():
+        plan = ", ".join(f"{kind} on {rel}" + (f" using {idx}" if idx else "") for kind, rel, idx in r["scans"])
+        print(f"  {name:<34} {r['median_ms']:10.3f} ms  p95 {r['p95_ms']:10.3f} ms  {plan}")
+
+
+def regressions(results, baseline, max_slowdown):
+    problems = []
+    for name, r in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if r["median_ms"] > before["median_ms"] * max_slowdown + SLACK_MS:
+            problems.append(f"{name}: {before['median_ms']:.3f} ms -> {r['median_ms']:.3f} ms")
+        seq_before = {rel for kind, rel, _ in before["scans"] if kind == "Seq Scan"}
+        seq_now = {rel for kind, rel, _ in r["scans"] if kind == "Seq Scan"}
+        for rel in sorted(seq_now - seq_before):
+            problems.append(f"{name}: now sequentially scans {rel}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--transactions", type=int, default=1_000_000)
+    parser.add_argument("--wallets", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--baseline", help="results JSON of a previous run to compare against")
+    parser.add_argument("--max-slowdown", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with create_engine(args.database_url).begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    engine = create_engine(args.database_url, connect_args={"options": f"-csearch_path={SCHEMA}"})
+
+    print(f"Seeding {args.transactions} transactions over {args.wallets} wallets into {SCHEMA}...")
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn)
+        for index in secondary_indexes():
+            index.drop(conn)
+        seed(conn, args.transactions, args.wallets)
+    queries = hot_queries(args.transactions)
+
+    results = {}
+    for label, indexed in (("without indexes", False), ("with indexes", True)):
+        if indexed:
+            with engine.begin() as conn:
+                for index in secondary_indexes():
+                    index.create(conn)
+        with engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                conn.execute(text(f"ANALYZE {table.name}"))
+        results[label] = run(engine, queries, args.repeat)
+        report(label, results[label])
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        problems = regressions(results["with indexes"], baseline["with indexes"], args.max_slowdown)
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
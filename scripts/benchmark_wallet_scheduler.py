@@ -0,0 +1,155 @@
+"""
+Benchmark: one Celery worker process per wallet vs. partitioned wallet
+queues (heron_app.workers.scheduling).
+
+For each wallet count, starts the workers each scheduler needs, measures
+their total resident memory and start-up time, then pushes a burst of tasks
+spread over all wallets and measures throughput. Tasks sleep for --task-ms
+to stand in for the Blockfrost round trips of a build/submit, and record
+whether two tasks of the same wallet ever overlapped (must stay 0).
+
+Needs a reachable broker/Redis (CELERY_BROKER_URL, default
+redis://localhost:6379/0) and Linux /proc for RSS. Per-wallet mode at 1000
+wallets starts ~2000 processes; use --modes partitioned to skip it.
+
+Usage:
+    PYTHONPATH=. python scripts/benchmark_wallet_scheduler.py [--wallets 10 100 1000]
+        [--partitions 8] [--tasks 2000] [--task-ms 50] [--modes per-wallet partitioned]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+import redis
+from celery import Celery
+
+from heron_app.core.config import settings
+from heron_app.workers.scheduling import partition_queue, wallet_queue
+
+BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PREFIX = "heron:bench"
+
+app = Celery("benchmark_wallet_scheduler", broker=BROKER_URL)
+app.conf.worker_hijack_root_logger = False
+store = redis.Redis.from_url(BROKER_URL, decode_responses=True)
+
+
+@app.task(name="bench.work")
+def work(wallet_id, task_ms):
+    running_key = f"{PREFIX}:running:{wallet_id}"
+    if not store.set(running_key, 1, nx=True, ex=60):
+        store.incr(f"{PREFIX}:overlap")
+    time.sleep(task_ms / 1000)
+    store.delete(running_key)
+    store.incr(f"{PREFIX}:done")
+
+
+def rss_kb(pid):
+    """Resident memory of a process and all of its descendants."""
+    total = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children") as f:
+                    stack.extend(int(child) for child in f.read().split())
+        except FileNotFoundError:
+            continue
+    return total
+
+
+def start_workers(queues):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([SCRIPT_DIR, os.environ.get("PYTHONPATH", "")]))
+    return [
+        subprocess.Popen(
+            [
+                sys.executable, "-m", "celery", "-A", "benchmark_wallet_scheduler", "worker",
+                "-Q", queue, "-n", f"{queue}@bench", "--concurrency=1", "--loglevel=warning",
+            ],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        for queue in queues
+    ]
+
+
+def wait_ready(expected, timeout=600):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        replies = app.control.ping(timeout=1.0)
+        if len(replies) >= expected:
+            return
+    raise SystemExit(f"only {len(replies)}/{expected} workers answered within {timeout}s")
+
+
+def run(mode, wallet_count, args):
+    wallet_ids = [str(uuid.uuid4()) for _ in range(wallet_count)]
+    if mode == "partitioned":
+        queues = [partition_queue(p) for p in range(args.partitions)]
+        route = {w: wallet_queue(w) for w in wallet_ids}
+    else:
+        queues = [f"wallet_{w}" for w in wallet_ids]
+        route = {w: f"wallet_{w}" for w in wallet_ids}
+
+    for key in store.scan_iter(f"{PREFIX}:*"):
+        store.delete(key)
+
+    started = time.perf_counter()
+    workers = start_workers(queues)
+    try:
+        wait_ready(len(queues))
+        startup = time.perf_counter() - started
+        rss_mb = sum(rss_kb(worker.pid) for worker in workers) / 1024
+
+        started = time.perf_counter()
+        for i in range(args.tasks):
+            wallet_id = wallet_ids[i % wallet_count]
+            work.apply_async(args=[wallet_id, args.task_ms], queue=route[wallet_id])
+        while int(store.get(f"{PREFIX}:done") or 0) < args.tasks:
+            time.sleep(0.05)
+        elapsed = time.perf_counter() - started
+
+        print(
+            f"{mode:<12} {wallet_count:>7} {len(workers):>9} {rss_mb:>10.0f} {startup:>10.1f} "
+            f"{args.tasks / elapsed:>9.1f} {int(store.get(f'{PREFIX}:overlap') or 0):>8}"
+        )
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.wait()
+        for queue in queues:
+            store.delete(queue)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--wallets", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--partitions", type=int, default=8)
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--task-ms", type=float, default=50)
+    parser.add_argument("--modes", nargs="+", default=["per-wallet", "partitioned"])
+    args = parser.parse_args()
+
+    # Route with the partition count the benchmark runs with.
+    settings.WALLET_SCHEDULER = "partitioned"
+    settings.WALLET_PARTITIONS = args.partitions
+
+    print(f"{'mode':<12} {'wallets':>7} {'workers':>9} {'RSS (MB)':>10} {'startup s':>10} {'tasks/s':>9} {'overlaps':>8}")
+    for wallet_count in args.wallets:
+        for mode in args.modes:
+            run(mode, wallet_count, args)
+
+
+if __name__ == "__main__":
+    main()
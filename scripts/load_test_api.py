@@ -0,0 +1,107 @@
+"""
+HTTP load test for the Heron API: requests/second and latency per endpoint.
+
+To compare the sync and async API layers, run one instance from a build
+before the async migration and one after, then point this script at both:
+
+    python scripts/load_test_api.py before=http://localhost:8001 after=http://localhost:8002
+
+Options:
+    --concurrency N   concurrent clients per target (default 64)
+    --duration S      seconds per endpoint (default 15)
+
+Endpoints exercised: GET /wallets/, GET /wallets/<id> (balance lookup),
+GET /transactions/<id> and GET /policies/. Wallet and transaction ids are
+taken from the target itself, so it needs at least one wallet; a
+transaction id can be given with --transaction-id.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def discover(client):
+    wallets = (await client.get("/wallets/")).json()
+    if not wallets:
+        raise SystemExit(f"{client.base_url} has no wallets to load test against")
+    return wallets[0]["id"]
+
+
+async def run_endpoint(client, path, concurrency, duration):
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await client.get(path)
+                if response.status_code >= 500:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) * 1000 if latencies else 0,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0,
+        "errors": errors,
+    }
+
+
+async def run_target(label, url, args):
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        wallet_id = await discover(client)
+        endpoints = {
+            "list wallets": "/wallets/",
+            "wallet balance": f"/wallets/{wallet_id}",
+            "list policies": "/policies/",
+        }
+        if args.transaction_id:
+            endpoints["get transaction"] = f"/transactions/{args.transaction_id}"
+
+        results = {}
+        for name, path in endpoints.items():
+            results[name] = await run_endpoint(client, path, args.concurrency, args.duration)
+            r = results[name]
+            print(
+                f"[{label}] {name:<16} {r['rps']:9.1f} req/s  "
+                f"p50 {r['p50']:7.1f} ms  p99 {r['p99']:7.1f} ms  errors {r['errors']}"
+            )
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("targets", nargs="+", help="label=url, e.g. after=http://localhost:8001")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--transaction-id")
+    args = parser.parse_args()
+
+    targets = [t.split("=", 1) if "=" in t else (t, t) for t in args.targets]
+    results = {label: asyncio.run(run_target(label, url, args)) for label, url in targets}
+
+    if len(results) > 1:
+        (base_label, base), *others = results.items()
+        print()
+        for label, result in others:
+            for name, r in result.items():
+                if base.get(name, {}).get("rps"):
+                    print(f"{name:<16} {label} vs {base_label}: {r['rps'] / base[name]['rps']:.2f}x req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Snapshot checks for the chain follower's UTxO ledger.
+
+The oura worker that runs the ledger doesn't import the transaction tasks,
+so a wallet snapshot must not depend on heron_app.utils.cardano's
+import-time configuration check. Snapshot rows have no created_slot, so a
+rollback below the snapshot slot must resync the wallet rather than keep
+outputs of the rolled back blocks.
+
+Runs UtxoLedger against an in-memory SQLite database and a stub Blockfrost
+client with BLOCKFROST_PROJECT_ID unset.
+
+Usage: PYTHONPATH=. python tests/ledger/test_utxo_ledger_snapshot.py
+"""
+import os
+import sys
+import uuid
+from types import SimpleNamespace
+
+os.environ.pop("BLOCKFROST_PROJECT_ID", None)
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from heron_app.db.database import Base
+from heron_app.db.models.wallet import Wallet
+from heron_app.db.models.wallet_utxo import WalletUtxo
+from heron_app.workers.utxo_ledger import UtxoLedger, ledger_utxos
+
+SNAPSHOT_SLOT = 1000
+ADDRESS = "addr_test1snapshot"
+
+
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+Base.metadata.create_all(engine)
+
+
+class StubBlockfrost:
+    def block_latest(self):
+        return SimpleNamespace(slot=SNAPSHOT_SLOT)
+
+    def address_utxos(self, address, count, page):
+        return [
+            SimpleNamespace(tx_hash=f"{i:064x}", tx_index=0, amount=[SimpleNamespace(unit="lovelace", quantity="5000000")])
+            for i in range(3)
+        ]
+
+
+def main():
+    session = Session()
+    session.add(Wallet(id=uuid.uuid4(), name="snapshot", address=ADDRESS, encrypted_root_key="-"))
+    session.commit()
+
+    UtxoLedger(api=StubBlockfrost())._snapshot(session, ADDRESS, {"slot": SNAPSHOT_SLOT})
+    assert "heron_app.utils.cardano" not in sys.modules, "snapshot imported heron_app.utils.cardano"
+    assert session.scalar(select(Wallet.utxos_synced_slot).where(Wallet.address == ADDRESS)) == SNAPSHOT_SLOT
+    utxos = ledger_utxos(session, ADDRESS)
+    print(f"snapshot without BLOCKFROST_PROJECT_ID: {len(utxos)} UTxO(s)")
+    assert len(utxos) == 3 and all(utxo["amounts"] == {"lovelace": 5000000} for utxo in utxos)
+    assert session.query(WalletUtxo).count() == 3
+
+    # Without a client the ledger says what's missing instead of failing in cardano's import
+    try:
+        UtxoLedger()._snapshot(session, ADDRESS, {"slot": SNAPSHOT_SLOT})
+    except RuntimeError as e:
+        assert "BLOCKFROST_PROJECT_ID" in str(e), e
+    else:
+        raise AssertionError("snapshot without a Blockfrost client or BLOCKFROST_PROJECT_ID succeeded")
+
+    ledger = UtxoLedger(api=StubBlockfrost())
+    assert ledger.roll_back(session, SNAPSHOT_SLOT) == {ADDRESS}
+    assert ledger_utxos(session, ADDRESS) is not None, "rollback to the snapshot slot dropped the snapshot"
+    assert ledger.roll_back(session, SNAPSHOT_SLOT - 10) == {ADDRESS}
+    session.commit()
+    print(f"after a rollback below the snapshot: synced slot {session.scalar(select(Wallet.utxos_synced_slot))}")
+    assert ledger_utxos(session, ADDRESS) is None, "rollback below the snapshot kept serving it"
+    ledger.apply(session, [])
+    assert ledger.addresses == set(), "resynced address is still applied to"
+    session.close()
+
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Query-count regression check for the worker's build plan loader.
+
+Loads transactions with many outputs, assets and mints into an in-memory
+SQLite database and asserts that hydrating them and walking everything a
+build touches takes a fixed number of statements, independent of the
+number of outputs or mints.
+
+Usage: PYTHONPATH=. python tests/transactions/test_build_plan_queries.py
+"""
+import uuid
+from datetime import datetime
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from heron_app.db.database import Base
+from heron_app.db.build_plan import BuildPlan, hydrated_transactions, load_build_plan
+from heron_app.db.models.minting_policies import MintingPolicy
+from heron_app.db.models.transaction import Transaction
+from heron_app.db.models.transaction_mint import TransactionMint
+from heron_app.db.models.transaction_output import TransactionOutput
+from heron_app.db.models.transaction_output_asset import TransactionOutputAsset
+from heron_app.db.models.wallet import Wallet
+
+# transaction + wallet, outputs, output assets, mints + policies
+MAX_QUERIES = 4
+POLICY_IDS = [f"{i:056x}" for i in range(1, 4)]
+
+
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+Base.metadata.create_all(engine)
+
+statements = []
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def count_statement(conn, cursor, statement, parameters, context, executemany):
+    statements.append(statement)
+
+
+def seed(session, num_transactions, num_outputs):
+    wallet = Wallet(id=uuid.uuid4(), name="query-count", address="addr_test1query", encrypted_root_key="-")
+    session.add(wallet)
+    for i, policy_id in enumerate(POLICY_IDS):
+        session.add(MintingPolicy(id=uuid.uuid4(), name=f"policy-{i}", policy_id=policy_id, encrypted_policy_skey="-"))
+
+    transactions = []
+    for n in range(1, num_transactions + 1):
+        tx = Transaction(id=uuid.uuid4(), numeric_id=n, wallet_id=wallet.id, status="queued", created_at=datetime.utcnow())
+        session.add(tx)
+        for _ in range(num_outputs):
+            output = TransactionOutput(transaction_id=n, address=wallet.address)
+            output.assets = [
+                TransactionOutputAsset(unit="lovelace", quantity="2000000"),
+                TransactionOutputAsset(unit=f"{POLICY_IDS[0]}746f6b656e", quantity="1"),
+            ]
+            tx.outputs.append(output)
+        for policy_id in POLICY_IDS:
+            tx.mints.append(TransactionMint(policy_id=policy_id, asset_name="token", quantity=1))
+        transactions.append(tx)
+
+    session.commit()
+    return wallet, transactions
+
+
+def touch(plan):
+    """Access everything _build_and_sign reads from a plan."""
+    plan.wallet.address
+    for output in plan.outputs:
+        for asset in output.assets:
+            asset.unit, asset.quantity
+    for mint in plan.mints:
+        mint.policy.encrypted_policy_skey
+    plan.policies
+
+
+def count(fn):
+    session = Session()
+    try:
+        del statements[:]
+        fn(session)
+        return len(statements)
+    finally:
+        session.close()
+
+
+def main():
+    session = Session()
+    wallet, transactions = seed(session, num_transactions=10, num_outputs=30)
+    transaction_id = transactions[0].id
+    wallet_id = wallet.id
+    session.close()
+
+    single = count(lambda s: touch(load_build_plan(s, transaction_id)))
+    print(f"single transaction, 30 outputs, 3 mints: {single} queries")
+    assert single <= MAX_QUERIES, f"build plan loader issued {single} queries, expected at most {MAX_QUERIES}"
+
+    def load_queue(s):
+        pending = hydrated_transactions(s).filter(Transaction.wallet_id == wallet_id).all()
+        touch(BuildPlan(pending))
+
+    batch = count(load_queue)
+    print(f"10 transactions, 300 outputs, 30 mints: {batch} queries")
+    assert batch <= MAX_QUERIES, f"wallet queue loader issued {batch} queries, expected at most {MAX_QUERIES}"
+
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Bad-inputs regression check for the wallet chain task.
+
+A chain stops at the first BadInputsError: the rest of it would spend the
+UTxO view the node just rejected. The rows after the failed group must be
+picked up again by a re-dispatched chain, also when the failed group had
+already used up its retries and is marked failed instead of requeued.
+
+Runs process_wallet_chain against an in-memory SQLite database with the
+chain context, signing and submission stubbed out.
+
+Usage: PYTHONPATH=. python tests/transactions/test_wallet_chain_bad_inputs.py
+"""
+import os
+import uuid
+from datetime import datetime, timedelta
+
+os.environ.setdefault("BLOCKFROST_PROJECT_ID", "preproddummy")
+os.environ.setdefault("UTXO_CACHE_BACKEND", "memory")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from heron_app.core.config import settings
+from heron_app.db.database import Base
+from heron_app.db.models.transaction import Transaction
+from heron_app.db.models.wallet import Wallet
+from heron_app.utils.cardano import BadInputsError
+from heron_app.workers import tasks
+
+
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+Base.metadata.create_all(engine)
+
+dispatched = []
+processed = []
+
+
+def process_group(session, txs, address, payment_skey, context, utxo_index):
+    processed.append([tx.numeric_id for tx in txs])
+    raise BadInputsError("BadInputsUTxO")
+
+
+tasks.SessionLocal = Session
+tasks._get_blockfrost_context = lambda: None
+tasks.acquire_wallet_lock = lambda wallet_id: object()
+tasks.extend_wallet_lock = lambda lock: True
+tasks.release_wallet_lock = lambda lock: None
+tasks._utxo_index = lambda wallet, transaction_id: object()
+tasks._derive_payment_skey = lambda wallet: object()
+tasks._process_group = process_group
+tasks.process_transaction.apply_async = lambda args=None, queue=None, **kwargs: dispatched.append(("process_transaction", kwargs))
+tasks.process_wallet_chain.apply_async = lambda args=None, queue=None, **kwargs: dispatched.append(("process_wallet_chain", kwargs))
+
+
+def main():
+    session = Session()
+    wallet = Wallet(id=uuid.uuid4(), name="bad-inputs", address="addr_test1badinputs", encrypted_root_key="-")
+    session.add(wallet)
+    created_at = datetime.utcnow() - timedelta(minutes=1)
+    for n in range(1, 4):
+        session.add(Transaction(
+            id=uuid.uuid4(),
+            numeric_id=n,
+            wallet_id=wallet.id,
+            status="queued",
+            created_at=created_at + timedelta(seconds=n),
+            # The first row is on its last attempt
+            retries=settings.TX_MAX_RETRIES if n == 1 else 0,
+        ))
+    session.commit()
+    wallet_id = wallet.id
+    session.close()
+
+    tasks.process_wallet_chain.run(wallet_id)
+
+    session = Session()
+    statuses = {tx.numeric_id: tx.status for tx in session.query(Transaction)}
+    session.close()
+    print(f"processed groups: {processed}, statuses: {statuses}, dispatched: {dispatched}")
+    assert processed == [[1]], "chain kept building after bad inputs"
+    assert statuses == {1: "failed", 2: "queued", 3: "queued"}
+    assert [name for name, _ in dispatched] == ["process_wallet_chain"], "remaining rows were not re-dispatched"
+    countdown = dispatched[0][1]["countdown"]
+    assert 0 < countdown <= settings.TX_RETRY_BAD_INPUTS_BASE_SECONDS, f"chain resumes in {countdown:.0f}s"
+
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
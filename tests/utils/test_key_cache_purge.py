@@ -0,0 +1,42 @@
+"""
+Expiry check for the worker's signing key cache.
+
+A key cached by a worker that then goes idle must still be wiped once its
+TTL has passed, without any further get or put on the cache.
+
+Usage: PYTHONPATH=. python tests/utils/test_key_cache_purge.py
+"""
+import time
+
+from pycardano import PaymentSigningKey
+
+from heron_app.utils.key_cache import SigningKeyCache
+
+TTL_SECONDS = 0.2
+SWEEP_SECONDS = 0.05
+
+
+def main():
+    cache = SigningKeyCache(ttl_seconds=TTL_SECONDS, max_size=8, sweep_seconds=SWEEP_SECONDS)
+    key = PaymentSigningKey.generate()
+    cache.put(("wallet", "idle"), key)
+    payload = cache._entries[("wallet", "idle")][-1]
+    assert bytes(payload) == key.payload
+
+    # No cache activity from here on
+    time.sleep(TTL_SECONDS + 4 * SWEEP_SECONDS)
+    print(f"entries after {TTL_SECONDS + 4 * SWEEP_SECONDS:.2f}s idle: {len(cache)}")
+    assert len(cache) == 0, "expired key is still cached"
+    assert payload == bytearray(len(payload)), "expired key material was not overwritten"
+    assert cache._sweeper is None, "sweeper kept running with an empty cache"
+
+    # The next put starts sweeping again
+    cache.put(("wallet", "busy"), key)
+    assert cache._sweeper is not None and cache._sweeper.is_alive()
+    assert cache.get(("wallet", "busy")).payload == key.payload
+
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()